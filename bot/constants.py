@@ -413,6 +413,31 @@ class _Cooldowns(EnvConfig, env_prefix="cooldowns_"):
 Cooldowns = _Cooldowns()
 
 
+class _Doc(EnvConfig, env_prefix="doc_"):
+
+    # The estimated size in bytes under which the HTML of pages waiting to be parsed is kept.
+    max_queued_pages_size: int = 16 * 1024 * 1024
+    # Whether descriptions are converted to Markdown by the converter specialised for Sphinx pages,
+    # instead of the general markdownify converter. Both produce the same Markdown.
+    sphinx_markdown_converter: bool = True
+    # The directory parsed inventories are cached in, so they can be loaded on startup before they're revalidated.
+    # It has to be writable; caching inventories on disk is turned off if it's empty.
+    inventory_cache_dir: str = "cache/doc/inventories"
+
+
+Doc = _Doc()
+
+
+class _Snekbox(EnvConfig, env_prefix="snekbox_"):
+
+    # Whether the results of jobs whose code looks deterministic are kept for a short time, and returned for identical
+    # jobs instead of running them again.
+    cache_results: bool = False
+
+
+Snekbox = _Snekbox()
+
+
 class _Metabase(EnvConfig, env_prefix="metabase_"):
 
     username: str = ""
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import typing
-from collections.abc import Callable, Coroutine, Iterable
-from dataclasses import dataclass, field, replace
+from collections.abc import Callable, Coroutine, Iterable, Sequence
 from enum import Enum, auto
+from typing import Any
 
 import discord
 from discord import DMChannel, Embed, Member, Message, StageChannel, TextChannel, Thread, User, VoiceChannel
@@ -25,9 +25,101 @@ class Event(Enum):
     SNEKBOX = auto()
 
 
-@dataclass
+class FilterOutput:
+    """
+    The output information of the filtering, shared by a filtering context and all contexts replaced from it.
+
+    Every field is only allocated the first time it's accessed, as most events don't trigger anything.
+    """
+
+    dm_content: str  # The content to DM the invoker
+    dm_embed: str  # The embed description to DM the invoker
+    send_alert: bool  # Whether to send an alert for the moderators
+    alert_content: str  # The content of the alert
+    alert_embeds: list[Embed]  # Any embeds to add to the alert
+    action_descriptions: list[str]  # What actions were taken
+    matches: list[str]  # What exactly was found
+    notification_domain: str  # A domain to send the user for context
+    filter_info: dict[Filter, str]  # Additional info from a filter.
+    messages_deletion: bool  # Whether the messages were deleted. Can't upload deletion log otherwise.
+    blocked_exts: set[str]  # Any extensions blocked (used for snekbox)
+    # Additional actions to perform
+    additional_actions: list[Callable[[FilterContext], Coroutine]]
+    related_messages: set[Message]  # Deletion will include these.
+    related_channels: set[TextChannel | Thread | DMChannel]
+    uploaded_attachments: dict[int, list[str]]  # Message ID to attachment URLs.
+    upload_deletion_logs: bool  # Whether it's allowed to upload deletion logs.
+
+    # The factory of the initial value of each field.
+    _defaults: typing.ClassVar[dict[str, Callable[[], Any]]] = {
+        "dm_content": str,
+        "dm_embed": str,
+        "send_alert": bool,
+        "alert_content": str,
+        "alert_embeds": list,
+        "action_descriptions": list,
+        "matches": list,
+        "notification_domain": str,
+        "filter_info": dict,
+        "messages_deletion": bool,
+        "blocked_exts": set,
+        "additional_actions": list,
+        "related_messages": set,
+        "related_channels": set,
+        "uploaded_attachments": dict,
+        "upload_deletion_logs": lambda: True,
+    }
+
+    __slots__ = tuple(_defaults)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called when the slot wasn't assigned yet.
+        try:
+            factory = self._defaults[name]
+        except KeyError:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}") from None
+        value = factory()
+        setattr(self, name, value)
+        return value
+
+
+class _OutputField:
+    """A descriptor forwarding an output field of a filtering context to the context's `FilterOutput`."""
+
+    __slots__ = ("name",)
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: FilterContext | None, owner: type | None = None) -> Any:
+        if instance is None:
+            return self
+        return getattr(instance.output, self.name)
+
+    def __set__(self, instance: FilterContext, value: Any) -> None:
+        setattr(instance.output, self.name, value)
+
+
 class FilterContext:
-    """A dataclass containing the information that should be filtered, and output information of the filtering."""
+    """
+    The information that should be filtered, and output information of the filtering.
+
+    The input fields are stored on the context itself. The output fields are forwarded to a `FilterOutput`, which is
+    only created once an output is accessed, and which is shared with every context created through `replace`.
+    """
+
+    _input_fields = (
+        "event",
+        "author",
+        "channel",
+        "content",
+        "message",
+        "embeds",
+        "attachments",
+        "before_message",
+        "message_cache",
+    )
+    __slots__ = (*_input_fields, "_output")
 
     # Input context
     event: Event  # The type of event
@@ -35,32 +127,51 @@ class FilterContext:
     channel: TextChannel | VoiceChannel | StageChannel | Thread | DMChannel | None  # The channel involved
     content: str | Iterable  # What actually needs filtering. The Iterable type depends on the filter list.
     message: Message | None  # The message involved
-    embeds: list[Embed] = field(default_factory=list)  # Any embeds involved
-    attachments: list[discord.Attachment | FileAttachment] = field(default_factory=list)  # Any attachments sent.
-    before_message: Message | None = None
-    message_cache: MessageCache | None = None
-    # Output context
-    dm_content: str = ""  # The content to DM the invoker
-    dm_embed: str = ""  # The embed description to DM the invoker
-    send_alert: bool = False  # Whether to send an alert for the moderators
-    alert_content: str = ""  # The content of the alert
-    alert_embeds: list[Embed] = field(default_factory=list)  # Any embeds to add to the alert
-    action_descriptions: list[str] = field(default_factory=list)  # What actions were taken
-    matches: list[str] = field(default_factory=list)  # What exactly was found
-    notification_domain: str = ""  # A domain to send the user for context
-    filter_info: dict[Filter, str] = field(default_factory=dict)  # Additional info from a filter.
-    messages_deletion: bool = False  # Whether the messages were deleted. Can't upload deletion log otherwise.
-    blocked_exts: set[str] = field(default_factory=set)  # Any extensions blocked (used for snekbox)
-    # Additional actions to perform
-    additional_actions: list[Callable[[FilterContext], Coroutine]] = field(default_factory=list)
-    related_messages: set[Message] = field(default_factory=set)  # Deletion will include these.
-    related_channels: set[TextChannel | Thread | DMChannel] = field(default_factory=set)
-    uploaded_attachments: dict[int, list[str]] = field(default_factory=dict)  # Message ID to attachment URLs.
-    upload_deletion_logs: bool = True  # Whether it's allowed to upload deletion logs.
+    embeds: Sequence[Embed]  # Any embeds involved
+    attachments: Sequence[discord.Attachment | FileAttachment]  # Any attachments sent.
+    before_message: Message | None
+    message_cache: MessageCache | None
 
-    def __post_init__(self):
-        # If it's in the context of a DM channel, self.channel won't be None, but self.channel.guild will.
-        self.in_guild = self.channel is None or self.channel.guild is not None
+    # Output context, see `FilterOutput` for the description of each field.
+    dm_content = _OutputField()
+    dm_embed = _OutputField()
+    send_alert = _OutputField()
+    alert_content = _OutputField()
+    alert_embeds = _OutputField()
+    action_descriptions = _OutputField()
+    matches = _OutputField()
+    notification_domain = _OutputField()
+    filter_info = _OutputField()
+    messages_deletion = _OutputField()
+    blocked_exts = _OutputField()
+    additional_actions = _OutputField()
+    related_messages = _OutputField()
+    related_channels = _OutputField()
+    uploaded_attachments = _OutputField()
+    upload_deletion_logs = _OutputField()
+
+    def __init__(
+        self,
+        event: Event,
+        author: User | Member | None,
+        channel: TextChannel | VoiceChannel | StageChannel | Thread | DMChannel | None,
+        content: str | Iterable,
+        message: Message | None,
+        embeds: Sequence[Embed] = (),
+        attachments: Sequence[discord.Attachment | FileAttachment] = (),
+        before_message: Message | None = None,
+        message_cache: MessageCache | None = None,
+    ):
+        self.event = event
+        self.author = author
+        self.channel = channel
+        self.content = content
+        self.message = message
+        self.embeds = embeds
+        self.attachments = attachments
+        self.before_message = before_message
+        self.message_cache = message_cache
+        self._output: FilterOutput | None = None
 
     @classmethod
     def from_message(
@@ -79,6 +190,35 @@ class FilterContext:
             cache
         )
 
+    @property
+    def in_guild(self) -> bool:
+        """Whether the context is in a guild."""
+        # If it's in the context of a DM channel, self.channel won't be None, but self.channel.guild will.
+        return self.channel is None or self.channel.guild is not None
+
+    @property
+    def output(self) -> FilterOutput:
+        """The output information of the filtering, created on first access."""
+        if self._output is None:
+            self._output = FilterOutput()
+        return self._output
+
     def replace(self, **changes) -> FilterContext:
-        """Return a new context object assigning new values to the specified fields."""
-        return replace(self, **changes)
+        """
+        Return a new context object assigning new values to the specified input fields.
+
+        The new context shares its output with this one, so anything set by the filters on either is visible on both.
+        """
+        new_ctx = object.__new__(type(self))
+        for name in self._input_fields:
+            setattr(new_ctx, name, changes.pop(name) if name in changes else getattr(self, name))
+        if changes:
+            raise TypeError(f"Only input fields can be replaced, got {', '.join(map(repr, changes))}.")
+        new_ctx._output = self.output
+        return new_ctx
+
+    def __repr__(self) -> str:
+        return (
+            f"<{type(self).__name__} event={self.event.name} author={self.author!r} channel={self.channel!r} "
+            f"message={self.message!r}>"
+        )
@@ -19,7 +19,8 @@ from bot.exts.filtering._filters.antispam import antispam_filter_types
 from bot.exts.filtering._filters.filter import Filter, UniqueFilter
 from bot.exts.filtering._settings import ActionSettings
 from bot.exts.filtering._settings_types.actions.infraction_and_notification import Infraction, InfractionAndNotification
-from bot.exts.filtering._ui.ui import AlertView, build_mod_alert
+from bot.exts.filtering._ui.ui import AlertView, MAX_FIELD_SIZE, build_mod_alert
+from bot.utils.messages import format_user
 
 if typing.TYPE_CHECKING:
     from bot.exts.filtering.filtering import Filtering
@@ -43,6 +44,8 @@ class AntispamList(UniquesListBase):
     def __init__(self, filtering_cog: "Filtering"):
         super().__init__(filtering_cog)
         self.message_deletion_queue: dict[Member, DeletionContext] = dict()
+        # Raids which are still waiting to be alerted on, and can be joined by new offenders.
+        self.open_raids: list[RaidContext] = []
 
     def get_filter_type(self, content: str) -> type[UniqueFilter] | None:
         """Get a subclass of filter matching the filter list and the filter's content."""
@@ -76,7 +79,12 @@ class AntispamList(UniquesListBase):
 
         if ctx.author not in self.message_deletion_queue:
             self.message_deletion_queue[ctx.author] = DeletionContext()
-            ctx.additional_actions.append(self._create_deletion_context_handler(ctx.author))
+            raid = self._find_raid(triggers)
+            if raid is None:
+                raid = RaidContext()
+                self.open_raids.append(raid)
+                ctx.additional_actions.append(self._create_deletion_context_handler(raid))
+            raid.add(ctx.author, triggers)
             ctx.related_channels |= {msg.channel for msg in ctx.related_messages}
         else:  # The additional messages found are already part of a deletion context
             ctx.related_messages = set()
@@ -88,7 +96,8 @@ class AntispamList(UniquesListBase):
         ctx.upload_deletion_logs = False
         self.message_deletion_queue[ctx.author].add(ctx, triggers)
 
-        current_actions = sublist.merge_actions(triggers)
+        # The merged actions are shared, modify a copy.
+        current_actions = sublist.merge_actions(triggers).copy()
         # Don't alert yet.
         current_actions.pop("ping", None)
         current_actions.pop("send_alert", None)
@@ -108,10 +117,17 @@ class AntispamList(UniquesListBase):
         # Provide some message in case another filter list wants there to be an alert.
         return current_actions, ["Handling spam event..."], {ListType.DENY: triggers}
 
-    def _create_deletion_context_handler(self, member: Member) -> Callable[[FilterContext], Coroutine]:
+    def _find_raid(self, rules: list[UniqueFilter]) -> "RaidContext | None":
+        """Return an open raid which shares at least one of the rules, if there is any."""
+        for raid in self.open_raids:
+            if not raid.rules.isdisjoint(rules):
+                return raid
+        return None
+
+    def _create_deletion_context_handler(self, raid: "RaidContext") -> Callable[[FilterContext], Coroutine]:
         async def schedule_processing(ctx: FilterContext) -> None:
             """
-            Schedule a coroutine to process the deletion context.
+            Schedule a coroutine to process the deletion contexts of the raid.
 
             It cannot be awaited directly, as it waits ALERT_DELAY seconds, and actioning a filtering context depends on
             all actions finishing.
@@ -122,13 +138,16 @@ class AntispamList(UniquesListBase):
                 """Processes the Deletion Context queue."""
                 log.trace("Sleeping before processing message deletion queue.")
                 await asyncio.sleep(ALERT_DELAY)
+                self.open_raids.remove(raid)
 
-                if member not in self.message_deletion_queue:
-                    log.error(f"Started processing deletion queue for context `{member}`, but it was not found!")
-                    return
+                deletion_contexts = {}
+                for member in raid.members:
+                    if member not in self.message_deletion_queue:
+                        log.error(f"Started processing deletion queue for context `{member}`, but it was not found!")
+                        continue
+                    deletion_contexts[member] = self.message_deletion_queue.pop(member)
 
-                deletion_context = self.message_deletion_queue.pop(member)
-                await deletion_context.send_alert(self)
+                await raid.send_alert(self, deletion_contexts)
 
             scheduling.create_task(process_deletion_context())
 
@@ -148,16 +167,35 @@ class DeletionContext:
         self.contexts.append(ctx)
         self.rules.update(rules)
 
-    async def send_alert(self, antispam_list: AntispamList) -> None:
-        """Post the mod alert."""
-        if not self.contexts or not self.rules:
+
+@dataclass(eq=False)
+class RaidContext:
+    """
+    A group of members whose spam triggered the same rules at around the same time.
+
+    The deletion contexts of all members in the group are alerted on together, so that a raid produces one alert.
+    """
+
+    members: list[Member] = field(default_factory=list)
+    rules: set[UniqueFilter] = field(default_factory=set)
+
+    def add(self, member: Member, rules: list[UniqueFilter]) -> None:
+        """Adds a new offender to the raid."""
+        self.members.append(member)
+        self.rules.update(rules)
+
+    async def send_alert(self, antispam_list: AntispamList, deletion_contexts: dict[Member, DeletionContext]) -> None:
+        """Post a single mod alert for the deletion contexts of all offenders."""
+        contexts = [ctx for deletion_context in deletion_contexts.values() for ctx in deletion_context.contexts]
+        rules = set().union(*(deletion_context.rules for deletion_context in deletion_contexts.values()))
+        if not contexts or not rules:
             return
 
         webhook = antispam_list.filtering_cog.webhook
         if not webhook:
             return
 
-        ctx, *other_contexts = self.contexts
+        ctx, *other_contexts = contexts
         new_ctx = FilterContext(ctx.event, ctx.author, ctx.channel, ctx.content, ctx.message)
         all_descriptions_counts = Counter(reduce(
             add, (other_ctx.action_descriptions for other_ctx in other_contexts), ctx.action_descriptions
@@ -179,10 +217,10 @@ class DeletionContext:
             or_, (other_ctx.uploaded_attachments for other_ctx in other_contexts), ctx.uploaded_attachments
         )
         new_ctx.upload_deletion_logs = True
-        new_ctx.messages_deletion = all(ctx.messages_deletion for ctx in self.contexts)
+        new_ctx.messages_deletion = all(ctx.messages_deletion for ctx in contexts)
 
-        rules = list(self.rules)
-        actions = antispam_list[ListType.DENY].merge_actions(rules)
+        rules = list(rules)
+        actions = antispam_list[ListType.DENY].merge_actions(rules).copy()
         for action in list(actions):
             if action not in ("ping", "send_alert"):
                 actions.pop(action, None)
@@ -190,8 +228,15 @@ class DeletionContext:
 
         messages = antispam_list[ListType.DENY].format_messages(rules)
         embed = await build_mod_alert(new_ctx, {antispam_list: messages})
+        if len(deletion_contexts) > 1:
+            offenders = ", ".join(format_user(member) for member in deletion_contexts)
+            if len(offenders) > MAX_FIELD_SIZE:
+                offenders = offenders[:MAX_FIELD_SIZE] + " [...]"
+            embed.add_field(name=f"Offenders ({len(deletion_contexts)})", value=offenders, inline=False)
         if other_contexts:
             embed.set_footer(
                 text="The list of actions taken includes actions from additional contexts after deletion began."
             )
-        await webhook.send(username="Anti-Spam", content=ctx.alert_content, embeds=[embed], view=AlertView(new_ctx))
+        await webhook.send(
+            username="Anti-Spam", content=ctx.alert_content, embeds=[embed], view=AlertView(new_ctx.author.id)
+        )
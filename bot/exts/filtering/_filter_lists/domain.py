@@ -28,6 +28,7 @@ class DomainsList(FilterList[DomainFilter]):
     """
 
     name = "domain"
+    content_only = True
 
     def __init__(self, filtering_cog: Filtering):
         super().__init__()
@@ -55,7 +56,6 @@ class DomainsList(FilterList[DomainFilter]):
         new_ctx = ctx.replace(content=urls)
 
         triggers = await self[ListType.DENY].filter_list_result(new_ctx)
-        ctx.notification_domain = new_ctx.notification_domain
         actions = None
         messages = []
         if triggers:
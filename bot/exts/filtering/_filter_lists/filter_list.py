@@ -11,10 +11,12 @@ from typing import Any
 import arrow
 from discord.ext.commands import BadArgument, Context, Converter
 
+import bot
 from bot.exts.filtering._filter_context import Event, FilterContext
 from bot.exts.filtering._filters.filter import Filter, UniqueFilter
-from bot.exts.filtering._settings import ActionSettings, Defaults, create_settings
+from bot.exts.filtering._settings import ActionSettings, Defaults, SettingsInterner, create_settings
 from bot.exts.filtering._utils import FieldRequiring, past_tense
+from bot.exts.filtering._verdict_cache import Verdict, VerdictCache
 from bot.log import get_logger
 
 if typing.TYPE_CHECKING:
@@ -22,6 +24,9 @@ if typing.TYPE_CHECKING:
 
 log = get_logger(__name__)
 
+# How many merged sets of triggered filters each list keeps.
+MERGED_ACTIONS_CACHE_SIZE = 256
+
 
 class ListType(Enum):
     """An enumeration of list types."""
@@ -64,6 +69,12 @@ class AtomicList:
     list_type: ListType
     defaults: Defaults
     filters: dict[int, Filter]
+    # Only set for lists whose filters look at nothing but the content.
+    verdicts: VerdictCache | None = dataclasses.field(default=None, repr=False)
+    # Merged actions per set of triggered filters. Edited filters are new objects, and so invalidate their entries.
+    _merged_actions: dict[frozenset[Filter], ActionSettings] = dataclasses.field(
+        default_factory=dict, init=False, repr=False
+    )
 
     @property
     def label(self) -> str:
@@ -93,16 +104,31 @@ class AtomicList:
         passed_by_default, failed_by_default = defaults.validations.evaluate(ctx)
         default_answer = not bool(failed_by_default)
 
+        # Only look up verdicts when the list applies by default, otherwise most filters are skipped anyway.
+        verdict = key = None
+        if self.verdicts is not None and default_answer:
+            key = self.verdicts.key(ctx.content)
+            verdict = self.verdicts.get(key)
+            bot.instance.stats.incr(f"filters.verdict_cache.{'hit' if verdict else 'miss'}")
+            if verdict is None:
+                verdict = Verdict()
+
         relevant_filters = []
         for filter_ in filters:
             if not filter_.validations:
-                if default_answer and await filter_.triggered_on(ctx):
+                if default_answer and await self._triggered_on(filter_, ctx, verdict):
                     relevant_filters.append(filter_)
             else:
                 passed, failed = filter_.validations.evaluate(ctx)
                 if not failed and failed_by_default < passed:
-                    if await filter_.triggered_on(ctx):
+                    if await self._triggered_on(filter_, ctx, verdict):
                         relevant_filters.append(filter_)
+                elif verdict is not None and not verdict.complete:
+                    verdict.skipped.add(filter_)
+
+        if verdict is not None and not verdict.complete:
+            verdict.complete = True
+            self.verdicts.set(key, verdict)
 
         if ctx.event == Event.MESSAGE_EDIT and ctx.message and self.list_type == ListType.DENY:
             previously_triggered = ctx.message_cache.get_message_metadata(ctx.message.id)
@@ -114,6 +140,33 @@ class AtomicList:
                 relevant_filters = [filter_ for filter_ in relevant_filters if filter_ not in ignore_filters]
         return relevant_filters
 
+    @staticmethod
+    async def _triggered_on(filter_: Filter, ctx: FilterContext, verdict: Verdict | None) -> bool:
+        """Return whether the filter triggers in the context, replaying the content's verdict if it's known."""
+        if verdict is None:
+            return await filter_.triggered_on(ctx)
+
+        if filter_ in verdict.triggered:
+            matches, notification_domain = verdict.triggered[filter_]
+            ctx.matches.extend(matches)
+            if notification_domain:
+                ctx.notification_domain = notification_domain
+            return True
+        if verdict.complete and filter_ not in verdict.skipped:
+            return False
+
+        # The filter didn't run on this content yet, run it and record what it added to the context.
+        verdict.skipped.discard(filter_)
+        matches_count, notification_domain = len(ctx.matches), ctx.notification_domain
+        if not await filter_.triggered_on(ctx):
+            return False
+        if ctx.notification_domain == notification_domain:
+            notification_domain = ""
+        else:
+            notification_domain = ctx.notification_domain
+        verdict.triggered[filter_] = (ctx.matches[matches_count:], notification_domain)
+        return True
+
     def default(self, setting_name: str) -> Any:
         """Get the default value of a specific setting."""
         missing = object()
@@ -128,18 +181,27 @@ class AtomicList:
         """
         Merge the settings of the given filters, with the list's defaults as fallback.
 
-        If `merge_default` is True, include it in the merge instead of using it as a fallback.
+        The result is cached per set of filters and shared between events, so it must be copied before being changed.
         """
         if not filters:  # Nothing to action.
             return None
+        key = frozenset(filters)
+        if (merged := self._merged_actions.get(key)) is not None:
+            return merged
+
         try:
-            return reduce(
+            merged = reduce(
                 ActionSettings.union, (filter_.actions or self.defaults.actions for filter_ in filters)
             ).fallback_to(self.defaults.actions)
         except TypeError:
             # The sequence fed to reduce is empty, meaning none of the filters have actions,
             # meaning they all use the defaults.
-            return self.defaults.actions
+            merged = self.defaults.actions
+
+        if len(self._merged_actions) >= MERGED_ACTIONS_CACHE_SIZE:
+            del self._merged_actions[next(iter(self._merged_actions))]  # Evict the oldest entry.
+        self._merged_actions[key] = merged
+        return merged
 
     @staticmethod
     def format_messages(triggers: list[Filter], *, expand_single_filter: bool = True) -> list[str]:
@@ -167,17 +229,26 @@ class FilterList(dict[ListType, AtomicList], typing.Generic[T], FieldRequiring):
     # Names must be unique across all filter lists.
     name = FieldRequiring.MUST_SET_UNIQUE
 
+    # Whether the filters of the list look at nothing but the context's content, so their verdicts can be cached.
+    content_only = False
+
     _already_warned = set()
 
+    def __init__(self):
+        super().__init__()
+        # Shares the settings of filters with identical overrides in each list type.
+        self._interners: dict[ListType, SettingsInterner] = {}
+
     def add_list(self, list_data: dict) -> AtomicList:
         """Add a new type of list (such as a whitelist or a blacklist) this filter list."""
         actions, validations = create_settings(list_data["settings"], keep_empty=True)
         list_type = ListType(list_data["list_type"])
         defaults = Defaults(actions, validations)
+        interner = self._interners[list_type] = SettingsInterner(defaults)
 
         filters = {}
         for filter_data in list_data["filters"]:
-            new_filter = self._create_filter(filter_data, defaults)
+            new_filter = self._create_filter(filter_data, interner)
             if new_filter:
                 filters[filter_data["id"]] = new_filter
 
@@ -188,15 +259,18 @@ class FilterList(dict[ListType, AtomicList], typing.Generic[T], FieldRequiring):
             self.name,
             list_type,
             defaults,
-            filters
+            filters,
+            VerdictCache() if self.content_only else None
         )
         return self[list_type]
 
     def add_filter(self, list_type: ListType, filter_data: dict) -> T | None:
         """Add a filter to the list of the specified type."""
-        new_filter = self._create_filter(filter_data, self[list_type].defaults)
+        new_filter = self._create_filter(filter_data, self._interners[list_type])
         if new_filter:
             self[list_type].filters[filter_data["id"]] = new_filter
+            if self[list_type].verdicts is not None:
+                self[list_type].verdicts.clear()
         return new_filter
 
     @abstractmethod
@@ -214,13 +288,13 @@ class FilterList(dict[ListType, AtomicList], typing.Generic[T], FieldRequiring):
     ) -> tuple[ActionSettings | None, list[str], dict[ListType, list[Filter]]]:
         """Dispatch the given event to the list's filters, and return actions to take and messages to relay to mods."""
 
-    def _create_filter(self, filter_data: dict, defaults: Defaults) -> T | None:
-        """Create a filter from the given data."""
+    def _create_filter(self, filter_data: dict, interner: SettingsInterner) -> T | None:
+        """Create a filter from the given data, sharing settings with identical filters through the interner."""
         try:
             content = filter_data["content"]
             filter_type = self.get_filter_type(content)
             if filter_type:
-                return filter_type(filter_data, defaults)
+                return filter_type(filter_data, interner.defaults, interner=interner)
             if content not in self._already_warned:
                 log.warning(f"A filter named {content} was supplied, but no matching implementation found.")
                 self._already_warned.add(content)
@@ -278,6 +352,7 @@ class UniquesListBase(FilterList[UniqueFilter], ABC):
         actions, validations = create_settings(list_data["settings"], keep_empty=True)
         list_type = ListType(list_data["list_type"])
         defaults = Defaults(actions, validations)
+        interner = self._interners[list_type] = SettingsInterner(defaults)
         new_list = SubscribingAtomicList(
             list_data["id"],
             arrow.get(list_data["created_at"]),
@@ -292,7 +367,7 @@ class UniquesListBase(FilterList[UniqueFilter], ABC):
         filters = {}
         events = set()
         for filter_data in list_data["filters"]:
-            new_filter = self._create_filter(filter_data, defaults)
+            new_filter = self._create_filter(filter_data, interner)
             if new_filter:
                 new_list.subscribe(new_filter, *new_filter.events)
                 filters[filter_data["id"]] = new_filter
@@ -29,6 +29,7 @@ class TokensList(FilterList[TokenFilter]):
     """
 
     name = "token"
+    content_only = True
 
     def __init__(self, filtering_cog: Filtering):
         super().__init__()
@@ -5,7 +5,7 @@ import arrow
 from pydantic import ValidationError
 
 from bot.exts.filtering._filter_context import Event, FilterContext
-from bot.exts.filtering._settings import Defaults, create_settings
+from bot.exts.filtering._settings import Defaults, SettingsInterner, create_settings
 from bot.exts.filtering._utils import FieldRequiring
 
 
@@ -23,17 +23,25 @@ class Filter(FieldRequiring):
     # If a subclass uses extra fields, it should assign the pydantic model type to this variable.
     extra_fields_type = None
 
-    def __init__(self, filter_data: dict, defaults: Defaults | None = None):
+    def __init__(
+        self, filter_data: dict, defaults: Defaults | None = None, *, interner: SettingsInterner | None = None
+    ):
+        # If an interner is given, it must have been created with the same defaults.
         self.id = filter_data["id"]
         self.content = filter_data["content"]
         self.description = filter_data["description"]
         self.created_at = arrow.get(filter_data["created_at"])
         self.updated_at = arrow.get(filter_data["updated_at"])
-        self.actions, self.validations = create_settings(filter_data["settings"], defaults=defaults)
-        if self.extra_fields_type:
-            self.extra_fields = self.extra_fields_type.model_validate(filter_data["additional_settings"])
+        if interner:
+            self.actions, self.validations = interner.create_settings(filter_data["settings"])
         else:
+            self.actions, self.validations = create_settings(filter_data["settings"], defaults=defaults)
+        if not self.extra_fields_type:
             self.extra_fields = None
+        elif interner:
+            self.extra_fields = interner.create_extra_fields(self.extra_fields_type, filter_data["additional_settings"])
+        else:
+            self.extra_fields = self.extra_fields_type.model_validate(filter_data["additional_settings"])
 
     @property
     def overrides(self) -> tuple[dict[str, Any], dict[str, Any]]:
@@ -5,6 +5,7 @@ from pydis_core.utils.regex import DISCORD_INVITE
 import bot
 from bot.exts.filtering._filter_context import FilterContext
 from bot.exts.filtering._filters.filter import Filter
+from bot.exts.filtering._settings import Defaults
 
 
 class InviteFilter(Filter):
@@ -16,8 +17,8 @@ class InviteFilter(Filter):
 
     name = "invite"
 
-    def __init__(self, filter_data: dict, defaults_data: dict | None = None):
-        super().__init__(filter_data, defaults_data)
+    def __init__(self, filter_data: dict, defaults: Defaults | None = None, **kwargs):
+        super().__init__(filter_data, defaults, **kwargs)
         self.content = int(self.content)
 
     async def triggered_on(self, ctx: FilterContext) -> bool:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 import operator
 import traceback
 from abc import abstractmethod
@@ -7,6 +8,8 @@ from copy import copy
 from functools import reduce
 from typing import Any, NamedTuple, Self, TypeVar
 
+from pydantic import BaseModel
+
 from bot.exts.filtering._filter_context import FilterContext
 from bot.exts.filtering._settings_types import settings_types
 from bot.exts.filtering._settings_types.settings_entry import ActionEntry, SettingsEntry, ValidationEntry
@@ -20,6 +23,7 @@ log = get_logger(__name__)
 _already_warned: set[str] = set()
 
 T = TypeVar("T", bound=SettingsEntry)
+TModel = TypeVar("TModel", bound=BaseModel)
 
 
 def create_settings(
@@ -229,3 +233,39 @@ class Defaults(NamedTuple):
         for settings in self:
             dict_ = reduce(operator.or_, (entry.model_dump() for entry in settings.values()), dict_)
         return dict_
+
+
+class SettingsInterner:
+    """
+    Interns the settings and extra fields of filters loaded with the same list defaults.
+
+    Most filters have no overrides, or share them with many other filters, so filters loaded from identical data are
+    given the same objects instead of validating and storing a copy each.
+    The interned objects are shared between filters, and so mustn't be mutated.
+    """
+
+    def __init__(self, defaults: Defaults | None = None):
+        self.defaults = defaults
+        self._settings: dict[str, tuple[ActionSettings | None, ValidationSettings | None]] = {}
+        self._extra_fields: dict[tuple[type[BaseModel], str], BaseModel] = {}
+
+    @staticmethod
+    def _key(data: dict) -> str:
+        """Return a canonical representation of the data to key the interned objects by."""
+        return json.dumps(data, sort_keys=True, default=str)
+
+    def create_settings(self, settings_data: dict) -> tuple[ActionSettings | None, ValidationSettings | None]:
+        """Return the settings for the given overrides, creating them only if they weren't seen before."""
+        key = self._key(settings_data)
+        settings = self._settings.get(key)
+        if settings is None:
+            settings = self._settings[key] = create_settings(settings_data, defaults=self.defaults)
+        return settings
+
+    def create_extra_fields(self, model: type[TModel], data: dict) -> TModel:
+        """Return a model validated from the given data, creating it only if it wasn't seen before."""
+        key = (model, self._key(data))
+        extra_fields = self._extra_fields.get(key)
+        if extra_fields is None:
+            extra_fields = self._extra_fields[key] = model.model_validate(data)
+        return extra_fields
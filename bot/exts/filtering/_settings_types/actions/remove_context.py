@@ -1,8 +1,10 @@
+import asyncio
 from collections import defaultdict
 from typing import ClassVar, Self
 
 from discord import Message, Thread
-from discord.errors import HTTPException
+from discord.abc import Messageable
+from discord.errors import ClientException, HTTPException
 from pydis_core.utils import scheduling
 from pydis_core.utils.logging import get_logger
 
@@ -20,6 +22,85 @@ SUPERSTAR_REASON = (
     "If you believe this is a mistake, please let us know."
 )
 
+# The maximum number of messages Discord accepts in a single bulk delete.
+BULK_DELETE_LIMIT = 100
+
+
+class ChannelDeletions:
+    """
+    Deletes messages in bulk per channel, merging deletions requested while another is in progress.
+
+    During a raid many contexts delete messages in the same channels at once. The first request for a channel is sent
+    right away, and any requests which pile up behind it are sent together in the next bulk delete.
+    """
+
+    def __init__(self):
+        self._pending: dict[Messageable, list[tuple[set[Message], asyncio.Future]]] = {}
+        self._running: set[Messageable] = set()
+
+    async def delete(self, channel: Messageable, messages: set[Message]) -> bool:
+        """Delete the messages from the channel, and return whether it succeeded."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(channel, []).append((messages, future))
+        if channel not in self._running:
+            self._running.add(channel)
+            scheduling.create_task(self._process(channel))
+        return await future
+
+    async def _process(self, channel: Messageable) -> None:
+        """Keep deleting the pending messages of the channel until there are none left."""
+        try:
+            while requests := self._pending.pop(channel, None):
+                try:
+                    await self._delete_batch(channel, requests)
+                finally:
+                    # Never leave a caller waiting, even if the batch failed unexpectedly.
+                    for _, future in requests:
+                        if not future.done():
+                            future.set_result(False)
+        finally:
+            self._running.discard(channel)
+            for _, future in self._pending.pop(channel, []):
+                if not future.done():
+                    future.set_result(False)
+
+    @classmethod
+    async def _delete_batch(cls, channel: Messageable, requests: list[tuple[set[Message], asyncio.Future]]) -> None:
+        """Delete the messages of all requests together, falling back to a call per request on failure."""
+        messages = list(set().union(*(request_messages for request_messages, _ in requests)))
+        deleted = set()
+        if await cls._delete_chunks(channel, messages, deleted):
+            results = [True] * len(requests)
+        elif len(requests) == 1:
+            results = [False]
+        else:
+            # Don't fail every request because of a single bad message, and don't resend the chunks which succeeded.
+            results = []
+            for request_messages, _ in requests:
+                remaining = [message for message in request_messages if message not in deleted]
+                results.append(await cls._delete_chunks(channel, remaining, deleted))
+
+        for (_, future), result in zip(requests, results, strict=True):
+            if not future.done():
+                future.set_result(result)
+
+    @staticmethod
+    async def _delete_chunks(channel: Messageable, messages: list[Message], deleted: set[Message]) -> bool:
+        """Delete the messages in chunks Discord accepts, adding those deleted to `deleted`, and return if all were."""
+        success = True
+        for start in range(0, len(messages), BULK_DELETE_LIMIT):
+            chunk = messages[start:start + BULK_DELETE_LIMIT]
+            try:
+                await channel.delete_messages(chunk)
+            except (ClientException, HTTPException):
+                success = False
+            else:
+                deleted.update(chunk)
+        return success
+
+
+channel_deletions = ChannelDeletions()
+
 
 async def upload_messages_attachments(ctx: FilterContext, messages: list[Message]) -> None:
     """Re-upload the messages' attachments for future logging."""
@@ -69,13 +150,11 @@ class RemoveContext(ActionEntry):
         success = fail = 0
         deleted = list()
         for channel, messages in channel_messages.items():
-            try:
-                await channel.delete_messages(messages)
-            except HTTPException:
-                fail += len(messages)
-            else:
+            if await channel_deletions.delete(channel, messages):
                 success += len(messages)
                 deleted.extend(messages)
+            else:
+                fail += len(messages)
         scheduling.create_task(upload_messages_attachments(ctx, deleted))
 
         if not fail:
@@ -5,7 +5,7 @@ from abc import ABC, abstractmethod
 from collections.abc import Callable, Coroutine, Iterable
 from enum import EnumMeta
 from functools import partial
-from typing import Any, TypeVar, get_origin
+from typing import Any, TYPE_CHECKING, TypeVar, get_origin
 
 import discord
 from discord import Embed, Interaction
@@ -20,10 +20,12 @@ from pydis_core.utils.members import get_or_fetch_member
 import bot
 from bot.constants import Colours
 from bot.exts.filtering._filter_context import FilterContext
-from bot.exts.filtering._filter_lists import FilterList
 from bot.exts.filtering._utils import FakeContext, normalize_type
 from bot.utils.messages import format_channel, format_user, upload_log
 
+if TYPE_CHECKING:
+    from bot.exts.filtering._filter_lists import FilterList
+
 log = get_logger(__name__)
 
 
@@ -42,8 +44,9 @@ MAX_MODAL_TITLE_LENGTH = 45
 # Max number of items in a select
 MAX_SELECT_ITEMS = 25
 MAX_EMBED_DESCRIPTION = 4080
-# Number of seconds before timeout of the alert view
-ALERT_VIEW_TIMEOUT = 3600
+# The custom ID of an alert button, holding the button's action and the ID of the offending user.
+ALERT_CUSTOM_ID = "filtering:alert:{action}:{user_id}"
+ALERT_CUSTOM_ID_RE = re.compile(r"filtering:alert:(?P<action>id|info|infractions):(?P<user_id>\d+)")
 
 SETTINGS_DELIMITER = re.compile(r"\s+(?=\S+=\S+)")
 SINGLE_SETTING_PATTERN = re.compile(r"(--)?[\w/]+=.+")
@@ -532,41 +535,45 @@ class DeleteConfirmationView(discord.ui.View):
 
 
 class AlertView(discord.ui.View):
-    """A view providing info about the offending user."""
-
-    def __init__(self, ctx: FilterContext):
-        super().__init__(timeout=ALERT_VIEW_TIMEOUT)
-        self.ctx = ctx
-
-    @discord.ui.button(label="ID")
-    async def user_id(self, interaction: Interaction, button: discord.ui.Button) -> None:
-        """Reply with the ID of the offending user."""
-        await interaction.response.send_message(self.ctx.author.id, ephemeral=True)
-
-    @discord.ui.button(emoji="👤")
-    async def user_info(self, interaction: Interaction, button: discord.ui.Button) -> None:
-        """Send the info embed of the offending user."""
-        command = bot.instance.get_command("user")
-        if not command:
-            await interaction.response.send_message("The command `user` is not loaded.", ephemeral=True)
-            return
+    """
+    The buttons of an alert, providing info about the offending user.
+
+    The view itself holds no state. The user ID is encoded in each button's custom ID, and the presses are handled by
+    `handle_alert_interaction`, so the buttons keep working for as long as the alert exists, including across restarts.
+    """
+
+    def __init__(self, user_id: int):
+        super().__init__(timeout=None)
+        for action, label, emoji in (("id", "ID", None), ("info", None, "👤"), ("infractions", None, "🗒️")):
+            custom_id = ALERT_CUSTOM_ID.format(action=action, user_id=user_id)
+            self.add_item(discord.ui.Button(label=label, emoji=emoji, custom_id=custom_id))
+        # There's nothing for this instance to listen to, stopping it prevents it from being stored once sent.
+        self.stop()
 
-        await interaction.response.defer()
-        fake_ctx = FakeContext(interaction.message, interaction.channel, command, author=interaction.user)
-        # Get the most updated user/member object every time the button is pressed.
-        author = await get_or_fetch_member(interaction.guild, self.ctx.author.id)
-        if author is None:
-            author = await bot.instance.fetch_user(self.ctx.author.id)
-        await command(fake_ctx, author)
-
-    @discord.ui.button(emoji="🗒️")
-    async def user_infractions(self, interaction: Interaction, button: discord.ui.Button) -> None:
-        """Send the infractions embed of the offending user."""
-        command = bot.instance.get_command("infraction search")
-        if not command:
-            await interaction.response.send_message("The command `infraction search` is not loaded.", ephemeral=True)
-            return
 
-        await interaction.response.defer()
-        fake_ctx = FakeContext(interaction.message, interaction.channel, command, author=interaction.user)
-        await command(fake_ctx, self.ctx.author)
+async def handle_alert_interaction(interaction: Interaction) -> None:
+    """Respond to a press of an alert button, if that's what the interaction is."""
+    if interaction.type is not discord.InteractionType.component:
+        return
+    match = ALERT_CUSTOM_ID_RE.fullmatch(interaction.data.get("custom_id", ""))
+    if not match:
+        return
+
+    user_id = int(match.group("user_id"))
+    if match.group("action") == "id":
+        await interaction.response.send_message(user_id, ephemeral=True)
+        return
+
+    command_name = "user" if match.group("action") == "info" else "infraction search"
+    command = bot.instance.get_command(command_name)
+    if not command:
+        await interaction.response.send_message(f"The command `{command_name}` is not loaded.", ephemeral=True)
+        return
+
+    await interaction.response.defer()
+    fake_ctx = FakeContext(interaction.message, interaction.channel, command, author=interaction.user)
+    # Get the most updated user/member object every time the button is pressed.
+    user = await get_or_fetch_member(interaction.guild, user_id)
+    if user is None:
+        user = await bot.instance.fetch_user(user_id)
+    await command(fake_ctx, user)
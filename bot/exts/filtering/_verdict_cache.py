@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import hashlib
+import time
+import typing
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+if typing.TYPE_CHECKING:
+    from bot.exts.filtering._filters.filter import Filter
+
+# How long a verdict is kept after the content was first filtered, in seconds.
+VERDICT_TTL = 30
+# How many verdicts are kept per list.
+VERDICT_CACHE_SIZE = 512
+
+
+@dataclass
+class Verdict:
+    """The outcome of running the filters of a list on some content."""
+
+    # The matches and notification domain each triggered filter added to the context.
+    triggered: dict[Filter, tuple[list[str], str]] = field(default_factory=dict)
+    # The filters which weren't run, because their validations failed in the contexts seen so far.
+    skipped: set[Filter] = field(default_factory=set)
+    # Whether every filter of the list not in `skipped` was run on the content.
+    complete: bool = False
+    expires_at: float = 0
+
+
+class VerdictCache:
+    """
+    A short-lived cache of the filters triggered by a given content, for lists whose filters only look at the content.
+
+    During spam waves the same content is posted by many accounts in many channels. The validations of each filter are
+    still evaluated in every context, but a filter which already ran on the content isn't run again.
+
+    Since the verdicts don't track changes to the filters, the cache must be cleared whenever a filter is added or
+    edited. Deleted filters are simply not looked up anymore.
+    """
+
+    def __init__(self, ttl: float = VERDICT_TTL, maxsize: int = VERDICT_CACHE_SIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._verdicts: dict[bytes, Verdict] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(content: str | Iterable) -> bytes:
+        """Return a digest of the content to key its verdict by."""
+        if not isinstance(content, str):
+            content = "\n".join(sorted(map(str, content)))
+        return hashlib.blake2b(content.encode(), digest_size=16).digest()
+
+    def get(self, key: bytes) -> Verdict | None:
+        """Return the verdict for the content key if there's one which didn't expire yet."""
+        verdict = self._verdicts.get(key)
+        if verdict is not None and verdict.expires_at < time.monotonic():
+            del self._verdicts[key]
+            verdict = None
+
+        if verdict is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return verdict
+
+    def set(self, key: bytes, verdict: Verdict) -> None:
+        """Store a complete verdict for the content key."""
+        if len(self._verdicts) >= self.maxsize:
+            del self._verdicts[next(iter(self._verdicts))]  # Evict the oldest verdict.
+        verdict.expires_at = time.monotonic() + self.ttl
+        self._verdicts[key] = verdict
+
+    @property
+    def hit_rate(self) -> float:
+        """The ratio of lookups which found a verdict."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0
+
+    def clear(self) -> None:
+        """Remove all verdicts."""
+        self._verdicts.clear()
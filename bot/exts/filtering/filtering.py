@@ -1,9 +1,10 @@
+import asyncio
 import datetime
 import io
 import json
 import re
 import unicodedata
-from collections import defaultdict
+from collections import defaultdict, deque
 from collections.abc import Iterable, Mapping
 from functools import partial, reduce
 from io import BytesIO
@@ -16,6 +17,7 @@ from async_rediscache import RedisCache
 from discord import Colour, Embed, HTTPException, Message, MessageType, Thread
 from discord.ext import commands, tasks
 from discord.ext.commands import BadArgument, Cog, Context, command, has_any_role
+from more_itertools import chunked
 from pydis_core.site_api import ResponseCodeError
 from pydis_core.utils import scheduling
 from pydis_core.utils.paste_service import PasteFile, PasteTooLongError, PasteUploadError, send_to_paste_service
@@ -46,6 +48,7 @@ from bot.exts.filtering._ui.ui import (
     DeleteConfirmationView,
     build_mod_alert,
     format_response_error,
+    handle_alert_interaction,
 )
 from bot.exts.filtering._utils import past_tense, repr_equals, starting_value, to_serializable
 from bot.exts.moderation.infraction.infractions import COMP_BAN_DURATION, COMP_BAN_REASON
@@ -63,7 +66,15 @@ WEBHOOK_NAME = "Filtering System"
 CACHE_SIZE = 1000
 HOURS_BETWEEN_NICKNAME_ALERTS = 1
 OFFENSIVE_MSG_DELETE_TIME = datetime.timedelta(days=7)
+# Offensive messages due within the same interval are deleted together.
+OFFENSIVE_MSG_PURGE_INTERVAL = datetime.timedelta(minutes=10)
+# Number of seconds new offensive messages are buffered for before being posted to the database.
+OFFENSIVE_MSG_FLUSH_DELAY = 5
+# Discord only allows bulk deleting up to 100 messages at a time, which are at most 14 days old.
+BULK_DELETE_LIMIT = 100
+BULK_DELETE_MAX_AGE = datetime.timedelta(days=14)
 WEEKLY_REPORT_ISO_DAY = 3  # 1=Monday, 7=Sunday
+ACTIONS_UNION_CACHE_SIZE = 256
 
 
 class Filtering(Cog):
@@ -82,6 +93,12 @@ class Filtering(Cog):
         self.filter_lists: dict[str, FilterList] = {}
         self._subscriptions: defaultdict[Event, list[FilterList]] = defaultdict(list)
         self.delete_scheduler = scheduling.Scheduler(self.__class__.__name__)
+        # Offensive messages scheduled for deletion, by the purge interval they're due in.
+        self._scheduled_purges: dict[int, list[dict]] = {}
+        # Offensive messages waiting to be posted to the database.
+        self._offensive_msgs_buffer: deque[dict] = deque()
+        self._offensive_msgs_flush_task: asyncio.Task | None = None
+        self._offensive_msgs_load_task: asyncio.Task | None = None
         self.webhook: discord.Webhook | None = None
 
         self.loaded_settings = {}
@@ -89,6 +106,8 @@ class Filtering(Cog):
         self.loaded_filter_settings = {}
 
         self.message_cache = MessageCache(CACHE_SIZE, newest_first=True)
+        # Unions of the actions of several filter lists, by the identities of the actions.
+        self._actions_unions: dict[tuple[int, ...], tuple[tuple[ActionSettings, ...], ActionSettings]] = {}
 
     async def cog_load(self) -> None:
         """
@@ -110,7 +129,7 @@ class Filtering(Cog):
         self.webhook = await self._fetch_or_generate_filtering_webhook()
 
         self.collect_loaded_types(example_list)
-        await self.schedule_offending_messages_deletion()
+        self._offensive_msgs_load_task = scheduling.create_task(self.schedule_offending_messages_deletion())
         self.weekly_auto_infraction_report_task.start()
 
     def subscribe(self, filter_list: FilterList, *events: Event) -> None:
@@ -196,12 +215,13 @@ class Filtering(Cog):
         response = await self.bot.api_client.get("bot/offensive-messages")
 
         now = arrow.utcnow()
+        overdue = []
         for msg in response:
-            delete_at = arrow.get(msg["delete_date"])
-            if delete_at < now:
-                await self._delete_offensive_msg(msg)
+            if arrow.get(msg["delete_date"]) < now:
+                overdue.append(msg)
             else:
                 self._schedule_msg_delete(msg)
+        await self._delete_offensive_msgs(overdue)
 
     async def cog_check(self, ctx: Context) -> bool:
         """Only allow moderators to invoke the commands in this cog."""
@@ -263,6 +283,11 @@ class Filtering(Cog):
         await self._maybe_schedule_msg_delete(ctx, result_actions)
         self._increment_stats(triggers)
 
+    @Cog.listener()
+    async def on_interaction(self, interaction: discord.Interaction) -> None:
+        """Handle presses of the buttons of filtering alerts."""
+        await handle_alert_interaction(interaction)
+
     @Cog.listener()
     async def on_voice_state_update(self, member: discord.Member, *_) -> None:
         """Checks for bad words in usernames when users join, switch or leave a voice channel."""
@@ -958,10 +983,31 @@ class Filtering(Cog):
 
         result_actions = None
         if actions:
-            result_actions = reduce(ActionSettings.union, actions)
+            result_actions = self._union_actions(actions)
 
         return result_actions, messages, triggers
 
+    def _union_actions(self, actions: list[ActionSettings]) -> ActionSettings:
+        """
+        Return the union of the actions of several filter lists.
+
+        Most lists return their cached merged actions, so the union is cached as well by the identities of the actions.
+        The result is shared between events, and so mustn't be changed.
+        """
+        if len(actions) == 1:
+            return actions[0]
+
+        key = tuple(map(id, actions))
+        # The cached actions are kept alive with the entry, so their IDs can't be reused by another object in the key.
+        if (cached := self._actions_unions.get(key)) is not None:
+            return cached[1]
+
+        result = reduce(ActionSettings.union, actions)
+        if len(self._actions_unions) >= ACTIONS_UNION_CACHE_SIZE:
+            del self._actions_unions[next(iter(self._actions_unions))]  # Evict the oldest entry.
+        self._actions_unions[key] = (tuple(actions), result)
+        return result
+
     async def _send_alert(self, ctx: FilterContext, triggered_filters: dict[FilterList, Iterable[str]]) -> None:
         """Build an alert message from the filter context, and send it via the alert webhook."""
         if not self.webhook:
@@ -971,7 +1017,10 @@ class Filtering(Cog):
         embed = await build_mod_alert(ctx, triggered_filters)
         # There shouldn't be more than 10, but if there are it's not very useful to send them all.
         await self.webhook.send(
-            username=name, content=ctx.alert_content, embeds=[embed, *ctx.alert_embeds][:10], view=AlertView(ctx)
+            username=name,
+            content=ctx.alert_content,
+            embeds=[embed, *ctx.alert_embeds][:10],
+            view=AlertView(ctx.author.id),
         )
 
     def _increment_stats(self, triggered_filters: dict[AtomicList, list[Filter]]) -> None:
@@ -1357,28 +1406,69 @@ class Filtering(Cog):
         ctx = await bot.instance.get_context(message)
         await LinePaginator.paginate(lines, ctx, embed, max_lines=15, empty=False, reply=True)
 
-    async def _delete_offensive_msg(self, msg: Mapping[str, int]) -> None:
-        """Delete an offensive message, and then delete it from the DB."""
-        try:
-            channel = self.bot.get_channel(msg["channel_id"])
-            if channel:
-                msg_obj = await channel.fetch_message(msg["id"])
-                await msg_obj.delete()
-        except discord.NotFound:
-            log.info(
-                f"Tried to delete message {msg['id']}, but the message can't be found "
-                f"(it has been probably already deleted)."
-            )
-        except HTTPException as e:
-            log.warning(f"Failed to delete message {msg['id']}: status {e.status}")
+    async def _delete_offensive_msgs(self, msgs: list[Mapping[str, int | str]]) -> None:
+        """Delete offensive messages in bulk per channel, and then delete them from the DB."""
+        if not msgs:
+            return
+
+        channel_msgs = defaultdict(list)
+        for msg in msgs:
+            channel_msgs[msg["channel_id"]].append(msg["id"])
+        for channel_id, msg_ids in channel_msgs.items():
+            if channel := self.bot.get_channel(channel_id):
+                await self._bulk_delete_msgs(channel, msg_ids)
+
+        # There's no bulk deletion endpoint, and deleting concurrently would put too much load on the site.
+        for msg in msgs:
+            try:
+                await self.bot.api_client.delete(f'bot/offensive-messages/{msg["id"]}')
+            except ResponseCodeError as e:
+                log.warning(f"Failed to delete the offensive message with id {msg['id']} from the DB: {e}")
+        log.info(f"Deleted {len(msgs)} offensive messages.")
 
-        await self.bot.api_client.delete(f'bot/offensive-messages/{msg["id"]}')
-        log.info(f"Deleted the offensive message with id {msg['id']}.")
+    @staticmethod
+    async def _bulk_delete_msgs(channel: discord.abc.Messageable, msg_ids: list[int]) -> None:
+        """Delete the messages with the given IDs from the channel, in bulk where possible."""
+        oldest_bulk_snowflake = discord.utils.time_snowflake(arrow.utcnow().datetime - BULK_DELETE_MAX_AGE)
+        recent_ids = [msg_id for msg_id in msg_ids if msg_id > oldest_bulk_snowflake]
+        old_ids = [msg_id for msg_id in msg_ids if msg_id <= oldest_bulk_snowflake]
+
+        for chunk in chunked(recent_ids, BULK_DELETE_LIMIT):
+            try:
+                await channel.delete_messages([discord.Object(msg_id) for msg_id in chunk])
+            except HTTPException as e:
+                # A single unknown message fails the whole bulk deletion.
+                log.info(f"Failed to bulk delete {len(chunk)} offensive messages (status {e.status}), retrying each.")
+                old_ids.extend(chunk)
+
+        for msg_id in old_ids:
+            try:
+                await channel.get_partial_message(msg_id).delete()
+            except discord.NotFound:
+                log.info(
+                    f"Tried to delete message {msg_id}, but the message can't be found "
+                    f"(it has been probably already deleted)."
+                )
+            except HTTPException as e:
+                log.warning(f"Failed to delete message {msg_id}: status {e.status}")
 
     def _schedule_msg_delete(self, msg: dict) -> None:
-        """Delete an offensive message once its deletion date is reached."""
-        delete_at = arrow.get(msg["delete_date"]).datetime
-        self.delete_scheduler.schedule_at(delete_at, msg["id"], self._delete_offensive_msg(msg))
+        """Delete an offensive message once its deletion date is reached, together with others due around then."""
+        interval = OFFENSIVE_MSG_PURGE_INTERVAL.total_seconds()
+        purge_key = -int(-arrow.get(msg["delete_date"]).timestamp() // interval)  # Round up to the next interval.
+        if purge_key not in self._scheduled_purges:
+            self._scheduled_purges[purge_key] = []
+            purge_at = arrow.get(purge_key * interval).datetime
+            self.delete_scheduler.schedule_at(purge_at, purge_key, self._purge_offensive_msgs(purge_key))
+        self._scheduled_purges[purge_key].append(msg)
+
+    async def _purge_offensive_msgs(self, purge_key: int) -> None:
+        """Delete the offensive messages which were due in the given purge interval."""
+        # Messages added to this interval while deleting are deleted in the same run.
+        while msgs := self._scheduled_purges.get(purge_key):
+            self._scheduled_purges[purge_key] = []
+            await self._delete_offensive_msgs(msgs)
+        self._scheduled_purges.pop(purge_key, None)
 
     async def _maybe_schedule_msg_delete(self, ctx: FilterContext, actions: ActionSettings | None) -> None:
         """Post the message to the database and schedule it for deletion if it's not set to be deleted already."""
@@ -1393,16 +1483,36 @@ class Filtering(Cog):
             "delete_date": delete_date
         }
 
-        try:
-            await self.bot.api_client.post("bot/offensive-messages", json=data)
-        except ResponseCodeError as e:
-            if e.status == 400 and "already exists" in e.response_json.get("id", [""])[0]:
-                log.debug(f"Offensive message {msg.id} already exists.")
+        self._offensive_msgs_buffer.append(data)
+        if not self._offensive_msgs_flush_task or self._offensive_msgs_flush_task.done():
+            self._offensive_msgs_flush_task = scheduling.create_task(
+                self._flush_offensive_msgs(OFFENSIVE_MSG_FLUSH_DELAY)
+            )
+
+    async def _flush_offensive_msgs(self, delay: float = 0, schedule: bool = True) -> None:
+        """
+        Post the buffered offensive messages to the database, and schedule them for deletion.
+
+        With `schedule` set to False the messages are only posted, and are left to be scheduled from the database
+        the next time the cog loads.
+        """
+        await asyncio.sleep(delay)
+        # Messages buffered while flushing are posted in the same run.
+        while self._offensive_msgs_buffer:
+            data = self._offensive_msgs_buffer[0]
+            try:
+                await self.bot.api_client.post("bot/offensive-messages", json=data)
+            except ResponseCodeError as e:
+                if e.status == 400 and "already exists" in e.response_json.get("id", [""])[0]:
+                    log.debug(f"Offensive message {data['id']} already exists.")
+                else:
+                    log.error(f"Offensive message {data['id']} failed to post: {e}")
             else:
-                log.error(f"Offensive message {msg.id} failed to post: {e}")
-        else:
-            self._schedule_msg_delete(data)
-            log.trace(f"Offensive message {msg.id} will be deleted on {delete_date}")
+                if schedule:
+                    self._schedule_msg_delete(data)
+                log.trace(f"Offensive message {data['id']} will be deleted on {data['delete_date']}")
+            # Only remove the message once it's handled, so that it's posted on unload if the flush is cancelled.
+            self._offensive_msgs_buffer.popleft()
 
     # endregion
     # region: tasks
@@ -1486,6 +1596,11 @@ class Filtering(Cog):
     async def cog_unload(self) -> None:
         """Cancel the weekly auto-infraction filter report and deletion scheduling on cog unload."""
         self.weekly_auto_infraction_report_task.cancel()
+        if self._offensive_msgs_load_task:
+            self._offensive_msgs_load_task.cancel()
+        if self._offensive_msgs_flush_task:
+            self._offensive_msgs_flush_task.cancel()
+        await self._flush_offensive_msgs(schedule=False)
         self.delete_scheduler.cancel_all()
 
 
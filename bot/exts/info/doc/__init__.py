@@ -1,6 +1,10 @@
+from pathlib import Path
+
 from bot.bot import Bot
+from bot.constants import Doc
 
-from ._redis_cache import DocRedisCache
+from ._inventory_cache import InventoryCache
+from ._redis_cache import DocRedisCache, SymbolPopularityCounter
 
 MAX_SIGNATURE_AMOUNT = 3
 PRIORITY_PACKAGES = (
@@ -9,6 +13,8 @@ PRIORITY_PACKAGES = (
 NAMESPACE = "doc"
 
 doc_cache = DocRedisCache(namespace=NAMESPACE)
+popularity_counter = SymbolPopularityCounter(namespace=f"{NAMESPACE}_popularity")
+inventory_cache = InventoryCache(Path(Doc.inventory_cache_dir)) if Doc.inventory_cache_dir else None
 
 
 async def setup(bot: Bot) -> None:
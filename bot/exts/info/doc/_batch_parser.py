@@ -1,26 +1,45 @@
 from __future__ import annotations
 
 import asyncio
-import collections
-from collections import defaultdict, deque
-from contextlib import suppress
+import heapq
+import itertools
+import multiprocessing
+import sys
+from collections import Counter, OrderedDict, defaultdict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from operator import attrgetter
-from typing import NamedTuple
+from typing import TYPE_CHECKING
 
+import aiohttp
 import discord
-from bs4 import BeautifulSoup
 from pydis_core.utils import scheduling
 
 import bot
-from bot.constants import Channels
+from bot.constants import Channels, Doc
 from bot.log import get_logger
 
 from . import _cog, doc_cache
-from ._parsing import get_symbol_markdown
+from ._parsing import PARSED_PAGE_CACHE_SIZE, get_page_markdown
 from ._redis_cache import StaleItemCounter
 
+if TYPE_CHECKING:
+    from ._symbol_table import PackageSymbols
+
 log = get_logger(__name__)
 
+# The parsing competes with the bot for the CPU, so only a couple of processes are used.
+PARSE_PROCESSES = 2
+# Forked processes would get a copy of the bot's memory, along with any locks held by its threads at the time,
+# so the parsing processes are started from a fresh server process instead where that's available.
+PARSE_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+# How many symbols from the same page are sent to be parsed at once.
+# Requested symbols may have to wait for a batch to finish, so it's kept small.
+PARSE_BATCH_SIZE = 16
+# How long parsed Markdown of pages that still have queued items is buffered before it's written to redis.
+MARKDOWN_FLUSH_DELAY = 5
+
 
 class StaleInventoryNotifier:
     """Handle sending notifications about stale inventories through `DocItem`s to dev log."""
@@ -54,16 +73,200 @@ class StaleInventoryNotifier:
                 await self._dev_log.send(embed=embed)
 
 
-class QueueItem(NamedTuple):
-    """Contains a `DocItem` and the `BeautifulSoup` object needed to parse it."""
+class ParseQueue:
+    """
+    A priority queue of `DocItem`s waiting to be parsed.
+
+    Items are popped in the order they were pushed, apart from items moved to the front,
+    which are popped before them with the most recently moved item first, and low priority items,
+    which are only popped once no other items are left.
+    Both pushing and moving an item to the front take O(log n) time;
+    moved items leave their old heap entry behind marked as removed, which is skipped once it's popped.
+    """
+
+    _REMOVED = None
+
+    def __init__(self):
+        self._heap: list[list] = []
+        self._entries: dict[_cog.DocItem, list] = {}
+        self._counter = itertools.count()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, doc_item: _cog.DocItem):
+        return doc_item in self._entries
+
+    def push(self, doc_item: _cog.DocItem, *, low_priority: bool = False) -> bool:
+        """Add `doc_item` to the back of the queue; return False if it was already queued, True otherwise."""
+        if doc_item in self._entries:
+            return False
+        self._push_entry((2 if low_priority else 1, next(self._counter)), doc_item)
+        return True
+
+    def move_to_front(self, doc_item: _cog.DocItem) -> None:
+        """Move the queued `doc_item` to the front of the queue."""
+        self._entries.pop(doc_item)[-1] = self._REMOVED
+        self._push_entry((0, -next(self._counter)), doc_item)
+
+    def peek(self) -> _cog.DocItem:
+        """Return the item at the front of the queue without removing it."""
+        self._discard_removed()
+        return self._heap[0][-1]
+
+    def pop(self) -> _cog.DocItem:
+        """Remove and return the item at the front of the queue."""
+        self._discard_removed()
+        doc_item = heapq.heappop(self._heap)[-1]
+        del self._entries[doc_item]
+        return doc_item
+
+    def clear(self) -> None:
+        """Remove all items from the queue."""
+        self._heap.clear()
+        self._entries.clear()
+
+    def _push_entry(self, priority: tuple[int, int], doc_item: _cog.DocItem) -> None:
+        entry = [priority, doc_item]
+        self._entries[doc_item] = entry
+        heapq.heappush(self._heap, entry)
+
+    def _discard_removed(self) -> None:
+        while self._heap and self._heap[0][-1] is self._REMOVED:
+            heapq.heappop(self._heap)
+
+
+class PageStore:
+    """
+    Hold the HTML of pages with queued items, keeping its estimated size under `max_size` bytes.
+
+    Once the limit is exceeded, the least recently used pages are evicted and have to be fetched again when needed.
+    A page is dropped once none of its items are queued.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.size = 0
+        self._pages: OrderedDict[str, str] = OrderedDict()
+        self._queued_counts: Counter[str] = Counter()
+
+    def __len__(self):
+        return len(self._pages)
 
-    doc_item: _cog.DocItem
-    soup: BeautifulSoup
+    def get(self, url: str) -> str | None:
+        """Return the HTML of the page at `url` if it's held, marking it as recently used."""
+        html = self._pages.get(url)
+        if html is not None:
+            self._pages.move_to_end(url)
+        return html
 
-    def __eq__(self, other: QueueItem | _cog.DocItem):
-        if isinstance(other, _cog.DocItem):
-            return self.doc_item == other
-        return NamedTuple.__eq__(self, other)
+    def put(self, url: str, html: str, queued_count: int = 0) -> None:
+        """
+        Hold the HTML of the page at `url`, which had `queued_count` more of its items queued.
+
+        Other pages are evicted if the HTML doesn't fit under the size limit.
+        """
+        queued_count += self._queued_counts[url]
+        if queued_count <= 0:
+            return
+        self._queued_counts[url] = queued_count
+        self._discard(url)
+        self._pages[url] = html
+        self.size += sys.getsizeof(html)
+
+        while self.size > self.max_size and len(self._pages) > 1:
+            evicted_url = next(iter(self._pages))
+            if evicted_url == url:
+                break
+            self._discard(evicted_url)
+            log.debug(f"Evicted {evicted_url} from the queued pages to stay under {self.max_size} bytes.")
+        self._report()
+
+    def is_queued(self, url: str) -> bool:
+        """Return whether any items from the page at `url` are queued."""
+        return self._queued_counts[url] > 0
+
+    def release(self, url: str, count: int) -> None:
+        """Mark `count` items from the page at `url` as no longer queued, dropping the page if none are left."""
+        self._queued_counts[url] -= count
+        if self._queued_counts[url] <= 0:
+            del self._queued_counts[url]
+            self._discard(url)
+            self._report()
+
+    def clear(self) -> None:
+        """Drop all pages."""
+        self._pages.clear()
+        self._queued_counts.clear()
+        self.size = 0
+        self._report()
+
+    def _discard(self, url: str) -> None:
+        html = self._pages.pop(url, None)
+        if html is not None:
+            self.size -= sys.getsizeof(html)
+
+    def _report(self) -> None:
+        """Send the resident page count and their estimated size to statsd."""
+        bot.instance.stats.gauge("doc.queued_pages.resident", len(self._pages))
+        bot.instance.stats.gauge("doc.queued_pages.size", self.size)
+
+
+class ParseProcess:
+    """
+    A process parsing the symbols of doc pages, started when it's first used.
+
+    The process keeps the last `PARSED_PAGE_CACHE_SIZE` pages it parsed, which are tracked here by their urls,
+    so the HTML of a page only has to be sent to it once.
+    """
+
+    def __init__(self):
+        self.busy = False
+        self._executor: ProcessPoolExecutor | None = None
+        self._urls: OrderedDict[str, None] = OrderedDict()
+
+    def has_page(self, url: str) -> bool:
+        """Return whether the process has the page at `url` parsed."""
+        return url in self._urls
+
+    async def parse(
+        self, url: str, html: str | None, doc_items: list[_cog.DocItem]
+    ) -> dict[_cog.DocItem, str | None] | None:
+        """
+        Return the Markdown of `doc_items` from the page at `url`, parsed in the process.
+
+        `html` can be None if the process has the page, in which case None is returned if it turns out it doesn't.
+        If the process died, it's shut down to be started again on the next use, and `BrokenProcessPool` is raised.
+        """
+        self._urls[url] = None
+        self._urls.move_to_end(url)
+        while len(self._urls) > PARSED_PAGE_CACHE_SIZE:
+            self._urls.popitem(last=False)
+        try:
+            results = await bot.instance.loop.run_in_executor(
+                self._get_executor(), get_page_markdown, url, html, doc_items
+            )
+        except BrokenProcessPool:
+            self.shutdown()
+            raise
+        if results is None:
+            self._urls.pop(url, None)
+        return results
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Return the executor of the process, starting it if it's not running."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context(PARSE_START_METHOD)
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Stop the process without waiting for it, forgetting the pages it had."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._urls.clear()
 
 
 class ParseResultFuture(asyncio.Future):
@@ -83,16 +286,24 @@ class BatchParser:
     """
     Get the Markdown of all symbols on a page and send them to redis when a symbol is requested.
 
-    DocItems are added through the `add_item` method which adds them to the `_page_doc_items` dict.
+    DocItems are set through the `set_items` method which maps their pages to their packages in `_page_packages`.
     `get_markdown` is used to fetch the Markdown; when this is used for the first time on a page,
     all of the symbols are queued to be parsed to avoid multiple web requests to the same page.
+
+    The parsing is done in batches of symbols from the same page, on `PARSE_PROCESSES` dedicated processes.
+    A batch goes to a process which already has its page parsed where possible, so the page isn't sent to it again.
     """
 
     def __init__(self):
-        self._queue: deque[QueueItem] = collections.deque()
-        self._page_doc_items: dict[str, list[_cog.DocItem]] = defaultdict(list)
+        self._queue = ParseQueue()
+        self._pages = PageStore(Doc.max_queued_pages_size)
+        self._page_packages: dict[str, list[PackageSymbols]] = {}
         self._item_futures: dict[_cog.DocItem, ParseResultFuture] = defaultdict(ParseResultFuture)
         self._parse_task = None
+        self._processes = [ParseProcess() for _ in range(PARSE_PROCESSES)]
+        # Parsed Markdown waiting to be written to redis, by page url.
+        self._unflushed_markdown: dict[str, dict[_cog.DocItem, str]] = defaultdict(dict)
+        self._flush_task: asyncio.Task | None = None
 
         self.stale_inventory_notifier = StaleInventoryNotifier()
 
@@ -102,85 +313,202 @@ class BatchParser:
 
         If no symbols were fetched from `doc_item`s page before,
         the HTML has to be fetched and then all items from the page are put into the parse queue.
+        If the items were replaced while the page was fetched and `doc_item` is no longer on its page,
+        None is returned to everything waiting for it.
 
         Not safe to run while `self.clear` is running.
         """
+        if (markdown := self._unflushed_markdown.get(doc_item.url, {}).get(doc_item)) is not None:
+            return markdown
+
         if doc_item not in self._item_futures and doc_item not in self._queue:
             self._item_futures[doc_item].user_requested = True
 
-            async with bot.instance.http_session.get(doc_item.url, raise_for_status=True) as response:
-                soup = await bot.instance.loop.run_in_executor(
-                    None,
-                    BeautifulSoup,
-                    await response.text(encoding="utf8"),
-                    "lxml",
-                )
-
-            self._queue.extendleft(QueueItem(item, soup) for item in self._page_doc_items[doc_item.url])
+            html = await self._fetch_page(doc_item.url)
+            queued_count = sum(self._queue.push(item) for item in self._page_items(doc_item.url))
+            self._pages.put(doc_item.url, html, queued_count)
             log.debug(f"Added items from {doc_item.url} to the parse queue.")
 
             if self._parse_task is None:
                 self._parse_task = scheduling.create_task(self._parse_queue(), name="Queue parse")
+            if doc_item not in self._queue:
+                # The items were replaced while the page was fetched, and the page no longer has this item.
+                log.debug(f"{doc_item} was removed from its page while the page was fetched.")
+                if (future := self._item_futures.pop(doc_item, None)) is not None and not future.done():
+                    future.set_result(None)
+                return None
         else:
             self._item_futures[doc_item].user_requested = True
-        with suppress(ValueError):
-            # If the item is not in the queue then the item is already parsed or is being parsed
-            self._move_to_front(doc_item)
+        # If the item is not in the queue then the item is already parsed or is being parsed
+        if doc_item in self._queue:
+            self._queue.move_to_front(doc_item)
+            # Keep the page from being evicted before the item is parsed.
+            self._pages.get(doc_item.url)
+            log.trace(f"Moved {doc_item} to the front of the queue.")
         return await self._item_futures[doc_item]
 
+    async def prefetch(self, url: str) -> None:
+        """
+        Fetch the page at `url` and queue its items with a low priority, to have them parsed into the cache.
+
+        Nothing is done if items from the page are already queued.
+        """
+        if self._pages.is_queued(url):
+            return
+        html = await self._fetch_page(url)
+        queued_count = sum(
+            self._queue.push(item, low_priority=True)
+            for item in self._page_items(url) if item not in self._item_futures
+        )
+        self._pages.put(url, html, queued_count)
+        log.debug(f"Added items from {url} to the parse queue for prefetching.")
+
+        if queued_count and self._parse_task is None:
+            self._parse_task = scheduling.create_task(self._parse_queue(), name="Queue parse")
+
+    def _page_items(self, url: str) -> Iterator[_cog.DocItem]:
+        """Return the DocItems of the symbols on the page at `url`."""
+        for package in self._page_packages.get(url, ()):
+            yield from package.page_items(url)
+
+    async def _fetch_page(self, url: str) -> str:
+        """Fetch the HTML of the page at `url`."""
+        async with bot.instance.http_session.get(url, raise_for_status=True) as response:
+            return await response.text(encoding="utf8")
+
     async def _parse_queue(self) -> None:
         """
         Parse all items from the queue, setting their result Markdown on the futures and sending them to redis.
 
+        Up to `PARSE_PROCESSES` batches are parsed at once.
         The coroutine will run as long as the queue is not empty, resetting `self._parse_task` to None when finished.
         """
         log.trace("Starting queue parsing.")
+        batch_tasks = set()
         try:
-            while self._queue:
-                item, soup = self._queue.pop()
-                markdown = None
-
-                if (future := self._item_futures[item]).done():
-                    # Some items are present in the inventories multiple times under different symbol names,
-                    # if we already parsed an equal item, we can just skip it.
-                    continue
-
-                try:
-                    markdown = await bot.instance.loop.run_in_executor(None, get_symbol_markdown, soup, item)
-                    if markdown is not None:
-                        await doc_cache.set(item, markdown)
-                    else:
-                        # Don't wait for this coro as the parsing doesn't depend on anything it does.
-                        scheduling.create_task(
-                            self.stale_inventory_notifier.send_warning(item), name="Stale inventory warning"
-                        )
-                except Exception:
-                    log.exception(f"Unexpected error when handling {item}")
-                future.set_result(markdown)
-                del self._item_futures[item]
-                await asyncio.sleep(0.1)
+            while self._queue or batch_tasks:
+                while self._queue and len(batch_tasks) < PARSE_PROCESSES:
+                    batch_tasks.add(asyncio.create_task(self._parse_batch(self._pop_batch())))
+                _, batch_tasks = await asyncio.wait(batch_tasks, return_when=asyncio.FIRST_COMPLETED)
         finally:
+            for task in batch_tasks:
+                task.cancel()
             self._parse_task = None
             log.trace("Finished parsing queue.")
 
-    def _move_to_front(self, item: QueueItem | _cog.DocItem) -> None:
-        """Move `item` to the front of the parse queue."""
-        # The parse queue stores soups along with the doc symbols in QueueItem objects,
-        # in case we're moving a DocItem we have to get the associated QueueItem first and then move it.
-        item_index = self._queue.index(item)
-        queue_item = self._queue[item_index]
-        del self._queue[item_index]
+    def _pop_batch(self) -> list[_cog.DocItem]:
+        """Pop up to `PARSE_BATCH_SIZE` items from the front of the queue, as long as they're on the same page."""
+        batch = [self._queue.pop()]
+        url = batch[0].url
+        while self._queue and len(batch) < PARSE_BATCH_SIZE and self._queue.peek().url == url:
+            batch.append(self._queue.pop())
+        return batch
+
+    async def _get_page(self, url: str) -> str | None:
+        """
+        Get the HTML of the page at `url`, which has items in a popped batch.
+
+        If the page was evicted, it's fetched again. None is returned if that fails.
+        """
+        html = self._pages.get(url)
+        if html is None:
+            log.debug(f"Fetching evicted page {url} again.")
+            try:
+                html = await self._fetch_page(url)
+            except aiohttp.ClientError as e:
+                log.warning(f"Failed to fetch evicted page {url} again.", exc_info=e)
+                return None
+            self._pages.put(url, html)
+        return html
+
+    async def _parse_items(
+        self, process: ParseProcess, url: str, doc_items: list[_cog.DocItem]
+    ) -> dict[_cog.DocItem, str | None]:
+        """Parse `doc_items` from the page at `url` in `process`, only sending it the page if it doesn't have it."""
+        if process.has_page(url) and (results := await process.parse(url, None, doc_items)) is not None:
+            return results
+        html = await self._get_page(url)
+        if html is None:
+            return {}
+        return await process.parse(url, html, doc_items)
+
+    async def _parse_batch(self, batch: list[_cog.DocItem]) -> None:
+        """Parse the items of `batch` in an idle parsing process, and set their results."""
+        url = batch[0].url
+        # Some items are present in the inventories multiple times under different symbol names,
+        # if we already parsed an equal item, we can just skip it.
+        doc_items = [item for item in batch if not self._item_futures[item].done()]
+        # There's a process for each batch parsed at once, so one is always idle.
+        idle_processes = [process for process in self._processes if not process.busy]
+        process = next((process for process in idle_processes if process.has_page(url)), idle_processes[0])
+
+        results = {}
+        process.busy = True
+        try:
+            if doc_items:
+                results = await self._parse_items(process, url, doc_items)
+        except BrokenProcessPool:
+            log.warning("A doc parsing process died unexpectedly, restarting it.")
+        except Exception:
+            log.exception(f"Unexpected error when parsing items from {url}")
+        finally:
+            process.busy = False
+            self._pages.release(url, len(batch))
+
+        for doc_item in doc_items:
+            markdown = results.get(doc_item)
+            if markdown is not None:
+                self._unflushed_markdown[doc_item.url][doc_item] = markdown
+            elif doc_item in results:
+                # Don't wait for this coro as the parsing doesn't depend on anything it does.
+                scheduling.create_task(
+                    self.stale_inventory_notifier.send_warning(doc_item), name="Stale inventory warning"
+                )
+            if (future := self._item_futures.pop(doc_item, None)) is not None and not future.done():
+                future.set_result(markdown)
 
-        self._queue.append(queue_item)
-        log.trace(f"Moved {item} to the front of the queue.")
+        # Write the whole page at once when it's done, otherwise write what was parsed so far after a delay.
+        if not self._pages.is_queued(url):
+            await self._flush_page(url)
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = scheduling.create_task(self._flush_markdown(MARKDOWN_FLUSH_DELAY), name="Doc flush")
+
+    async def _flush_markdown(self, delay: float = 0) -> None:
+        """Write all of the buffered Markdown to redis after `delay` seconds."""
+        await asyncio.sleep(delay)
+        for url in list(self._unflushed_markdown):
+            await self._flush_page(url)
+
+    async def _flush_page(self, url: str) -> None:
+        """Write the buffered Markdown of the page at `url` to redis."""
+        if not (markdowns := self._unflushed_markdown.get(url)):
+            return
+        flushed = dict(markdowns)
+        try:
+            await doc_cache.set_many(flushed)
+        except Exception:
+            log.exception(f"Unexpected error when writing the Markdown from {url} to redis.")
+        # Items parsed while writing are kept for the next flush.
+        for doc_item in flushed:
+            markdowns.pop(doc_item, None)
+        if not markdowns and self._unflushed_markdown.get(url) is markdowns:
+            del self._unflushed_markdown[url]
+
+    def set_items(self, packages: Iterable[PackageSymbols]) -> None:
+        """
+        Replace the DocItems mapped to pages with the ones from `packages`.
 
-    def add_item(self, doc_item: _cog.DocItem) -> None:
-        """Map a DocItem to its page so that the symbol will be parsed once the page is requested."""
-        self._page_doc_items[doc_item.url].append(doc_item)
+        Items which are already queued or being parsed are left alone.
+        """
+        page_packages = defaultdict(list)
+        for package in packages:
+            for url in package.pages:
+                page_packages[url].append(package)
+        self._page_packages = dict(page_packages)
 
     async def clear(self) -> None:
         """
-        Clear all internal symbol data.
+        Clear all internal symbol data and shut down the parsing processes.
 
         Wait for all user-requested symbols to be parsed before clearing the parser.
         """
@@ -188,6 +516,12 @@ class BatchParser:
             await future
         if self._parse_task is not None:
             self._parse_task.cancel()
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        await self._flush_markdown()
+        for process in self._processes:
+            process.shutdown()
         self._queue.clear()
-        self._page_doc_items.clear()
+        self._pages.clear()
+        self._page_packages.clear()
         self._item_futures.clear()
@@ -1,29 +1,35 @@
 from __future__ import annotations
 
 import asyncio
-import sys
+import hashlib
+import json
 import textwrap
-from collections import defaultdict
+import time
+from collections import Counter, defaultdict
+from collections.abc import Iterator, MutableMapping
 from contextlib import suppress
 from types import SimpleNamespace
 from typing import Literal, NamedTuple
+from urllib.parse import urlsplit
 
 import aiohttp
 import discord
+from discord import app_commands
 from discord.ext import commands
 from pydis_core.site_api import ResponseCodeError
-from pydis_core.utils.scheduling import Scheduler
+from pydis_core.utils.scheduling import Scheduler, create_task
 
 from bot.bot import Bot
 from bot.constants import MODERATION_ROLES, RedirectOutput
 from bot.converters import Inventory, PackageName, ValidURL
 from bot.log import get_logger
 from bot.pagination import LinePaginator
-from bot.utils.lock import SharedEvent, lock
+from bot.utils.lock import lock
 from bot.utils.messages import send_denial, wait_for_deletion
 
-from . import NAMESPACE, PRIORITY_PACKAGES, _batch_parser, doc_cache
+from . import NAMESPACE, PRIORITY_PACKAGES, _batch_parser, _symbol_table, doc_cache, inventory_cache, popularity_counter
 from ._inventory_parser import InvalidHeaderError, InventoryDict, fetch_inventory
+from ._search import SymbolIndex
 
 log = get_logger(__name__)
 
@@ -41,6 +47,17 @@ NOT_FOUND_DELETE_DELAY = RedirectOutput.delete_delay
 FETCH_RESCHEDULE_DELAY = SimpleNamespace(first=2, repeated=5)
 
 COMMAND_LOCK_SINGLETON = "inventory refresh"
+# Max number of choices Discord accepts for an autocomplete
+MAX_AUTOCOMPLETE_CHOICES = 25
+# Max length of the name and value of an autocomplete choice
+MAX_CHOICE_LENGTH = 100
+SUGGESTION_COUNT = 3
+# How many of the most requested symbols are considered when picking the pages to prefetch after a refresh
+PREFETCH_SYMBOL_COUNT = 1000
+# How many of the pages with the most requested symbols are prefetched
+PREFETCH_PAGE_COUNT = 25
+# Minimum delay between prefetching pages from the same documentation host, in seconds
+PREFETCH_HOST_INTERVAL = 10
 
 
 class DocItem(NamedTuple):
@@ -58,6 +75,23 @@ class DocItem(NamedTuple):
         return self.base_url + self.relative_url_path
 
 
+class PackageInventory(NamedTuple):
+    """The symbols loaded from the inventory of a single package."""
+
+    base_url: str
+    inventory_hash: str  # Used to tell whether the inventory changed between refreshes
+    items: _symbol_table.PackageSymbols  # The symbol names as given by the inventory, and their items
+
+
+class RefreshReport(NamedTuple):
+    """The outcome of refreshing the inventories of all packages."""
+
+    updated: list[str]  # Packages whose inventory was loaded anew
+    unchanged: list[str]  # Packages whose inventory didn't change, and kept their symbols
+    failed: list[str]  # Packages whose inventory couldn't be fetched, and were rescheduled or dropped
+    duration: float  # Seconds the refresh took
+
+
 class DocCog(commands.Cog):
     """A set of commands for querying & displaying documentation."""
 
@@ -66,22 +100,64 @@ class DocCog(commands.Cog):
         # Used to calculate inventory diffs on refreshes and to display all currently stored inventories.
         self.base_urls = {}
         self.bot = bot
-        self.doc_symbols: dict[str, DocItem] = {}  # Maps symbol names to objects containing their metadata.
+        self.doc_symbols = _symbol_table.SymbolTable()  # Maps symbol names to objects containing their metadata.
         self.item_fetcher = _batch_parser.BatchParser()
         # Maps a conflicting symbol name to a list of the new, disambiguated names created from conflicts with the name.
         self.renamed_symbols = defaultdict(list)
+        # The loaded packages, in the order their symbols are added in.
+        # The tables above are derived from them, and are replaced together whenever the packages change.
+        self.packages: dict[str, PackageInventory] = {}
+        # Search index over the names in `doc_symbols`, for suggestions and autocompletion.
+        self.symbol_index = SymbolIndex(self.doc_symbols.names)
 
         self.inventory_scheduler = Scheduler(self.__class__.__name__)
-
-        self.refresh_event = asyncio.Event()
-        self.refresh_event.set()
-        self.symbol_get_event = SharedEvent()
+        self._prefetch_task: asyncio.Task | None = None
 
     async def cog_load(self) -> None:
-        """Refresh documentation inventory on cog initialization."""
+        """
+        Load the documentation inventories on cog initialization.
+
+        The inventories cached on disk are loaded right away, and revalidated by a refresh in the background,
+        which holds the same lock as the inventory commands.
+        """
         await self.bot.wait_until_guild_available()
+        packages = {}
+        for package in await self.bot.api_client.get("bot/documentation-links"):
+            cached = inventory_cache and await inventory_cache.get(package["inventory_url"])
+            if cached:
+                base_url = package["base_url"] or self.base_url_from_inventory_url(package["inventory_url"])
+                packages[package["package"]] = self.load_package(package["package"], base_url, cached.inventory)
+        self.set_packages(packages)
+        create_task(self._refresh_on_load())
+
+    @lock(NAMESPACE, COMMAND_LOCK_SINGLETON, wait=True)
+    async def _refresh_on_load(self) -> None:
+        """Refresh the inventories loaded from the disk cache, waiting for any running inventory command first."""
         await self.refresh_inventories()
 
+    def load_package(self, package_name: str, base_url: str, inventory: InventoryDict) -> PackageInventory:
+        """
+        Load the symbols of a single package from its inventory.
+
+        If the inventory didn't change since the package was last loaded, the loaded package is returned as is.
+        """
+        inventory_hash = hashlib.blake2b(json.dumps(inventory, sort_keys=True).encode(), digest_size=16).hexdigest()
+        package = self.packages.get(package_name)
+        if package and package.base_url == base_url and package.inventory_hash == inventory_hash:
+            log.trace(f"Inventory of {package_name} is unchanged, reusing its symbols.")
+            return package
+
+        def items() -> Iterator[tuple[str, DocItem]]:
+            for group, group_items in inventory.items():
+                # e.g. get 'class' from 'py:class'
+                group_name = group.split(":")[1]
+                for symbol_name, relative_doc_url in group_items:
+                    relative_url_path, _, symbol_id = relative_doc_url.partition("#")
+                    yield symbol_name, DocItem(package_name, group_name, base_url, relative_url_path, symbol_id)
+
+        log.trace(f"Loaded inventory for {package_name}.")
+        return PackageInventory(base_url, inventory_hash, _symbol_table.PackageSymbols(items()))
+
     def update_single(self, package_name: str, base_url: str, inventory: InventoryDict) -> None:
         """
         Build the inventory for a single package.
@@ -92,51 +168,91 @@ class DocCog(commands.Cog):
                 absolute paths that link to specific symbols
             * `package` is the content of a intersphinx inventory.
         """
-        self.base_urls[package_name] = base_url
+        package = self.load_package(package_name, base_url, inventory)
+        self.set_packages(self.packages | {package_name: package})
+
+    def set_packages(self, packages: dict[str, PackageInventory]) -> None:
+        """
+        Replace the loaded packages with `packages`, and swap in the symbol tables built from them.
 
-        for group, items in inventory.items():
-            for symbol_name, relative_doc_url in items:
+        The new tables are built to the side, so lookups never see a partially built table.
+        Only the symbols whose names appear in changed packages are re-added and have their conflicts resolved again,
+        the rest are carried over from the current tables without materialising their items.
+        """
+        changed = {
+            name for name in self.packages.keys() | packages.keys() if self.packages.get(name) is not packages.get(name)
+        }
+        if not changed:
+            return
 
-                # e.g. get 'class' from 'py:class'
-                group_name = group.split(":")[1]
+        affected_names = {
+            symbol_name
+            for name in changed
+            for package in (self.packages.get(name), packages.get(name)) if package
+            for symbol_name in package.items.names
+        }
+        # Renamed symbols are stored under their new names, which can be the names of other symbols,
+        # so the symbols a new name was taken by or from are re-added as well.
+        related_names = defaultdict(set)
+        for symbol_name, new_names in self.renamed_symbols.items():
+            for new_name in new_names:
+                related_names[symbol_name].add(new_name)
+                related_names[new_name].add(symbol_name)
+        added_names = affected_names
+        while added_names := {name for symbol_name in added_names for name in related_names[symbol_name]}:
+            added_names -= affected_names
+            affected_names |= added_names
+        renamed_symbols = defaultdict(list)
+        for symbol_name, new_names in self.renamed_symbols.items():
+            if symbol_name not in affected_names:
+                renamed_symbols[symbol_name] = new_names.copy()
+        doc_symbols = _symbol_table.SymbolTableChanges(self.doc_symbols, affected_names)
+
+        # Re-add the affected symbols in package order, so conflicts are resolved the same as in a full build.
+        item_locations = {}
+        for package_name, package in packages.items():
+            if package_name in changed:
+                positions = range(len(package.items))
+            else:
+                positions = package.items.positions_of(affected_names)
+            for position in positions:
+                symbol_name, doc_item = package.items[position]
+                item_locations.setdefault(doc_item, (package.items, position))
                 symbol_name = self.ensure_unique_symbol_name(
-                    package_name,
-                    group_name,
-                    symbol_name,
-                )
-
-                relative_url_path, _, symbol_id = relative_doc_url.partition("#")
-                # Intern fields that have shared content so we're not storing unique strings for every object
-                doc_item = DocItem(
-                    package_name,
-                    sys.intern(group_name),
-                    base_url,
-                    sys.intern(relative_url_path),
-                    symbol_id,
+                    package_name, doc_item.group, symbol_name, doc_symbols, renamed_symbols
                 )
-                self.doc_symbols[symbol_name] = doc_item
-                self.item_fetcher.add_item(doc_item)
-
-        log.trace(f"Fetched inventory for {package_name}.")
+                doc_symbols[symbol_name] = doc_item
+
+        self.item_fetcher.set_items(package.items for package in packages.values())
+        doc_cache.invalidate_local(changed)
+        self.packages = packages
+        self.base_urls = {package_name: package.base_url for package_name, package in packages.items()}
+        self.doc_symbols = self.doc_symbols.updated(
+            doc_symbols.removed,
+            {symbol_name: item_locations[doc_item] for symbol_name, doc_item in doc_symbols.added.items()},
+        )
+        self.renamed_symbols = renamed_symbols
+        self.symbol_index = SymbolIndex(self.doc_symbols.names)
+        log.trace(f"Updated the symbols of {len(changed)} packages.")
 
-    async def update_or_reschedule_inventory(
+    async def fetch_package(
         self,
         api_package_name: str,
         base_url: str,
         inventory_url: str,
-    ) -> None:
+    ) -> PackageInventory | None:
         """
-        Update the cog's inventories, or reschedule this method to execute again if the remote inventory is unreachable.
+        Fetch and load the inventory of a package, or reschedule updating it if the remote inventory is unreachable.
 
         The first attempt is rescheduled to execute in `FETCH_RESCHEDULE_DELAY.first` minutes, the subsequent attempts
         in `FETCH_RESCHEDULE_DELAY.repeated` minutes.
         """
         try:
-            package = await fetch_inventory(inventory_url)
+            package = await fetch_inventory(inventory_url, inventory_cache)
         except InvalidHeaderError as e:
             # Do not reschedule if the header is invalid, as the request went through but the contents are invalid.
             log.warning(f"Invalid inventory header at {inventory_url}. Reason: {e}")
-            return
+            return None
 
         if not package:
             if api_package_name in self.inventory_scheduler:
@@ -150,12 +266,31 @@ class DocCog(commands.Cog):
                 api_package_name,
                 self.update_or_reschedule_inventory(api_package_name, base_url, inventory_url),
             )
-        else:
-            if not base_url:
-                base_url = self.base_url_from_inventory_url(inventory_url)
-            self.update_single(api_package_name, base_url, package)
+            return None
+
+        if not base_url:
+            base_url = self.base_url_from_inventory_url(inventory_url)
+        return self.load_package(api_package_name, base_url, package)
 
-    def ensure_unique_symbol_name(self, package_name: str, group_name: str, symbol_name: str) -> str:
+    async def update_or_reschedule_inventory(
+        self,
+        api_package_name: str,
+        base_url: str,
+        inventory_url: str,
+    ) -> None:
+        """Update the cog's inventories with a single package, or reschedule this if it's unreachable."""
+        package = await self.fetch_package(api_package_name, base_url, inventory_url)
+        if package:
+            self.set_packages(self.packages | {api_package_name: package})
+
+    @staticmethod
+    def ensure_unique_symbol_name(
+        package_name: str,
+        group_name: str,
+        symbol_name: str,
+        doc_symbols: MutableMapping[str, DocItem],
+        renamed_symbols: defaultdict[str, list[str]],
+    ) -> str:
         """
         Ensure `symbol_name` doesn't overwrite an another symbol in `doc_symbols`.
 
@@ -164,23 +299,23 @@ class DocCog(commands.Cog):
 
         If the existing symbol was renamed or there was no conflict, the returned name is equivalent to `symbol_name`.
         """
-        if (item := self.doc_symbols.get(symbol_name)) is None:
+        if (item := doc_symbols.get(symbol_name)) is None:
             return symbol_name  # There's no conflict so it's fine to simply use the given symbol name.
 
         def rename(prefix: str, *, rename_extant: bool = False) -> str:
             new_name = f"{prefix}.{symbol_name}"
-            if new_name in self.doc_symbols:
+            if new_name in doc_symbols:
                 # If there's still a conflict, qualify the name further.
                 if rename_extant:
                     new_name = f"{item.package}.{item.group}.{symbol_name}"
                 else:
                     new_name = f"{package_name}.{group_name}.{symbol_name}"
 
-            self.renamed_symbols[symbol_name].append(new_name)
+            renamed_symbols[symbol_name].append(new_name)
 
             if rename_extant:
                 # Instead of renaming the current symbol, rename the symbol with which it conflicts.
-                self.doc_symbols[new_name] = self.doc_symbols[symbol_name]
+                doc_symbols[new_name] = doc_symbols[symbol_name]
                 return symbol_name
             return new_name
 
@@ -203,26 +338,90 @@ class DocCog(commands.Cog):
         # or deciding which item to rename would be arbitrary, so we rename the existing symbol.
         return rename(item.group, rename_extant=True)
 
-    async def refresh_inventories(self) -> None:
-        """Refresh internal documentation inventories."""
-        self.refresh_event.clear()
-        await self.symbol_get_event.wait()
+    async def refresh_inventories(self) -> RefreshReport:
+        """
+        Refresh internal documentation inventories, and return a report of the outcome for each package.
+
+        The current inventories keep being served until the refreshed ones are swapped in.
+        A package whose inventory can't be fetched keeps its current symbols until a rescheduled update succeeds.
+        The inventories are fetched concurrently, with the number of requests to a single host limited by
+        `fetch_inventory`, and the progress is logged as they complete.
+        """
         log.debug("Refreshing documentation inventory...")
+        start = time.monotonic()
         self.inventory_scheduler.cancel_all()
 
-        self.base_urls.clear()
-        self.doc_symbols.clear()
-        self.renamed_symbols.clear()
-        await self.item_fetcher.clear()
+        links = await self.bot.api_client.get("bot/documentation-links")
+        completed = 0
+
+        async def fetch(link: dict) -> PackageInventory | None:
+            nonlocal completed
+            package = await self.fetch_package(link["package"], link["base_url"], link["inventory_url"])
+            completed += 1
+            log.trace(f"Fetched {completed}/{len(links)} inventories.")
+            return package
+
+        fetched = await asyncio.gather(*(fetch(link) for link in links))
+        packages = {}
+        report = RefreshReport([], [], [], 0)
+        for link, package in zip(links, fetched, strict=True):
+            package_name = link["package"]
+            if package is None:
+                report.failed.append(package_name)
+            elif package is self.packages.get(package_name):
+                report.unchanged.append(package_name)
+            else:
+                report.updated.append(package_name)
+            if package := package or self.packages.get(package_name):
+                packages[package_name] = package
+
+        self.set_packages(packages)
+        report = report._replace(duration=time.monotonic() - start)
+        log.debug(
+            f"Finished inventory refresh in {report.duration:.1f}s: {len(report.updated)} updated, "
+            f"{len(report.unchanged)} unchanged, {len(report.failed)} failed."
+        )
 
-        coros = [
-            self.update_or_reschedule_inventory(
-                package["package"], package["base_url"], package["inventory_url"]
-            ) for package in await self.bot.api_client.get("bot/documentation-links")
-        ]
-        await asyncio.gather(*coros)
-        log.debug("Finished inventory refresh.")
-        self.refresh_event.set()
+        if self._prefetch_task is not None:
+            self._prefetch_task.cancel()
+        self._prefetch_task = create_task(self.prefetch_popular_pages())
+        return report
+
+    async def prefetch_popular_pages(self) -> None:
+        """
+        Fetch and parse the pages with the most requested symbols that aren't cached, so looking them up hits the cache.
+
+        The pages are parsed with a low priority, and pages from the same host are fetched `PREFETCH_HOST_INTERVAL`
+        seconds apart.
+        """
+        most_popular = await popularity_counter.most_popular(PREFETCH_SYMBOL_COUNT)
+        await popularity_counter.trim(PREFETCH_SYMBOL_COUNT)
+
+        page_counts = Counter()
+        page_items = {}
+        for symbol_name, count in most_popular:
+            if doc_item := self.doc_symbols.get(symbol_name):
+                page_counts[doc_item.url] += count
+                page_items.setdefault(doc_item.url, doc_item)
+
+        host_pages = defaultdict(list)
+        for url, _ in page_counts.most_common(PREFETCH_PAGE_COUNT):
+            # The page is assumed to be cached if its most requested symbol is.
+            if not await doc_cache.contains(page_items[url]):
+                host_pages[urlsplit(url).netloc].append(url)
+
+        log.debug(f"Prefetching {sum(map(len, host_pages.values()))} popular documentation pages.")
+        await asyncio.gather(*(self._prefetch_pages(urls) for urls in host_pages.values()))
+
+    async def _prefetch_pages(self, urls: list[str]) -> None:
+        """Prefetch the pages at `urls`, which are from the same host, `PREFETCH_HOST_INTERVAL` seconds apart."""
+        for index, url in enumerate(urls):
+            if index:
+                await asyncio.sleep(PREFETCH_HOST_INTERVAL)
+            try:
+                await self.item_fetcher.prefetch(url)
+            except aiohttp.ClientError as e:
+                log.info(f"Failed to prefetch {url}.", exc_info=e)
 
     def get_symbol_item(self, symbol_name: str) -> tuple[str, DocItem | None]:
         """
@@ -273,33 +472,29 @@ class DocCog(commands.Cog):
         First check the DocRedisCache before querying the cog's `BatchParser`.
         """
         log.trace(f"Building embed for symbol `{symbol_name}`")
-        if not self.refresh_event.is_set():
-            log.debug("Waiting for inventories to be refreshed before processing item.")
-            await self.refresh_event.wait()
-        # Ensure a refresh can't run in case of a context switch until the with block is exited
-        with self.symbol_get_event:
-            symbol_name, doc_item = self.get_symbol_item(symbol_name)
-            if doc_item is None:
-                log.debug("Symbol does not exist.")
-                return None
-
-            self.bot.stats.incr(f"doc_fetches.{doc_item.package}")
-
-            # Show all symbols with the same name that were renamed in the footer,
-            # with a max of 200 chars.
-            if symbol_name in self.renamed_symbols:
-                renamed_symbols = ", ".join(self.renamed_symbols[symbol_name])
-                footer_text = textwrap.shorten("Similar names: " + renamed_symbols, 200, placeholder=" ...")
-            else:
-                footer_text = ""
+        symbol_name, doc_item = self.get_symbol_item(symbol_name)
+        if doc_item is None:
+            log.debug("Symbol does not exist.")
+            return None
+
+        self.bot.stats.incr(f"doc_fetches.{doc_item.package}")
+        create_task(popularity_counter.increment_for(symbol_name))
+
+        # Show all symbols with the same name that were renamed in the footer,
+        # with a max of 200 chars.
+        if symbol_name in self.renamed_symbols:
+            renamed_symbols = ", ".join(self.renamed_symbols[symbol_name])
+            footer_text = textwrap.shorten("Similar names: " + renamed_symbols, 200, placeholder=" ...")
+        else:
+            footer_text = ""
 
-            embed = discord.Embed(
-                title=discord.utils.escape_markdown(symbol_name),
-                url=f"{doc_item.url}#{doc_item.symbol_id}",
-                description=await self.get_symbol_markdown(doc_item)
-            )
-            embed.set_footer(text=footer_text)
-            return embed
+        embed = discord.Embed(
+            title=discord.utils.escape_markdown(symbol_name),
+            url=f"{doc_item.url}#{doc_item.symbol_id}",
+            description=await self.get_symbol_markdown(doc_item)
+        )
+        embed.set_footer(text=footer_text)
+        return embed
 
     @commands.group(name="docs", aliases=("doc", "d"), invoke_without_command=True)
     async def docs_group(self, ctx: commands.Context, *, symbol_name: str | None) -> None:
@@ -339,7 +534,7 @@ class DocCog(commands.Cog):
                 doc_embed = await self.create_symbol_embed(symbol)
 
             if doc_embed is None:
-                error_message = await send_denial(ctx, "No documentation found for the requested symbol.")
+                error_message = await send_denial(ctx, self.not_found_message(symbol))
                 await wait_for_deletion(error_message, (ctx.author.id,), timeout=NOT_FOUND_DELETE_DELAY)
 
                 # Make sure that we won't cause a ghost-ping by deleting the message
@@ -352,6 +547,46 @@ class DocCog(commands.Cog):
                 msg = await ctx.send(embed=doc_embed)
                 await wait_for_deletion(msg, (ctx.author.id,))
 
+    @app_commands.command(name="docs")
+    @app_commands.guild_only()
+    async def docs_slash_command(self, interaction: discord.Interaction, symbol_name: str) -> None:
+        """Look up documentation for Python symbols."""
+        symbol = symbol_name.strip("`")
+        # Unknown symbols are answered right away, without deferring.
+        if self.get_symbol_item(symbol)[1] is None:
+            embed = discord.Embed(description=self.not_found_message(symbol), colour=discord.Colour.red())
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        # Fetching and parsing the symbol's page can take longer than the interaction deadline.
+        await interaction.response.defer()
+        doc_embed = await self.create_symbol_embed(symbol)
+        if doc_embed is None:
+            # The symbol was removed by a refresh in the meantime.
+            doc_embed = discord.Embed(description=self.not_found_message(symbol), colour=discord.Colour.red())
+        await interaction.followup.send(embed=doc_embed)
+        await wait_for_deletion(await interaction.original_response(), (interaction.user.id,))
+
+    @docs_slash_command.autocomplete("symbol_name")
+    async def symbol_name_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str
+    ) -> list[app_commands.Choice[str]]:
+        """Autocompleter for the `/docs` command."""
+        return [
+            app_commands.Choice(name=name, value=name)
+            for name in self.symbol_index.search(current, MAX_AUTOCOMPLETE_CHOICES)
+            if len(name) <= MAX_CHOICE_LENGTH
+        ]
+
+    def not_found_message(self, symbol_name: str) -> str:
+        """Return the message for a symbol which wasn't found, with suggestions of similar symbols if there are any."""
+        message = "No documentation found for the requested symbol."
+        if suggestions := self.symbol_index.suggest(symbol_name, SUGGESTION_COUNT):
+            message += "\nDid you mean: " + ", ".join(f"`{suggestion}`" for suggestion in suggestions) + "?"
+        return message
+
     @staticmethod
     def base_url_from_inventory_url(inventory_url: str) -> str:
         """Get a base url from the url to an objects inventory by removing the last path segment."""
@@ -429,7 +664,7 @@ class DocCog(commands.Cog):
         """Refresh inventories and show the difference."""
         old_inventories = set(self.base_urls)
         async with ctx.typing():
-            await self.refresh_inventories()
+            report = await self.refresh_inventories()
         new_inventories = set(self.base_urls)
 
         if added := ", ".join(new_inventories - old_inventories):
@@ -442,6 +677,15 @@ class DocCog(commands.Cog):
             title="Inventories refreshed",
             description=f"```diff\n{added}\n{removed}```" if added or removed else ""
         )
+        embed.add_field(
+            name="Packages",
+            value=(
+                f"{len(report.updated)} updated, {len(report.unchanged)} unchanged, {len(report.failed)} failed "
+                f"in {report.duration:.1f}s"
+            ),
+        )
+        if report.failed:
+            embed.add_field(name="Failed", value=textwrap.shorten(", ".join(report.failed), 1024), inline=False)
         await ctx.send(embed=embed)
 
     @docs_group.command(name="cleardoccache", aliases=("deletedoccache",))
@@ -461,4 +705,6 @@ class DocCog(commands.Cog):
     async def cog_unload(self) -> None:
         """Clear scheduled inventories, queued symbols and cleanup task on cog unload."""
         self.inventory_scheduler.cancel_all()
+        if self._prefetch_task is not None:
+            self._prefetch_task.cancel()
         await self.item_fetcher.clear()
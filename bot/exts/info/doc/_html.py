@@ -85,12 +85,16 @@ _find_previous_siblings_until_tag = partial(_find_elements_until_tag, func=Beaut
 
 
 def _class_filter_factory(class_names: Iterable[str]) -> Callable[[Tag], bool]:
-    """Create callable that returns True when the passed in tag's class is in `class_names` or when it's a table."""
+    """
+    Create callable that returns True when the passed in tag's class is in `class_names` or when it's a table.
+
+    Section tags also match, as Sphinx 4 and later uses them in place of divs with the section class.
+    """
     def match_tag(tag: Tag) -> bool:
         for attr in class_names:
             if attr in tag.get("class", ()):
                 return True
-        return tag.name == "table"
+        return tag.name in ("table", "section")
 
     return match_tag
 
@@ -108,6 +112,19 @@ def get_general_description(start_element: Tag) -> list[Tag | NavigableString]:
     return _find_next_siblings_until_tag(start_tag, _class_filter_factory(_SEARCH_END_TAG_ATTRS), include_strings=True)
 
 
+def get_symbol_headings(soup: BeautifulSoup) -> dict[str, Tag]:
+    """
+    Return the tags with an id attribute on the page by their ids, found in a single pass over the page.
+
+    When multiple tags have the same id, the first one is used like in `BeautifulSoup.find`.
+    """
+    symbol_headings = {}
+    for element in soup.descendants:
+        if isinstance(element, Tag) and (tag_id := element.attrs.get("id")) is not None:
+            symbol_headings.setdefault(tag_id, element)
+    return symbol_headings
+
+
 def get_dd_description(symbol: PageElement) -> list[Tag | NavigableString]:
     """Get the contents of the next dd tag, up to a dt or a dl tag."""
     description_tag = symbol.find_next("dd")
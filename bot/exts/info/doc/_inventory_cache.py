@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import defaultdict
+from pathlib import Path
+from typing import NamedTuple, TYPE_CHECKING
+
+import bot
+from bot.log import get_logger
+
+if TYPE_CHECKING:
+    from ._inventory_parser import InventoryDict
+
+log = get_logger(__name__)
+
+
+class CachedInventory(NamedTuple):
+    """A parsed inventory, along with the validators it was served with."""
+
+    inventory: InventoryDict
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class InventoryCache:
+    """
+    A disk cache of parsed inventories, keyed by their URL.
+
+    The validators stored with each inventory allow revalidating it with a conditional request,
+    instead of downloading and parsing an unchanged inventory again.
+    Failing to write is only warned about once until a write succeeds, as it's usually the directory that's unwritable.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._write_failed = False
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    async def get(self, url: str) -> CachedInventory | None:
+        """Return the cached inventory of `url`, or None if it's not cached."""
+        return await bot.instance.loop.run_in_executor(None, self._read, url)
+
+    async def set(self, url: str, cached: CachedInventory) -> None:
+        """Store the inventory of `url` on disk."""
+        await bot.instance.loop.run_in_executor(None, self._write, url, cached)
+
+    def _read(self, url: str) -> CachedInventory | None:
+        try:
+            with self._path(url).open(encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            log.warning(f"Failed to read the cached inventory of {url}.", exc_info=True)
+            return None
+
+        if data.get("url") != url:
+            return None
+        inventory = defaultdict(list)
+        for group, items in data["inventory"].items():
+            inventory[group] = [tuple(item) for item in items]
+        return CachedInventory(inventory, data.get("etag"), data.get("last_modified"))
+
+    def _write(self, url: str, cached: CachedInventory) -> None:
+        path = self._path(url)
+        temp_path = path.with_suffix(".tmp")
+        data = {
+            "url": url,
+            "etag": cached.etag,
+            "last_modified": cached.last_modified,
+            "inventory": cached.inventory,
+        }
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with temp_path.open("w", encoding="utf-8") as file:
+                json.dump(data, file, separators=(",", ":"))
+            # Replace the file in one step so a concurrent read never sees a partial inventory.
+            temp_path.replace(path)
+        except OSError:
+            if self._write_failed:
+                log.debug(f"Failed to write the cached inventory of {url}.")
+            else:
+                log.warning(
+                    f"Failed to write the cached inventory of {url} to {self.directory}, "
+                    "further failures are only logged at the debug level.",
+                    exc_info=True,
+                )
+            self._write_failed = True
+        else:
+            self._write_failed = False
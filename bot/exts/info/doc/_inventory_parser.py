@@ -1,29 +1,43 @@
+import asyncio
+import random
 import re
 import zlib
 from collections import defaultdict
 from collections.abc import AsyncIterator
+from urllib.parse import urlsplit
 
 import aiohttp
 
 import bot
 from bot.log import get_logger
 
+from ._inventory_cache import CachedInventory, InventoryCache
+
 log = get_logger(__name__)
 
 FAILED_REQUEST_ATTEMPTS = 3
-_V2_LINE_RE = re.compile(r"(?x)(.+?)\s+(\S*:\S*)\s+(-?\d+)\s+?(\S*)\s+(.*)")
+# Base of the exponentially growing delay between attempts to fetch an inventory, in seconds
+RETRY_BASE_DELAY = 2
+# Max number of inventories fetched from the same host at once, so a refresh doesn't trigger rate limits
+MAX_HOST_CONCURRENCY = 2
+# Matches each line of a block of decompressed lines. `[^\S\n]` is whitespace which doesn't cross to the next line.
+_V2_LINE_RE = re.compile(rb"(?m)^(.+?)[^\S\n]+(\S*:\S*)[^\S\n]+-?\d+[^\S\n]+?(\S*)[^\S\n]+.*$")
 
 InventoryDict = defaultdict[str, list[tuple[str, str]]]
 
+_host_semaphores: defaultdict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(MAX_HOST_CONCURRENCY))
+
 
 class InvalidHeaderError(Exception):
     """Raised when an inventory file has an invalid header."""
 
 
 class ZlibStreamReader:
-    """Class used for decoding zlib data of a stream line by line."""
+    """Class used for decoding zlib data of a stream in blocks of whole lines."""
 
     READ_CHUNK_SIZE = 16 * 1024
+    # Inventories compress well, so the decompressed size of a chunk is capped to keep memory use flat.
+    MAX_DECOMPRESSED_CHUNK_SIZE = 64 * 1024
 
     def __init__(self, stream: aiohttp.StreamReader) -> None:
         self.stream = stream
@@ -32,20 +46,30 @@ class ZlibStreamReader:
         """Read zlib data in `READ_CHUNK_SIZE` sized chunks and decompress."""
         decompressor = zlib.decompressobj()
         async for chunk in self.stream.iter_chunked(self.READ_CHUNK_SIZE):
-            yield decompressor.decompress(chunk)
+            yield decompressor.decompress(chunk, self.MAX_DECOMPRESSED_CHUNK_SIZE)
+            while decompressor.unconsumed_tail:
+                yield decompressor.decompress(decompressor.unconsumed_tail, self.MAX_DECOMPRESSED_CHUNK_SIZE)
 
         yield decompressor.flush()
 
-    async def __aiter__(self) -> AsyncIterator[str]:
-        """Yield lines of decompressed text."""
-        buf = b""
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """
+        Yield blocks of decompressed data, each made of whole lines.
+
+        Only the partial line at the end of each chunk is carried over to the next block,
+        so every byte is copied a constant number of times regardless of the size of the inventory.
+        """
+        remainder = b""
         async for chunk in self._read_compressed_chunks():
-            buf += chunk
-            pos = buf.find(b"\n")
-            while pos != -1:
-                yield buf[:pos].decode()
-                buf = buf[pos + 1:]
-                pos = buf.find(b"\n")
+            end = chunk.rfind(b"\n")
+            if end == -1:
+                remainder += chunk
+                continue
+            yield remainder + memoryview(chunk)[:end]
+            remainder = chunk[end + 1:]
+
+        if remainder:
+            yield remainder
 
 
 async def _load_v1(stream: aiohttp.StreamReader) -> InventoryDict:
@@ -66,55 +90,96 @@ async def _load_v1(stream: aiohttp.StreamReader) -> InventoryDict:
 
 async def _load_v2(stream: aiohttp.StreamReader) -> InventoryDict:
     invdata = defaultdict(list)
+    # Decode each distinct type once, instead of once per symbol.
+    types = {}
+
+    async for block in ZlibStreamReader(stream):
+        for match in _V2_LINE_RE.finditer(block):
+            raw_name, raw_type, raw_location = match.groups()  # The priority and display name aren't captured.
+            if (type_ := types.get(raw_type)) is None:
+                type_ = types[raw_type] = raw_type.decode()
+            name = raw_name.decode()
+            location = raw_location.decode()
+            if location.endswith("$"):
+                location = location[:-1] + name
+
+            invdata[type_].append((name, location))
+    return invdata
 
-    async for line in ZlibStreamReader(stream):
-        m = _V2_LINE_RE.match(line.rstrip())
-        name, type_, _prio, location, _dispname = m.groups()  # ignore the parsed items we don't need
-        if location.endswith("$"):
-            location = location[:-1] + name
 
-        invdata[type_].append((name, location))
-    return invdata
+async def _fetch_inventory(url: str, cached: CachedInventory | None = None) -> CachedInventory:
+    """
+    Fetch, parse and return an intersphinx inventory file from an url.
 
+    If `cached` is given, the request is conditional on the inventory having changed since,
+    and `cached` itself is returned if it didn't.
+    """
+    headers = {}
+    if cached and cached.etag:
+        headers["If-None-Match"] = cached.etag
+    if cached and cached.last_modified:
+        headers["If-Modified-Since"] = cached.last_modified
 
-async def _fetch_inventory(url: str) -> InventoryDict:
-    """Fetch, parse and return an intersphinx inventory file from an url."""
     timeout = aiohttp.ClientTimeout(sock_connect=5, sock_read=5)
-    async with bot.instance.http_session.get(url, timeout=timeout, raise_for_status=True) as response:
-        stream = response.content
+    async with bot.instance.http_session.get(url, headers=headers, timeout=timeout, raise_for_status=True) as response:
+        if cached and response.status == 304:
+            log.trace(f"Inventory at {url} is unchanged, using the cached inventory.")
+            return cached
 
-        inventory_header = (await stream.readline()).decode().rstrip()
-        try:
-            inventory_version = int(inventory_header[-1:])
-        except ValueError:
-            raise InvalidHeaderError("Unable to convert inventory version header.")
+        inventory = await _parse_inventory(response.content)
+        return CachedInventory(inventory, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+
+async def _parse_inventory(stream: aiohttp.StreamReader) -> InventoryDict:
+    """Parse an intersphinx inventory file from its stream."""
+    inventory_header = (await stream.readline()).decode().rstrip()
+    try:
+        inventory_version = int(inventory_header[-1:])
+    except ValueError:
+        raise InvalidHeaderError("Unable to convert inventory version header.")
 
-        has_project_header = (await stream.readline()).startswith(b"# Project")
-        has_version_header = (await stream.readline()).startswith(b"# Version")
-        if not (has_project_header and has_version_header):
-            raise InvalidHeaderError("Inventory missing project or version header.")
+    has_project_header = (await stream.readline()).startswith(b"# Project")
+    has_version_header = (await stream.readline()).startswith(b"# Version")
+    if not (has_project_header and has_version_header):
+        raise InvalidHeaderError("Inventory missing project or version header.")
 
-        if inventory_version == 1:
-            return await _load_v1(stream)
+    if inventory_version == 1:
+        return await _load_v1(stream)
 
-        if inventory_version == 2:
-            if b"zlib" not in await stream.readline():
-                raise InvalidHeaderError("'zlib' not found in header of compressed inventory.")
-            return await _load_v2(stream)
+    if inventory_version == 2:
+        if b"zlib" not in await stream.readline():
+            raise InvalidHeaderError("'zlib' not found in header of compressed inventory.")
+        return await _load_v2(stream)
 
-        raise InvalidHeaderError("Incompatible inventory version.")
+    raise InvalidHeaderError("Incompatible inventory version.")
 
 
-async def fetch_inventory(url: str) -> InventoryDict | None:
+def _retry_delay(retry: int) -> float:
+    """Return the delay before the `retry`th retry, half of which is random to spread out retries of packages."""
+    delay = RETRY_BASE_DELAY * 2 ** (retry - 1)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+async def fetch_inventory(url: str, cache: InventoryCache | None = None) -> InventoryDict | None:
     """
     Get an inventory dict from `url`, retrying `FAILED_REQUEST_ATTEMPTS` times on errors.
 
     `url` should point at a valid sphinx objects.inv inventory file, which will be parsed into the
     inventory dict in the format of {"domain:role": [("symbol_name", "relative_url_to_symbol"), ...], ...}
+
+    If a `cache` is given, the inventory is only downloaded and parsed if it changed since it was cached.
+
+    At most `MAX_HOST_CONCURRENCY` inventories are fetched from the same host at once, and the retries are spaced
+    out by a jittered exponential backoff, so the requests of packages sharing a host don't all fail together.
     """
+    cached = await cache.get(url) if cache else None
+    host_semaphore = _host_semaphores[urlsplit(url).netloc]
     for attempt in range(1, FAILED_REQUEST_ATTEMPTS+1):
+        if attempt > 1:
+            await asyncio.sleep(_retry_delay(attempt - 1))
         try:
-            inventory = await _fetch_inventory(url)
+            async with host_semaphore:
+                fetched = await _fetch_inventory(url, cached)
         except aiohttp.ClientConnectorError:
             log.warning(
                 f"Failed to connect to inventory url at {url}; "
@@ -133,6 +198,8 @@ async def fetch_inventory(url: str) -> InventoryDict | None:
                 f"trying again ({attempt}/{FAILED_REQUEST_ATTEMPTS})."
             )
         else:
-            return inventory
+            if cache and fetched is not cached:
+                await cache.set(url, fetched)
+            return fetched.inventory
 
     return None
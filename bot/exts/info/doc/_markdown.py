@@ -1,8 +1,11 @@
 import re
+from collections.abc import Callable
+from functools import cache
 from urllib.parse import urljoin
 
 import markdownify
-from bs4.element import PageElement
+from bs4 import BeautifulSoup
+from bs4.element import Comment, Doctype, NavigableString, PageElement, Tag
 
 # See https://github.com/matthewwithanm/python-markdownify/issues/31
 markdownify.whitespace_re = re.compile(r"[\r\n\s\t ]+")
@@ -66,3 +69,225 @@ class DocMarkdownConverter(markdownify.MarkdownConverter):
     def convert_hr(self, el: PageElement, text: str, convert_as_inline: bool) -> str:
         """Ignore `hr` tag."""
         return ""
+
+
+# Tags whose children markdownify converts as inline, like headings and table cells.
+_INLINE_CHILDREN_RE = re.compile(r"h[1-6]|t[dh]$")
+# Tags markdownify converts as headings.
+_HEADING_RE = re.compile(r"h(\d+)")
+# Tags between whose children markdownify removes whitespace-only strings.
+_NESTED_TAGS = frozenset(("ol", "ul", "li", "table", "thead", "tbody", "tfoot", "tr", "td", "th"))
+
+
+def _is_nested_node(element: PageElement | None) -> bool:
+    return bool(element) and element.name in _NESTED_TAGS
+
+
+def _inline_conversion(markup: str) -> Callable[["SphinxMarkdownConverter", Tag, str, bool], str]:
+    """Create a conversion wrapping the text of simple inline tags like `em` in `markup`, as markdownify does."""
+    def convert(self: "SphinxMarkdownConverter", el: Tag, text: str, convert_as_inline: bool) -> str:
+        prefix, suffix, text = markdownify.chomp(text)
+        if not text:
+            return ""
+        return f"{prefix}{markup}{text}{markup}{suffix}"
+
+    return convert
+
+
+class SphinxMarkdownConverter:
+    """
+    Convert HTML from Sphinx pages to Markdown, with the same output as `DocMarkdownConverter`.
+
+    markdownify looks up a `convert_*` method through `getattr` for every tag and appends to the Markdown string
+    piece by piece. Here the conversion of each tag name is resolved once, the Markdown of a tag's children
+    is joined once, and the children of `pre` tags aren't converted at all, as only their text is used.
+    """
+
+    def __init__(self, *, page_url: str, bullets: str = markdownify.MarkdownConverter.DefaultOptions.bullets):
+        self.page_url = page_url
+        self.bullets = bullets
+        self._urls = {}
+        self._list_items = {}
+
+    def convert(self, html: str) -> str:
+        """Convert `html` to Markdown."""
+        return self._process_children(BeautifulSoup(html, "html.parser"), convert_as_inline=False)
+
+    def process_tag(self, node: Tag, convert_as_inline: bool) -> str:
+        """Convert `node` and its children to Markdown."""
+        children_inline, convert = _get_tag_conversion(node.name)
+        if convert is SphinxMarkdownConverter._convert_pre:
+            return convert(self, node, "", convert_as_inline)
+        text = self._process_children(node, convert_as_inline or children_inline)
+        if convert is None:
+            return text
+        return convert(self, node, text, convert_as_inline)
+
+    def _process_children(self, node: Tag, convert_as_inline: bool) -> str:
+        if node.name in _NESTED_TAGS:
+            # Iterating the children while extracting from them skips the next child, like markdownify does.
+            for el in node.children:
+                can_extract = (
+                    not el.previous_sibling
+                    or not el.next_sibling
+                    or _is_nested_node(el.previous_sibling)
+                    or _is_nested_node(el.next_sibling)
+                )
+                if isinstance(el, NavigableString) and not str(el).strip() and can_extract:
+                    el.extract()
+
+        parts = []
+        for el in node.children:
+            if isinstance(el, Tag):
+                parts.append(self.process_tag(el, convert_as_inline))
+            elif not isinstance(el, Comment | Doctype):
+                parts.append(self.process_text(el))
+        return "".join(parts)
+
+    def process_text(self, el: NavigableString) -> str:
+        """Convert the text of `el` to Markdown, collapsing its whitespace and escaping it where needed."""
+        text = str(el)
+        parent_name = el.parent.name
+        if not (parent_name == "pre" or (parent_name == "code" and el.parent.parent.name == "pre")):
+            text = markdownify.whitespace_re.sub(" ", text)
+        if parent_name != "code" and parent_name != "pre":
+            text = text.replace("*", r"\*").replace("_", r"\_")
+        if parent_name == "li":
+            next_sibling = el.next_sibling
+            if not next_sibling or next_sibling.name in ("ul", "ol"):
+                text = text.rstrip()
+        return text
+
+    def _convert_a(self, el: Tag, text: str, convert_as_inline: bool) -> str:
+        """Resolve relative URLs to `self.page_url`."""
+        href = el["href"]
+        if (url := self._urls.get(href)) is None:
+            url = self._urls[href] = urljoin(self.page_url, href)
+        el["href"] = url
+        # Discord doesn't handle titles properly, showing links with them as raw text.
+        el["title"] = None
+
+        prefix, suffix, text = markdownify.chomp(text)
+        if not text:
+            return ""
+        if text.replace(r"\_", "_") == url:
+            return f"<{url}>"
+        return f"{prefix}[{text}]({url}){suffix}" if url else text
+
+    _convert_b = _convert_strong = _inline_conversion("**")
+    _convert_em = _convert_i = _inline_conversion("*")
+    _convert_del = _convert_s = _inline_conversion("~~")
+    _convert_sub = _convert_sup = _inline_conversion("")
+
+    def _convert_blockquote(self, el: Tag, text: str, convert_as_inline: bool) -> str:
+        if convert_as_inline:
+            return text
+        return "\n" + (markdownify.line_beginning_re.sub("> ", text) + "\n\n") if text else ""
+
+    def _convert_br(self, el: Tag, text: str, convert_as_inline: bool) -> str:
+        return "" if convert_as_inline else "  \n"
+
+    def _convert_code(self, el: Tag, text: str, convert_as_inline: bool) -> str:
+        """Undo `markdownify`s underscore escaping."""
+        return f"`{text}`".replace("\\", "")
+
+    def _convert_kbd(self, el: Tag, text: str, convert_as_inline: bool) -> str:
+        if el.parent.name == "pre":
+            return text
+        return self._convert_inline_code(el, text, convert_as_inline)
+
+    _convert_samp = _convert_kbd
+    _convert_inline_code = _inline_conversion("`")
+
+    def _convert_hn(self, n: int, el: Tag, text: str, convert_as_inline: bool) -> str:
+        """Convert h tags to bold text with ** instead of adding #."""
+        if convert_as_inline:
+            return text
+        return f"**{text}**\n\n"
+
+    def _convert_hr(self, el: Tag, text: str, convert_as_inline: bool) -> str:
+        """Ignore `hr` tag."""
+        return ""
+
+    def _convert_img(self, el: Tag, text: str, convert_as_inline: bool) -> str:
+        alt = el.attrs.get("alt", None) or ""
+        if convert_as_inline:
+            return alt
+        src = el.attrs.get("src", None) or ""
+        title = el.attrs.get("title", None) or ""
+        title_part = ' "{}"'.format(title.replace('"', r"\"")) if title else ""
+        return f"![{alt}]({src}{title_part})"
+
+    def _convert_list(self, el: Tag, text: str, convert_as_inline: bool) -> str:
+        before_paragraph = bool(el.next_sibling) and el.next_sibling.name not in ("ul", "ol")
+        while el:
+            if el.name == "li":
+                return "\n" + (markdownify.line_beginning_re.sub("\t", text) if text else "").rstrip()
+            el = el.parent
+        return text + ("\n" if before_paragraph else "")
+
+    _convert_ul = _convert_ol = _convert_list
+
+    def _convert_li(self, el: Tag, text: str, convert_as_inline: bool) -> str:
+        """Fix markdownify's erroneous indexing in ol tags."""
+        parent = el.parent
+        if parent is not None and parent.name == "ol":
+            if (list_items := self._list_items.get(id(parent))) is None:
+                list_items = self._list_items[id(parent)] = (parent, parent.find_all("li"))
+            bullet = f"{list_items[1].index(el) + 1}."
+        else:
+            depth = -1
+            while el:
+                if el.name == "ul":
+                    depth += 1
+                el = el.parent
+            bullet = self.bullets[depth % len(self.bullets)]
+        return f"{bullet} {text}\n"
+
+    def _convert_p(self, el: Tag, text: str, convert_as_inline: bool) -> str:
+        """Include only one newline instead of two when the parent is a li tag."""
+        if convert_as_inline:
+            return text
+        parent = el.parent
+        if parent is not None and parent.name == "li":
+            return f"{text}\n"
+        return f"{text}\n\n" if text else ""
+
+    def _convert_pre(self, el: Tag, text: str, convert_as_inline: bool) -> str:
+        """Wrap any codeblocks in `py` for syntax highlighting."""
+        code = "".join(el.strings)
+        return f"```py\n{code}```"
+
+    def _convert_table(self, el: Tag, text: str, convert_as_inline: bool) -> str:
+        return "\n\n" + text + "\n"
+
+    def _convert_td(self, el: Tag, text: str, convert_as_inline: bool) -> str:
+        return " " + text + " |"
+
+    _convert_th = _convert_td
+
+    def _convert_tr(self, el: Tag, text: str, convert_as_inline: bool) -> str:
+        cells = el.find_all(["td", "th"])
+        overline = underline = ""
+        if all(cell.name == "th" for cell in cells) and not el.previous_sibling:
+            underline = "| " + " | ".join(["---"] * len(cells)) + " |\n"
+        elif not el.previous_sibling and (
+            el.parent.name == "table" or (el.parent.name == "tbody" and not el.parent.previous_sibling)
+        ):
+            overline = "| " + " | ".join([""] * len(cells)) + " |\n"
+            overline += "| " + " | ".join(["---"] * len(cells)) + " |\n"
+        return overline + "|" + text + "\n" + underline
+
+
+@cache
+def _get_tag_conversion(tag_name: str) -> tuple[bool, Callable[[SphinxMarkdownConverter, Tag, str, bool], str] | None]:
+    """Return whether the children of tags named `tag_name` are converted as inline, and the tags' conversion."""
+    children_inline = _INLINE_CHILDREN_RE.match(tag_name) is not None
+    if (heading_match := _HEADING_RE.match(tag_name)) is not None:
+        level = int(heading_match[1])
+
+        def convert_heading(self: SphinxMarkdownConverter, el: Tag, text: str, convert_as_inline: bool) -> str:
+            return self._convert_hn(level, el, text, convert_as_inline)
+
+        return children_inline, convert_heading
+    return children_inline, getattr(SphinxMarkdownConverter, f"_convert_{tag_name}", None)
@@ -3,19 +3,20 @@ from __future__ import annotations
 import re
 import string
 import textwrap
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 from collections.abc import Collection, Iterable, Iterator
 from typing import TYPE_CHECKING
 
 from bs4 import BeautifulSoup
 from bs4.element import NavigableString, Tag
 
+from bot.constants import Doc
 from bot.log import get_logger
 from bot.utils.helpers import find_nth_occurrence
 
 from . import MAX_SIGNATURE_AMOUNT
-from ._html import get_dd_description, get_general_description, get_signatures
-from ._markdown import DocMarkdownConverter
+from ._html import get_dd_description, get_general_description, get_signatures, get_symbol_headings
+from ._markdown import DocMarkdownConverter, SphinxMarkdownConverter
 
 if TYPE_CHECKING:
     from ._cog import DocItem
@@ -39,6 +40,9 @@ _MAX_SIGNATURES_LENGTH = (_EMBED_CODE_BLOCK_LINE_LENGTH + 8) * MAX_SIGNATURE_AMO
 # Maximum embed description length - signatures on top
 _MAX_DESCRIPTION_LENGTH = 4096 - _MAX_SIGNATURES_LENGTH
 _TRUNCATE_STRIP_CHARACTERS = "!?:;." + string.whitespace
+_MARKDOWN_CONVERTER = SphinxMarkdownConverter if Doc.sphinx_markdown_converter else DocMarkdownConverter
+# How many parsed pages each parsing process keeps around, for the next batches of symbols from the same page.
+PARSED_PAGE_CACHE_SIZE = 2
 
 BracketPair = namedtuple("BracketPair", ["opening_bracket", "closing_bracket"])
 _BRACKET_PAIRS = {
@@ -138,7 +142,7 @@ def _truncate_signatures(signatures: Collection[str]) -> list[str] | Collection[
 
 def _get_truncated_description(
     elements: Iterable[Tag | NavigableString],
-    markdown_converter: DocMarkdownConverter,
+    markdown_converter: DocMarkdownConverter | SphinxMarkdownConverter,
     max_length: int,
     max_lines: int,
 ) -> str:
@@ -223,7 +227,7 @@ def _create_markdown(signatures: list[str] | None, description: Iterable[Tag], u
     """
     description = _get_truncated_description(
         description,
-        markdown_converter=DocMarkdownConverter(bullets="•", page_url=url),
+        markdown_converter=_MARKDOWN_CONVERTER(bullets="•", page_url=url),
         max_length=750,
         max_lines=13
     )
@@ -234,15 +238,14 @@ def _create_markdown(signatures: list[str] | None, description: Iterable[Tag], u
     return description
 
 
-def get_symbol_markdown(soup: BeautifulSoup, symbol_data: DocItem) -> str | None:
+def _get_symbol_fragment(
+    symbol_heading: Tag, symbol_data: DocItem
+) -> tuple[list[str] | None, list[Tag | NavigableString]]:
     """
-    Return parsed Markdown of the passed item using the passed in soup, truncated to fit within a discord message.
+    Return the signatures and the description elements of the symbol under `symbol_heading`.
 
     The method of parsing and what information gets included depends on the symbol's group.
     """
-    symbol_heading = soup.find(id=symbol_data.symbol_id)
-    if symbol_heading is None:
-        return None
     signature = None
     # Modules, doc pages and labels don't point to description list tags but to tags like divs,
     # no special parsing can be done so we only try to include what's under them.
@@ -261,4 +264,40 @@ def get_symbol_markdown(soup: BeautifulSoup, symbol_data: DocItem) -> str | None
             for tag in description_element.find_all("a", class_="headerlink"):
                 tag.decompose()
 
-    return _create_markdown(signature, description, symbol_data.url).strip()
+    return signature, description
+
+
+# The symbol headings of the pages parsed last in this process by their urls, least recently used first.
+_parsed_pages: OrderedDict[str, dict[str, Tag]] = OrderedDict()
+
+
+def get_page_markdown(url: str, html: str | None, symbols: Iterable[DocItem]) -> dict[DocItem, str | None] | None:
+    """
+    Return the parsed Markdown of `symbols` from the page at `url`, which has the given `html`.
+
+    Meant to be run in a separate process; the last `PARSED_PAGE_CACHE_SIZE` parsed pages are kept by their urls,
+    so the HTML of a page only has to be sent to the process once. If `html` is None and the page isn't kept,
+    None is returned and the HTML has to be given.
+    The symbol headings are found in a single pass over the page, instead of searching the page for every symbol.
+    Symbols that failed to parse are left out of the result.
+    """
+    if html is not None:
+        _parsed_pages[url] = get_symbol_headings(BeautifulSoup(html, "lxml"))
+        while len(_parsed_pages) > PARSED_PAGE_CACHE_SIZE:
+            _parsed_pages.popitem(last=False)
+    elif url not in _parsed_pages:
+        return None
+    _parsed_pages.move_to_end(url)
+    symbol_headings = _parsed_pages[url]
+    results = {}
+    for symbol_data in symbols:
+        try:
+            symbol_heading = symbol_headings.get(symbol_data.symbol_id)
+            if symbol_heading is None or symbol_heading.decomposed:
+                results[symbol_data] = None
+                continue
+            signature, description = _get_symbol_fragment(symbol_heading, symbol_data)
+            results[symbol_data] = _create_markdown(signature, description, symbol_data.url).strip()
+        except Exception:
+            log.exception(f"Unexpected error when parsing {symbol_data}")
+    return results
@@ -3,10 +3,13 @@ from __future__ import annotations
 import datetime
 import fnmatch
 import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterable, Mapping
 from typing import TYPE_CHECKING
 
 from async_rediscache.types.base import RedisObject
 
+import bot
 from bot.log import get_logger
 from bot.utils.lock import lock
 
@@ -14,65 +17,134 @@ if TYPE_CHECKING:
     from ._cog import DocItem
 
 WEEK_SECONDS = int(datetime.timedelta(weeks=1).total_seconds())
+# How many symbols have their Markdown kept in memory, in front of redis.
+LOCAL_CACHE_SIZE = 1024
+# What the symbol request counts are multiplied by whenever they're trimmed, so old requests count less over time.
+POPULARITY_DECAY = 0.5
 
 log = get_logger(__name__)
 
 
-def serialize_resource_id_from_doc_item(bound_args: dict) -> str:
-    """Return the redis_key of the DocItem `item` from the bound args of DocRedisCache.set."""
-    item: DocItem = bound_args["item"]
-    return f"doc:{item_key(item)}"
+def serialize_resource_id_from_page_key(bound_args: dict) -> str:
+    """Return the redis_key of the page from the bound args of DocRedisCache._set_page."""
+    return f"doc:{bound_args['page_key']}"
 
 
 class DocRedisCache(RedisObject):
-    """Interface for redis functionality needed by the Doc cog."""
+    """
+    Interface for redis functionality needed by the Doc cog.
+
+    The Markdown of the `LOCAL_CACHE_SIZE` most recently requested symbols is also kept in memory,
+    so lookups of popular symbols don't have to go through redis.
+    """
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._set_expires = dict[str, float]()
+        self._local = OrderedDict[tuple[str, str], str]()
+        self.local_hits = 0
+        self.local_misses = 0
+
+    @property
+    def local_hit_rate(self) -> float:
+        """Return the fraction of lookups that were served from memory."""
+        lookups = self.local_hits + self.local_misses
+        return self.local_hits / lookups if lookups else 0
 
-    @lock("DocRedisCache.set", serialize_resource_id_from_doc_item, wait=True)
     async def set(self, item: DocItem, value: str) -> None:
+        """Set the Markdown `value` for the symbol `item`."""
+        await self.set_many({item: value})
+
+    async def set_many(self, markdowns: Mapping[DocItem, str]) -> None:
         """
-        Set the Markdown `value` for the symbol `item`.
+        Set the Markdown values of the symbols in `markdowns`.
 
         All keys from a single page are stored together, expiring a week after the first set.
+        The symbols of each page are written with a single pipelined HSET.
         """
-        redis_key = f"{self.namespace}:{item_key(item)}"
-        needs_expire = False
+        pages = defaultdict(dict)
+        for item, value in markdowns.items():
+            pages[item_key(item)][item.symbol_id] = value
+            # Only refresh symbols that are already held, a page shouldn't push out the popular symbols.
+            if (local_key := (item_key(item), item.symbol_id)) in self._local:
+                self._local[local_key] = value
+        for page_key, values in pages.items():
+            await self._set_page(page_key, values)
+
+    @lock("DocRedisCache.set", serialize_resource_id_from_page_key, wait=True)
+    async def _set_page(self, page_key: str, values: dict[str, str]) -> None:
+        """
+        Set the Markdown `values` of symbols from the page under `page_key`, mapped by their symbol ids.
 
+        The expiry is only checked when it isn't known yet, in the same round trip as the write.
+        """
+        redis_key = f"{self.namespace}:{page_key}"
         set_expire = self._set_expires.get(redis_key)
+        # If the key expired in the internal key cache, we can be sure it doesn't exist in redis.
+        needs_expire = set_expire is not None and time.monotonic() > set_expire
+        if needs_expire:
+            log.debug(f"Key `{redis_key}` expired in internal key cache.")
+
+        pipeline = self.redis_session.client.pipeline()
+        if set_expire is None:
+            pipeline.ttl(redis_key)
+        pipeline.hset(redis_key, mapping=values)
+        if needs_expire:
+            pipeline.expire(redis_key, WEEK_SECONDS)
+        results = await pipeline.execute()
+
         if set_expire is None:
             # An expire is only set if the key didn't exist before.
-            ttl = await self.redis_session.client.ttl(redis_key)
+            ttl = results[0]
             log.debug(f"Checked TTL for `{redis_key}`.")
-
             if ttl == -1:
                 log.warning(f"Key `{redis_key}` had no expire set.")
             if ttl < 0:  # not set or didn't exist
                 needs_expire = True
+                await self.redis_session.client.expire(redis_key, WEEK_SECONDS)
             else:
                 log.debug(f"Key `{redis_key}` has a {ttl} TTL.")
                 self._set_expires[redis_key] = time.monotonic() + ttl - .1  # we need this to expire before redis
 
-        elif time.monotonic() > set_expire:
-            # If we got here the key expired in redis and we can be sure it doesn't exist.
-            needs_expire = True
-            log.debug(f"Key `{redis_key}` expired in internal key cache.")
-
-        await self.redis_session.client.hset(redis_key, item.symbol_id, value)
         if needs_expire:
             self._set_expires[redis_key] = time.monotonic() + WEEK_SECONDS
-            await self.redis_session.client.expire(redis_key, WEEK_SECONDS)
             log.info(f"Set {redis_key} to expire in a week.")
 
     async def get(self, item: DocItem) -> str | None:
         """Return the Markdown content of the symbol `item` if it exists."""
-        return await self.redis_session.client.hget(f"{self.namespace}:{item_key(item)}", item.symbol_id)
+        local_key = (item_key(item), item.symbol_id)
+        if (markdown := self._local.get(local_key)) is not None:
+            self._local.move_to_end(local_key)
+            self.local_hits += 1
+            bot.instance.stats.incr("doc.local_cache.hit")
+            return markdown
+
+        self.local_misses += 1
+        bot.instance.stats.incr("doc.local_cache.miss")
+        markdown = await self.redis_session.client.hget(f"{self.namespace}:{local_key[0]}", item.symbol_id)
+        if markdown is not None:
+            self._local[local_key] = markdown
+            if len(self._local) > LOCAL_CACHE_SIZE:
+                self._local.popitem(last=False)
+        return markdown
+
+    async def contains(self, item: DocItem) -> bool:
+        """Return whether the Markdown of the symbol `item` is stored in redis."""
+        return bool(await self.redis_session.client.hexists(f"{self.namespace}:{item_key(item)}", item.symbol_id))
+
+    def invalidate_local(self, packages: Iterable[str]) -> None:
+        """Remove the symbols of `packages` from memory, so they're looked up in redis again."""
+        packages = set(packages)
+        for local_key in [local_key for local_key in self._local if local_key[0].partition(":")[0] in packages]:
+            del self._local[local_key]
 
     async def delete(self, package: str) -> bool:
         """Remove all values for `package`; return True if at least one key was deleted, False otherwise."""
         pattern = f"{self.namespace}:{package}:*"
+        self._local = OrderedDict(
+            (local_key, markdown) for local_key, markdown in self._local.items()
+            if not fnmatch.fnmatchcase(f"{self.namespace}:{local_key[0]}", pattern)
+        )
 
         package_keys = [
             package_key async for package_key in self.redis_session.client.scan_iter(match=pattern)
@@ -112,6 +184,29 @@ class StaleItemCounter(RedisObject):
         return False
 
 
+class SymbolPopularityCounter(RedisObject):
+    """
+    Count how many times each symbol was requested, in a sorted set of the symbol names.
+
+    The counts are decayed whenever the set is trimmed, so symbols which stopped being requested make way for new ones.
+    """
+
+    async def increment_for(self, symbol_name: str) -> None:
+        """Increment the request count of `symbol_name` by 1."""
+        await self.redis_session.client.zincrby(self.namespace, 1, symbol_name)
+
+    async def most_popular(self, count: int) -> list[tuple[str, float]]:
+        """Return the names of the `count` most requested symbols along with their decayed counts."""
+        return await self.redis_session.client.zrevrange(self.namespace, 0, count - 1, withscores=True)
+
+    async def trim(self, size: int) -> None:
+        """Only keep the counts of the `size` most requested symbols, and multiply them by `POPULARITY_DECAY`."""
+        pipeline = self.redis_session.client.pipeline()
+        pipeline.zremrangebyrank(self.namespace, 0, -size - 1)
+        pipeline.zunionstore(self.namespace, {self.namespace: POPULARITY_DECAY})
+        await pipeline.execute()
+
+
 def item_key(item: DocItem) -> str:
     """Get the redis redis key string from `item`."""
     return f"{item.package}:{item.relative_url_path.removesuffix('.html')}"
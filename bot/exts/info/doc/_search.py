@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Sequence
+
+from rapidfuzz import fuzz, process
+
+# Suggestions scoring below this are too different from the query to be useful.
+FUZZY_SCORE_CUTOFF = 70
+# How many prefix matches to consider per requested completion, when picking the shortest ones.
+COMPLETION_CANDIDATES_PER_RESULT = 20
+
+
+class SymbolIndex:
+    """
+    A case-insensitive search index over symbol names, for completions and suggestions.
+
+    The names have to be sorted by `symbol_sort_key`, so they can be shared with the `SymbolTable` they're from.
+    Prefix matches are found with a binary search over the sorted names, which serves the purpose of a prefix trie
+    without any extra memory. Anything else is matched fuzzily with rapidfuzz, which lowercases the names
+    as it goes through them, so no lowercased copy of them is kept around.
+    """
+
+    def __init__(self, names: Sequence[str]):
+        self._names = names
+
+    def __len__(self):
+        return len(self._names)
+
+    def complete(self, prefix: str, limit: int) -> list[str]:
+        """Return up to `limit` names starting with `prefix`, shortest first."""
+        prefix = prefix.lower()
+        start = bisect_left(self._names, prefix, key=str.lower)
+        end = min(start + limit * COMPLETION_CANDIDATES_PER_RESULT, len(self._names))
+        candidates = []
+        for index in range(start, end):
+            name = self._names[index]
+            if not name.lower().startswith(prefix):
+                break
+            candidates.append(name)
+        # Prefer the closest completions, e.g. `str` over `str.join`.
+        return sorted(candidates, key=len)[:limit]
+
+    def suggest(self, query: str, limit: int) -> list[str]:
+        """Return up to `limit` names similar to `query`, best matches first."""
+        matches = process.extract(
+            query,
+            self._names,
+            scorer=fuzz.ratio,
+            processor=str.lower,
+            limit=limit,
+            score_cutoff=FUZZY_SCORE_CUTOFF,
+        )
+        return [name for name, _, _ in matches]
+
+    def search(self, query: str, limit: int) -> list[str]:
+        """Return up to `limit` names for `query`, preferring completions over fuzzy matches."""
+        if not query:
+            return []
+        results = self.complete(query, limit)
+        if len(results) < limit:
+            results.extend(name for name in self.suggest(query, limit) if name not in results)
+        return results[:limit]
@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping, Sequence, Set
+from itertools import accumulate
+from typing import TYPE_CHECKING
+
+from . import _cog
+
+if TYPE_CHECKING:
+    from ._cog import DocItem
+
+
+def symbol_sort_key(symbol_name: str) -> tuple[str, str]:
+    """Return the key symbol names are sorted by in a `SymbolTable`, case-insensitively first."""
+    return symbol_name.lower(), symbol_name
+
+
+class StringColumn(Sequence[str]):
+    """Strings stored back to back in a single UTF-8 encoded bytes object, along with the offsets they end at."""
+
+    def __init__(self, strings: Iterable[str]):
+        encoded = [string.encode() for string in strings]
+        self._data = b"".join(encoded)
+        self._ends = array("I", accumulate(map(len, encoded)))
+
+    def __len__(self):
+        return len(self._ends)
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self._ends)
+        end = self._ends[index]
+        start = self._ends[index - 1] if index else 0
+        return self._data[start:end].decode()
+
+    def __iter__(self) -> Iterator[str]:
+        start = 0
+        for end in self._ends:
+            yield self._data[start:end].decode()
+            start = end
+
+
+class PackageSymbols(Sequence[tuple[str, "DocItem"]]):
+    """
+    The symbol names of a package and their `DocItem`s, in inventory order, stored column-wise.
+
+    The packages, groups, base URLs and pages of the items are stored once in tables, and referenced by their index.
+    Symbol ids which are the same as the symbol's name, like with most Python objects, aren't stored again.
+    `DocItem`s are materialised when they're accessed.
+    """
+
+    def __init__(self, symbols: Iterable[tuple[str, DocItem]]):
+        # The package, group, base URL and relative URL path tables, and the columns referencing them.
+        self._tables = ([], [], [], [])
+        self._columns = (array("H"), array("H"), array("H"), array("I"))
+        symbol_names = []
+        symbol_ids = []
+        self._id_is_name = bytearray()
+
+        table_indices = ({}, {}, {}, {})
+        for symbol_name, doc_item in symbols:
+            for value, table, indices, column in zip(
+                doc_item[:4], self._tables, table_indices, self._columns, strict=True
+            ):
+                if (index := indices.get(value)) is None:
+                    index = indices[value] = len(table)
+                    table.append(value)
+                column.append(index)
+            symbol_names.append(symbol_name)
+            id_is_name = doc_item.symbol_id == symbol_name
+            symbol_ids.append("" if id_is_name else doc_item.symbol_id)
+            self._id_is_name.append(id_is_name)
+
+        self._names = StringColumn(symbol_names)
+        self._name_hashes = array("q", map(hash, symbol_names))
+        self._symbol_ids = StringColumn(symbol_ids)
+        self._page_positions = self._get_page_positions()
+
+    def __len__(self):
+        return len(self._names)
+
+    def __getitem__(self, position: int) -> tuple[str, DocItem]:
+        symbol_name = self._names[position]
+        return symbol_name, self._doc_item(position, symbol_name)
+
+    def __iter__(self) -> Iterator[tuple[str, DocItem]]:
+        tables = self._tables
+        for symbol_name, symbol_id, id_is_name, *indices in zip(
+            self._names, self._symbol_ids, self._id_is_name, *self._columns, strict=True
+        ):
+            yield symbol_name, _cog.DocItem(
+                *(table[index] for table, index in zip(tables, indices, strict=True)),
+                symbol_name if id_is_name else symbol_id,
+            )
+
+    def doc_item(self, position: int) -> DocItem:
+        """Return the `DocItem` of the symbol at `position`."""
+        return self._doc_item(position, self._names[position] if self._id_is_name[position] else None)
+
+    def _doc_item(self, position: int, symbol_name: str | None) -> DocItem:
+        packages, groups, base_urls, pages = self._tables
+        package_column, group_column, base_url_column, page_column = self._columns
+        return _cog.DocItem(
+            packages[package_column[position]],
+            groups[group_column[position]],
+            base_urls[base_url_column[position]],
+            pages[page_column[position]],
+            symbol_name if self._id_is_name[position] else self._symbol_ids[position],
+        )
+
+    def positions_of(self, symbol_names: Set[str]) -> list[int]:
+        """Return the positions of the symbols whose names are in `symbol_names`, in inventory order."""
+        name_hashes = {hash(symbol_name) for symbol_name in symbol_names}
+        if name_hashes.isdisjoint(self._name_hashes):
+            return []
+        return [
+            position
+            for position, name_hash in enumerate(self._name_hashes)
+            if name_hash in name_hashes and self._names[position] in symbol_names
+        ]
+
+    def _get_page_positions(self) -> dict[str, array]:
+        """Return the positions of the symbols on each page, by the absolute URL of the page."""
+        positions = defaultdict(lambda: array("I"))
+        _, _, base_urls, pages = self._tables
+        for position, (base_url_index, page_index) in enumerate(zip(self._columns[2], self._columns[3], strict=True)):
+            positions[base_urls[base_url_index] + pages[page_index]].append(position)
+        return dict(positions)
+
+    @property
+    def names(self) -> Sequence[str]:
+        """The symbol names, in inventory order."""
+        return self._names
+
+    @property
+    def package_names(self) -> Sequence[str]:
+        """The names of the packages the symbols are from."""
+        return self._tables[0]
+
+    @property
+    def pages(self) -> Iterable[str]:
+        """The absolute URLs of the pages the symbols are on."""
+        return self._page_positions.keys()
+
+    def page_items(self, url: str) -> Iterator[DocItem]:
+        """Return the `DocItem`s of the symbols on the page at `url`."""
+        return (self.doc_item(position) for position in self._page_positions.get(url, ()))
+
+
+class SymbolTable(Mapping[str, "DocItem"]):
+    """
+    A read-only mapping of symbol names to their `DocItem`s.
+
+    Instead of the items themselves, the table stores the positions of the symbols in their `PackageSymbols`,
+    in rows sorted by the names' `symbol_sort_key`, for the search index. Names are mapped to their rows by a dict.
+
+    Tables are never modified; `updated` returns a new table, which copies the kept rows in runs
+    and only compares the added names with the others.
+    """
+
+    def __init__(self):
+        """Create an empty table."""
+        self._packages: list[PackageSymbols] = []
+        self._names: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._package_indices = array("H")
+        self._positions = array("I")
+
+    @classmethod
+    def from_items(cls, doc_symbols: Mapping[str, DocItem], packages: Iterable[PackageSymbols]) -> SymbolTable:
+        """Create a table of `doc_symbols`, whose items all have to be from `packages`."""
+        item_locations = {}
+        for package in packages:
+            for position, (_, doc_item) in enumerate(package):
+                item_locations.setdefault(doc_item, (package, position))
+        try:
+            locations = {symbol_name: item_locations[doc_item] for symbol_name, doc_item in doc_symbols.items()}
+        except KeyError as e:
+            raise ValueError(f"The item {e.args[0]} isn't from the given packages.") from None
+        return cls().updated((), locations)
+
+    def updated(self, removed: Iterable[str], added: Mapping[str, tuple[PackageSymbols, int]]) -> SymbolTable:
+        """
+        Return a copy of the table with the `removed` names taken out, and the `added` names put in.
+
+        `added` maps each name to the package of its symbol and the position of the symbol in the package.
+        Added names which are already in the table replace the existing entries.
+        """
+        dropped_rows = sorted(
+            row for symbol_name in {*removed, *added} if (row := self._rows.get(symbol_name)) is not None
+        )
+        packages = self._packages.copy()
+        package_indices = {id(package): index for index, package in enumerate(packages)}
+        added_names = sorted(added, key=symbol_sort_key)
+        added_columns = (added_names, array("H"), array("I"))
+        for symbol_name in added_names:
+            package, position = added[symbol_name]
+            if (package_index := package_indices.get(id(package))) is None:
+                package_index = package_indices[id(package)] = len(packages)
+                packages.append(package)
+            added_columns[1].append(package_index)
+            added_columns[2].append(position)
+
+        # Copy the runs of rows between the dropped ones, then insert the added rows between the kept ones.
+        kept_columns = ([], array("H"), array("I"))
+        start = 0
+        for row in [*dropped_rows, len(self)]:
+            for column, kept_column in zip(self._columns, kept_columns, strict=True):
+                kept_column += column[start:row]
+            start = row + 1
+
+        table = SymbolTable()
+        start = 0
+        for index, symbol_name in enumerate(added_names):
+            row = bisect_left(kept_columns[0], symbol_sort_key(symbol_name), lo=start, key=symbol_sort_key)
+            for column, kept_column, added_column in zip(table._columns, kept_columns, added_columns, strict=True):
+                column += kept_column[start:row]
+                column.append(added_column[index])
+            start = row
+        for column, kept_column in zip(table._columns, kept_columns, strict=True):
+            column += kept_column[start:]
+        table._rows = dict(zip(table._names, range(len(table._names)), strict=True))
+
+        # Let go of the packages whose symbols were all removed.
+        used_indices = sorted(set(table._package_indices))
+        if len(used_indices) < len(packages):
+            new_indices = {index: new_index for new_index, index in enumerate(used_indices)}
+            table._package_indices[:] = array("H", map(new_indices.__getitem__, table._package_indices))
+            packages = [packages[index] for index in used_indices]
+        table._packages = packages
+        return table
+
+    @property
+    def _columns(self) -> tuple[list[str], array, array]:
+        return self._names, self._package_indices, self._positions
+
+    def __len__(self):
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __contains__(self, symbol_name: object) -> bool:
+        return symbol_name in self._rows
+
+    def __getitem__(self, symbol_name: str) -> DocItem:
+        return self._doc_item(self._rows[symbol_name])
+
+    def _doc_item(self, row: int) -> DocItem:
+        return self._packages[self._package_indices[row]].doc_item(self._positions[row])
+
+    @property
+    def names(self) -> Sequence[str]:
+        """The symbol names, sorted by `symbol_sort_key`."""
+        return self._names
+
+    def items(self) -> Iterator[tuple[str, DocItem]]:
+        """Return an iterator over the symbol names and their `DocItem`s."""
+        return ((symbol_name, self._doc_item(row)) for row, symbol_name in enumerate(self._names))
+
+    def values(self) -> Iterator[DocItem]:
+        """Return an iterator over the `DocItem`s."""
+        return map(self._doc_item, range(len(self._names)))
+
+
+class SymbolTableChanges(MutableMapping[str, "DocItem"]):
+    """
+    The symbols of a `SymbolTable`, with changes made to them kept to the side instead of copying the table.
+
+    Names which are set or deleted are added to `removed`, and the set ones are kept in `added`,
+    ready to be passed to `SymbolTable.updated`.
+    """
+
+    def __init__(self, table: SymbolTable, removed: Iterable[str] = ()):
+        self.table = table
+        self.removed = set(removed)
+        self.added: dict[str, DocItem] = {}
+
+    def __getitem__(self, symbol_name: str) -> DocItem:
+        if symbol_name in self.added:
+            return self.added[symbol_name]
+        if symbol_name in self.removed:
+            raise KeyError(symbol_name)
+        return self.table[symbol_name]
+
+    def __setitem__(self, symbol_name: str, doc_item: DocItem) -> None:
+        self.removed.add(symbol_name)
+        self.added[symbol_name] = doc_item
+
+    def __delitem__(self, symbol_name: str) -> None:
+        if symbol_name not in self:
+            raise KeyError(symbol_name)
+        self.removed.add(symbol_name)
+        self.added.pop(symbol_name, None)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.added
+        for symbol_name in self.table:
+            if symbol_name not in self.removed:
+                yield symbol_name
+
+    def __len__(self):
+        return len(self.added) + sum(symbol_name not in self.removed for symbol_name in self.table)
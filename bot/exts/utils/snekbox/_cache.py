@@ -0,0 +1,205 @@
+"""Sharing of the results of identical snekbox jobs."""
+from __future__ import annotations
+
+import ast
+import asyncio
+import builtins
+import hashlib
+import json
+import re
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from bot.exts.utils.snekbox._eval import EvalJob, EvalResult, SIGKILL
+from bot.log import get_logger
+
+log = get_logger(__name__)
+
+# How long the result of a deterministic job is kept after it completed, in seconds.
+RESULT_TTL = 60
+# The largest output, of stdout and files together, a result can have to be kept.
+MAX_RESULT_SIZE = 64 * 1024
+# The total output size under which the kept results are.
+MAX_CACHE_SIZE = 4 * 1024 * 1024
+
+# Code which mentions any of these may reach modules, and anything non-deterministic in them.
+MODULE_ACCESS_RE = re.compile(r"import|__|getattr|builtins")
+# The only builtins deterministic code can use. Builtins which depend on object identities, the hash seed,
+# the environment or I/O, or which run code from strings, are left out.
+DETERMINISTIC_BUILTINS = frozenset({
+    "ArithmeticError", "AssertionError", "AttributeError", "BaseException", "Ellipsis", "Exception", "False",
+    "IndexError", "KeyError", "LookupError", "None", "NotImplemented", "NotImplementedError", "OverflowError",
+    "RecursionError", "RuntimeError", "StopIteration", "True", "TypeError", "ValueError", "ZeroDivisionError",
+    "abs", "all", "any", "ascii", "bin", "bool", "bytearray", "bytes", "callable", "chr", "classmethod", "complex",
+    "dict", "divmod", "enumerate", "filter", "float", "format", "hasattr", "hex", "int", "isinstance", "issubclass",
+    "iter", "len", "list", "map", "max", "min", "next", "object", "oct", "ord", "pow", "print", "property", "range",
+    "repr", "reversed", "round", "slice", "sorted", "staticmethod", "str", "sum", "super", "tuple", "type", "zip",
+})
+_DISALLOWED_BUILTINS = frozenset(vars(builtins)) - DETERMINISTIC_BUILTINS
+# Attributes of generators, coroutines, tracebacks and frames, which lead to the globals and builtins of frames.
+FRAME_ATTRIBUTE_RE = re.compile(r"(?:gi|cr|ag|tb|f)_")
+# Methods returning dict views, which set operators turn into sets whose iteration order can depend on the hash seed.
+# The views can be stored and combined anywhere, so the methods can't be used at all.
+_DICT_VIEW_METHODS = frozenset({"keys", "items"})
+# Output which likely contains memory addresses, such as the default repr of objects.
+ADDRESS_RE = re.compile(r"\b0x[0-9a-fA-F]{6,}\b")
+
+
+@dataclass(frozen=True)
+class _CachedResult:
+    result: EvalResult
+    size: int
+    expires_at: float
+
+
+def job_key(job: EvalJob) -> bytes:
+    """Return a digest of everything sent to snekbox for `job`, to tell identical jobs apart by."""
+    payload = json.dumps([job.version, job.to_dict()], sort_keys=True)
+    return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+
+
+def is_deterministic(job: EvalJob) -> bool:
+    """
+    Return whether `job` is certain to produce the same output every time it's run.
+
+    The check is an allowlist: only eval jobs which run their attached files, and whose Python files can't reach any
+    modules and only use `DETERMINISTIC_BUILTINS`, are deterministic. Their code mustn't mention anything matched by
+    `MODULE_ACCESS_RE` or `FRAME_ATTRIBUTE_RE`, get dict views or create sets. Timeit jobs are never deterministic.
+    """
+    if job.name != "eval" or not set(job.args) <= {file.filename for file in job.files}:
+        return False
+    try:
+        sources = [
+            file.content.decode() for file in job.files if file.filename in job.args or file.filename.endswith(".py")
+        ]
+    except UnicodeDecodeError:
+        return False
+    return all(_is_deterministic_source(source) for source in sources)
+
+
+def _is_deterministic_source(source: str) -> bool:
+    """Return whether the Python code `source` only uses what `is_deterministic` allows."""
+    if MODULE_ACCESS_RE.search(source):
+        return False
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return False
+    for node in ast.walk(tree):
+        if (
+            isinstance(node, ast.Name) and node.id in _DISALLOWED_BUILTINS
+            or isinstance(node, ast.Attribute)
+            and (FRAME_ATTRIBUTE_RE.match(node.attr) or node.attr in _DICT_VIEW_METHODS)
+            or isinstance(node, ast.Set | ast.SetComp)
+        ):
+            return False
+    return True
+
+
+def result_size(result: EvalResult) -> int:
+    """Return the size of the output of `result`, from its stdout and files."""
+    return len(result.stdout) + sum(len(file.content) for file in result.files)
+
+
+class ResultCache:
+    """
+    Share one snekbox request between identical jobs, and optionally keep the results of deterministic jobs.
+
+    Identical jobs which are in flight at the same time await the same request, which is cancelled only once every
+    job awaiting it was cancelled.
+    If `keep_results` is set, the results of jobs which pass `is_deterministic` are also kept for `ttl` seconds,
+    unless their output is over `MAX_RESULT_SIZE` or the run was cut short.
+    The kept results are evicted oldest first to stay under `max_size`.
+    """
+
+    def __init__(self, keep_results: bool, ttl: float = RESULT_TTL, max_size: int = MAX_CACHE_SIZE):
+        self.keep_results = keep_results
+        self.ttl = ttl
+        self.max_size = max_size
+        self.size = 0
+        self._results: dict[bytes, _CachedResult] = {}
+        self._in_flight: dict[bytes, asyncio.Task] = {}
+        self._waiters: dict[bytes, int] = {}
+
+    def get(self, key: bytes) -> EvalResult | None:
+        """Return the kept result for the job `key` if there's one which didn't expire yet."""
+        cached = self._results.get(key)
+        if cached is not None and cached.expires_at < time.monotonic():
+            self._evict(key)
+            cached = None
+        return cached.result if cached else None
+
+    async def run(self, job: EvalJob, post: Callable[[EvalJob], Awaitable[EvalResult]]) -> EvalResult:
+        """
+        Return the result of `job`, posting it with `post` only if no identical job is kept or in flight.
+
+        If this is the last job awaiting its request when it's cancelled, the request is cancelled too,
+        and identical jobs coming after it make a new request.
+        """
+        key = job_key(job)
+        if (result := self.get(key)) is not None:
+            log.trace(f"Reusing the kept result of an identical {job.name} job.")
+            return result
+
+        if (task := self._in_flight.get(key)) is None:
+            task = self._in_flight[key] = asyncio.create_task(self._post(key, job, post))
+            self._waiters[key] = 0
+        else:
+            log.trace(f"Sharing the request of an identical {job.name} job in flight.")
+
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[key] == 1 and not task.done():
+                del self._in_flight[key]
+                task.cancel()
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+    async def _post(self, key: bytes, job: EvalJob, post: Callable[[EvalJob], Awaitable[EvalResult]]) -> EvalResult:
+        """Post `job`, and keep its result if it's deterministic."""
+        try:
+            result = await post(job)
+        finally:
+            # A cancelled request is already replaced by then.
+            if self._in_flight.get(key) is asyncio.current_task():
+                del self._in_flight[key]
+
+        if self.keep_results and self._is_cacheable(job, result):
+            self._set(key, result)
+        return result
+
+    @staticmethod
+    def _is_cacheable(job: EvalJob, result: EvalResult) -> bool:
+        """Return whether `result` of `job` can be returned for identical jobs."""
+        return (
+            result.returncode not in (None, 255, 128 + SIGKILL)
+            and not result.failed_files
+            and result_size(result) <= MAX_RESULT_SIZE
+            and not ADDRESS_RE.search(result.stdout)
+            and is_deterministic(job)
+        )
+
+    def _set(self, key: bytes, result: EvalResult) -> None:
+        """Keep `result` for the job `key`, evicting the oldest results if the cache is full."""
+        if key in self._results:
+            self._evict(key)
+        size = result_size(result)
+        while self._results and self.size + size > self.max_size:
+            self._evict(next(iter(self._results)))
+        self._results[key] = _CachedResult(result, size, time.monotonic() + self.ttl)
+        self.size += size
+
+    def _evict(self, key: bytes) -> None:
+        """Remove the kept result for the job `key`."""
+        self.size -= self._results.pop(key).size
+
+    def clear(self) -> None:
+        """Remove all kept results."""
+        self._results.clear()
+        self.size = 0
@@ -1,25 +1,44 @@
 from __future__ import annotations
 
+import asyncio
 import contextlib
 import re
+import time
+from collections.abc import Iterator
 from functools import partial
+from itertools import islice
 from operator import attrgetter
 from textwrap import dedent
 from typing import Literal, NamedTuple, TYPE_CHECKING
 
-from discord import AllowedMentions, HTTPException, Interaction, Message, NotFound, Reaction, User, enums, ui
+from discord import (
+    AllowedMentions,
+    HTTPException,
+    Interaction,
+    Message,
+    NotFound,
+    RawMessageDeleteEvent,
+    Reaction,
+    User,
+    enums,
+    ui,
+)
 from discord.ext.commands import Cog, Command, Context, Converter, command, guild_only
 from pydis_core.utils import interactions, paste_service
 from pydis_core.utils.paste_service import PasteFile, send_to_paste_service
 from pydis_core.utils.regex import FORMATTED_CODE_REGEX, RAW_CODE_REGEX
 
+from bot import constants
 from bot.bot import Bot
 from bot.constants import BaseURLs, Channels, Emojis, MODERATION_ROLES, Roles, URLs
 from bot.decorators import redirect_output
 from bot.exts.filtering._filter_lists.extension import TXT_LIKE_FILES
 from bot.exts.help_channels._channel import is_help_forum_post
+from bot.exts.utils.snekbox._cache import ResultCache
 from bot.exts.utils.snekbox._eval import EvalJob, EvalResult
 from bot.exts.utils.snekbox._io import FileAttachment
+from bot.exts.utils.snekbox._response import ResponseParser
+from bot.exts.utils.snekbox._scheduler import JobCancelledError, JobScheduler
 from bot.log import get_logger
 from bot.utils.lock import LockedResourceError, lock_arg
 
@@ -29,6 +48,11 @@ if TYPE_CHECKING:
 log = get_logger(__name__)
 
 ESCAPE_REGEX = re.compile("[`\u202E\u200B]{3,}")
+# The line boundaries `str.splitlines` splits on, "\r\n" counting as a single one.
+LINE_BREAKS = "\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029"
+# The size of the blocks from the end of the output that trailing newlines are stripped in.
+STRIP_CHUNK_SIZE = 4096
+_NEWLINE_BLOCK = "\n" * STRIP_CHUNK_SIZE
 
 # The timeit command should only output the very last line, so all other output should be suppressed.
 # This will be used as the setup code along with any setup code provided.
@@ -82,6 +106,9 @@ NO_SNEKBOX_CHANNELS = (Channels.python_general,)
 NO_SNEKBOX_CATEGORIES = ()
 SNEKBOX_ROLES = (Roles.helpers, Roles.moderators, Roles.admins, Roles.owners, Roles.python_community, Roles.partners)
 
+# Max number of jobs sent to snekbox at once, the other jobs are queued
+MAX_CONCURRENT_JOBS = 4
+
 REDO_EMOJI = "\U0001f501"  # :repeat:
 REDO_TIMEOUT = 30
 
@@ -171,6 +198,8 @@ class Snekbox(Cog):
     def __init__(self, bot: Bot):
         self.bot = bot
         self.jobs = {}
+        self.job_scheduler = JobScheduler(MAX_CONCURRENT_JOBS)
+        self.results = ResultCache(keep_results=constants.Snekbox.cache_results)
 
     def build_python_version_switcher_view(
         self,
@@ -197,11 +226,69 @@ class Snekbox(Cog):
         return view
 
     async def post_job(self, job: EvalJob) -> EvalResult:
-        """Send a POST request to the Snekbox API to evaluate code and return the results."""
+        """
+        Evaluate code with the Snekbox API and return the results.
+
+        Identical jobs which are posted at the same time share one request,
+        and the results of deterministic jobs may be reused if result caching is enabled.
+        """
+        return await self.results.run(job, self._request_job)
+
+    async def _request_job(self, job: EvalJob) -> EvalResult:
+        """
+        Send a POST request to the Snekbox API to evaluate code and return the results.
+
+        The response is parsed as it's read, and the peak memory used for it is recorded per Python version.
+        """
         data = job.to_dict()
 
         async with self.bot.http_session.post(URLs.snekbox_eval_api, json=data, raise_for_status=True) as resp:
-            return EvalResult.from_dict(await resp.json())
+            parser = ResponseParser(resp.content)
+            result = await parser.parse()
+        self.bot.stats.gauge(f"{job_stats_prefix(job)}.peak_memory", parser.peak_memory)
+        return result
+
+    async def schedule_job(self, ctx: Context, job: EvalJob) -> EvalResult:
+        """
+        Post the job once the job scheduler lets it run, and return its results.
+
+        If the job is queued, tell the user its position in the queue, in a message deleted once the job starts
+        or is cancelled.
+        The time the job waited in the queue, and the time it ran for, are recorded per Python version.
+        """
+        queued_at = time.monotonic()
+        queued_message = None
+        stats_prefix = job_stats_prefix(job)
+
+        async def send_position(position: int) -> None:
+            nonlocal queued_message
+            queued_message = await ctx.send(
+                f"{ctx.author.mention} Your {job.name} job is queued at position {position}, "
+                "it'll run as soon as possible.",
+                allowed_mentions=AllowedMentions(everyone=False, roles=False, users=[ctx.author]),
+            )
+
+        async def delete_queued_message() -> None:
+            nonlocal queued_message
+            if queued_message is not None:
+                message, queued_message = queued_message, None
+                with contextlib.suppress(HTTPException):
+                    await message.delete()
+
+        async def post() -> EvalResult:
+            started_at = time.monotonic()
+            self.bot.stats.timing(f"{stats_prefix}.queue_wait", (started_at - queued_at) * 1000)
+            await delete_queued_message()
+            try:
+                return await self.post_job(job)
+            finally:
+                self.bot.stats.timing(f"{stats_prefix}.run_time", (time.monotonic() - started_at) * 1000)
+
+        try:
+            return await self.job_scheduler.run(ctx.message.id, post, send_position)
+        finally:
+            # A job cancelled while it's queued never gets to delete the message itself.
+            await delete_queued_message()
 
     async def upload_output(self, output: str) -> str | None:
         """Upload the job's output to a paste service and return a URL to it if successful."""
@@ -247,42 +334,48 @@ class Snekbox(Cog):
 
         Prepend each line with a line number. Truncate if there are over 10 lines or 1000 characters
         and upload the full output to a paste service.
-        """
-        output = output.rstrip("\n")
-        original_output = output  # To be uploaded to a pasting service if needed
-        paste_link = None
 
-        if "<@" in output:
-            output = output.replace("<@", "<@\u200B")  # Zero-width space
+        Only the lines which can be shown are split off the output, up to `max_chars` characters of each,
+        so the time taken doesn't grow with the size of the output. Only those lines are checked for code block
+        escapes, and the full output is uploaded while they're checked.
+        """
+        max_lines = max(max_lines, 0)
+        max_chars = max(max_chars, 0)
+        original_output = output  # To be uploaded to a pasting service if needed, as is to avoid copying it
+        end = output_end(output)
+
+        # One line more than is shown tells whether there are too many lines, and two tell whether to number them.
+        spans = list(islice(iter_line_spans(output, end), max(max_lines + 1, 2)))
+        if len(spans) > 1:
+            # Escaping the pings of the start of a line gives the start of the line with its pings escaped.
+            lines = [escape_pings(output[start:min(stop, start + max_chars + 1)]) for start, stop in spans]
+            shown_lines = lines[:max_lines + 1]
+            if line_nums:
+                shown_lines = [f"{i:03d} | {line}" for i, line in enumerate(shown_lines, 1)]
+            output = "\n".join(shown_lines)
+        else:
+            output = escape_pings(output[:min(end, max_chars + 1)])
+            lines = [output]
 
-        if "<!@" in output:
-            output = output.replace("<!@", "<!@\u200B")  # Zero-width space
+        too_many_lines = len(spans) > max_lines
+        too_long = len(output) >= max_chars
+        upload = None
+        if too_many_lines or too_long:
+            upload = asyncio.create_task(self.upload_output(original_output))
 
-        if ESCAPE_REGEX.findall(output):
-            paste_link = await self.upload_output(original_output)
+        if any(ESCAPE_REGEX.search(line) for line in lines):
+            paste_link = await (upload or self.upload_output(original_output))
             return "Code block escape attempt detected; will not output result", paste_link
 
-        truncated = False
-        lines = output.splitlines()
-
-        if len(lines) > 1:
-            if line_nums:
-                lines = [f"{i:03d} | {line}" for i, line in enumerate(lines, 1)]
-            lines = lines[:max_lines+1]  # Limiting to max+1 lines
-            output = "\n".join(lines)
-
-        if len(lines) > max_lines:
-            truncated = True
-            if len(output) >= max_chars:
+        if too_many_lines:
+            if too_long:
                 output = f"{output[:max_chars]}\n... (truncated - too long, too many lines)"
             else:
                 output = f"{output}\n... (truncated - too many lines)"
-        elif len(output) >= max_chars:
-            truncated = True
+        elif too_long:
             output = f"{output[:max_chars]}\n... (truncated - too long)"
 
-        if truncated:
-            paste_link = await self.upload_output(original_output)
+        paste_link = await upload if upload else None
 
         if output_default and not output:
             output = output_default
@@ -314,10 +407,13 @@ class Snekbox(Cog):
         """
         Evaluate code, format it, and send the output to the corresponding channel.
 
+        The job is run through the job scheduler, and `JobCancelledError` is raised if the invoking message is deleted
+        before it completes.
+
         Return the bot response.
         """
         async with ctx.typing():
-            result = await self.post_job(job)
+            result = await self.schedule_job(ctx, job)
             msg = result.get_message(job)
             error = result.error_message
 
@@ -521,6 +617,9 @@ class Snekbox(Cog):
                     "please wait for it to finish!"
                 )
                 return
+            except JobCancelledError:
+                log.info(f"{ctx.author}'s {job.name} job was cancelled as message {ctx.message.id} was deleted.")
+                return
 
             # Store the bot's response message id per invocation, to ensure the `wait_for`s in `continue_job`
             # don't trigger if the response has already been replaced by a new response.
@@ -532,6 +631,11 @@ class Snekbox(Cog):
                 break
             log.info(f"Re-evaluating code from message {ctx.message.id}:\n{job}")
 
+    @Cog.listener()
+    async def on_raw_message_delete(self, payload: RawMessageDeleteEvent) -> None:
+        """Cancel the queued or running job of a deleted eval or timeit invocation."""
+        self.job_scheduler.cancel(payload.message_id)
+
     @command(name="eval", aliases=("e",), usage="[python_version] <code, ...>")
     @guild_only()
     @redirect_output(
@@ -610,6 +714,51 @@ class Snekbox(Cog):
         await self.run_job(ctx, job)
 
 
+def output_end(output: str) -> int:
+    """Return the length of `output` without its trailing newlines, without copying all of it."""
+    end = len(output)
+    # Whole blocks of newlines are compared against the output, which is faster than stripping them.
+    while end >= STRIP_CHUNK_SIZE and output.endswith(_NEWLINE_BLOCK, 0, end):
+        end -= STRIP_CHUNK_SIZE
+    chunk = output[max(end - STRIP_CHUNK_SIZE, 0):end]
+    return end - (len(chunk) - len(chunk.rstrip("\n")))
+
+
+def iter_line_spans(output: str, end: int) -> Iterator[tuple[int, int]]:
+    """
+    Lazily yield the start and end indices of the lines of `output[:end]`, as split by `str.splitlines`.
+
+    The next occurrence of each line boundary is searched for only once it's passed,
+    so the output is scanned about once for each kind of boundary.
+    """
+    next_breaks = dict.fromkeys(LINE_BREAKS, -1)
+    start = 0
+    while start < end:
+        for line_break, position in next_breaks.items():
+            if position < start:
+                position = output.find(line_break, start, end)
+                next_breaks[line_break] = end if position == -1 else position
+        stop = min(next_breaks.values())
+        yield start, stop
+        start = stop + 1
+        if output.startswith("\r\n", stop, end):
+            start += 1
+
+
+def escape_pings(text: str) -> str:
+    """Insert a zero-width space into user and role pings in `text`, so they don't ping anyone."""
+    if "<@" in text:
+        text = text.replace("<@", "<@\u200B")
+    if "<!@" in text:
+        text = text.replace("<!@", "<!@\u200B")
+    return text
+
+
+def job_stats_prefix(job: EvalJob) -> str:
+    """Return the prefix of the stats recorded for the Python version of `job`."""
+    return f"snekbox.python_{job.version.replace('.', '_')}"
+
+
 def predicate_message_edit(ctx: Context, old_msg: Message, new_msg: Message) -> bool:
     """Return True if the edited message is the context message and the content was indeed modified."""
     return new_msg.id == ctx.message.id and old_msg.content != new_msg.content
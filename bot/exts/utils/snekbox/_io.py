@@ -1,9 +1,9 @@
 """I/O File protocols for snekbox."""
 from __future__ import annotations
 
+import io
 from base64 import b64decode, b64encode
 from dataclasses import dataclass
-from io import BytesIO
 from pathlib import PurePosixPath
 
 import regex
@@ -49,12 +49,56 @@ def normalize_discord_file_name(name: str) -> str:
     return name
 
 
+class BufferReader(io.RawIOBase):
+    """A read-only binary file over a bytes-like object, which reads from the object without copying it first."""
+
+    def __init__(self, buffer: bytes | bytearray):
+        super().__init__()
+        self._view = memoryview(buffer)
+        self._position = 0
+
+    def readable(self) -> bool:
+        """Return True, the file can be read."""
+        return True
+
+    def seekable(self) -> bool:
+        """Return True, the file supports random access."""
+        return True
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:
+        """Read bytes into `buffer`, and return the number of bytes read."""
+        size = max(0, min(len(buffer), len(self._view) - self._position))
+        buffer[:size] = self._view[self._position:self._position + size]
+        self._position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Move to `offset` relative to `whence`, and return the new position."""
+        start = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: len(self._view)}[whence]
+        self._position = max(0, start + offset)
+        return self._position
+
+    def tell(self) -> int:
+        """Return the current position."""
+        return self._position
+
+    def close(self) -> None:
+        """Close the file, and release the underlying buffer."""
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
 @dataclass(frozen=True)
 class FileAttachment:
-    """File Attachment from Snekbox eval."""
+    """
+    File Attachment from Snekbox eval.
+
+    The content of files parsed from a response is the `bytearray` they were decoded into.
+    """
 
     filename: str
-    content: bytes
+    content: bytes | bytearray
 
     def __repr__(self) -> str:
         """Return the content as a string."""
@@ -97,6 +141,6 @@ class FileAttachment:
         }
 
     def to_file(self) -> File:
-        """Convert to a discord.File."""
+        """Convert to a discord.File, which reads the content without copying it."""
         name = normalize_discord_file_name(self.name)
-        return File(BytesIO(self.content), filename=name)
+        return File(BufferReader(self.content), filename=name)
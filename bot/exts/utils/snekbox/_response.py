@@ -0,0 +1,245 @@
+"""Streaming parser for the responses of the snekbox eval API."""
+from __future__ import annotations
+
+import binascii
+import json
+import re
+from collections.abc import AsyncIterator
+from typing import Any, Protocol
+
+from bot.exts.utils.snekbox._eval import EvalResult
+from bot.exts.utils.snekbox._io import FILE_COUNT_LIMIT, FILE_SIZE_LIMIT, FileAttachment
+from bot.log import get_logger
+
+log = get_logger(__name__)
+
+READ_CHUNK_SIZE = 64 * 1024
+_WHITESPACE = b" \t\r\n"
+_SCALAR_END = b",]}" + _WHITESPACE
+# The characters of a string up to its closing quote, or up to the end of the buffer, in a single pass.
+# A backslash at the end of the buffer is left for the next read, along with the character it escapes.
+_STRING_BODY_RE = re.compile(rb'(?:[^"\\]+|\\.)*', re.DOTALL)
+
+
+class ResponseStream(Protocol):
+    """The part of `aiohttp.StreamReader` used to read the response."""
+
+    def iter_chunked(self, n: int) -> AsyncIterator[bytes]:
+        """Yield the rest of the response in chunks of at most `n` bytes."""
+
+
+class ResponseParser:
+    """
+    Parse a snekbox response as it's read, without holding its whole body in memory.
+
+    The base64 contents of files are decoded incrementally as they're read. A file's size is checked against the limit
+    before the content read so far is decoded, and the content of a file over the limit, or over the file count limit,
+    is skipped without being decoded at all.
+    The estimated peak of the memory used for the body and the decoded files is kept in `peak_memory`.
+    """
+
+    def __init__(self, stream: ResponseStream, size_limit: int = FILE_SIZE_LIMIT):
+        self.size_limit = size_limit
+        self.peak_memory = 0
+        self._chunks = aiter(stream.iter_chunked(READ_CHUNK_SIZE))
+        self._buffer = b""
+        self._position = 0
+        self._held = 0  # The size of the values parsed so far
+
+    async def parse(self) -> EvalResult:
+        """Parse the response into an `EvalResult`."""
+        fields = {}
+        files = []
+        failed_files = []
+        async for key in self._object_keys():
+            if key == "files":
+                await self._read_files(files, failed_files)
+            else:
+                fields[key] = await self._read_value()
+        return EvalResult(fields["stdout"], fields["returncode"], files, failed_files)
+
+    async def _read_files(self, files: list[FileAttachment], failed_files: list[str]) -> None:
+        """Read the array of files, adding the decoded ones to `files` and the paths of the others to `failed_files`."""
+        await self._expect(b"[")
+        if await self._peek() == ord("]"):
+            self._position += 1
+            return
+
+        while True:
+            path = content = None
+            over_limit = len(files) + len(failed_files) >= FILE_COUNT_LIMIT
+            async for key in self._object_keys():
+                if key == "content":
+                    if over_limit:
+                        await self._read_content(limit=-1)
+                    else:
+                        content = await self._read_content(self.size_limit)
+                        over_limit = content is None
+                elif key == "size":
+                    size = await self._read_value()
+                    over_limit = over_limit or bool(size and size > self.size_limit)
+                elif key == "path":
+                    path = await self._read_value()
+                else:
+                    await self._read_value()
+
+            if over_limit or content is None:
+                log.info(f"Failed to parse file {path!r} from snekbox response.")
+                if content is not None:
+                    self._held -= len(content)
+                failed_files.append(path)
+            else:
+                files.append(FileAttachment(path, content))
+
+            if not await self._next_item(b"]"):
+                return
+
+    async def _read_content(self, limit: int) -> bytearray | None:
+        """
+        Read a base64 string and return its decoded bytes, or None if they would be over `limit` bytes or are invalid.
+
+        The string is read to its end either way, but nothing is decoded once it's known to be over the limit.
+        """
+        await self._expect(b'"')
+        decoded = bytearray()
+        pending = b""  # Characters after the last whole group of 4, which can't be decoded alone
+        encoded_size = 0
+        while True:
+            end = self._buffer.find(b'"', self._position)
+            segment = self._buffer[self._position:end if end != -1 else len(self._buffer)]
+            if b"\\" in segment:
+                raise ValueError("Unexpected escape sequence in base64 file content.")
+            self._position += len(segment)
+
+            encoded_size += len(segment)
+            # Only the last group of 4 can be padded, and it decodes to at least 1 byte.
+            if decoded is not None and encoded_size // 4 * 3 - 2 > limit:
+                self._held -= len(decoded)
+                decoded = None
+            if decoded is not None:
+                pending += segment
+                whole = len(pending) // 4 * 4
+                if end != -1:
+                    whole = len(pending)
+                try:
+                    chunk = binascii.a2b_base64(pending[:whole])
+                except binascii.Error as e:
+                    log.info(f"Invalid base64 file content in snekbox response: {e}")
+                    chunk = None
+                pending = pending[whole:]
+                if chunk is not None:
+                    decoded += chunk
+                    self._held += len(chunk)
+                if chunk is None or len(decoded) > limit:
+                    self._held -= len(decoded)
+                    decoded = None
+                self._update_peak()
+
+            if end != -1:
+                self._position += 1
+                return decoded
+            if not await self._fill():
+                raise ValueError("Unterminated string in snekbox response.")
+
+    async def _object_keys(self) -> AsyncIterator[str]:
+        """Yield the keys of an object, leaving the stream at each key's value."""
+        await self._expect(b"{")
+        if await self._peek() == ord("}"):
+            self._position += 1
+            return
+
+        while True:
+            key = await self._read_value()
+            await self._expect(b":")
+            yield key
+            if not await self._next_item(b"}"):
+                return
+
+    async def _next_item(self, closing: bytes) -> bool:
+        """Consume the separator after an item of a container, and return whether there's another item."""
+        separator = await self._peek()
+        self._position += 1
+        if separator == ord(","):
+            return True
+        if separator == closing[0]:
+            return False
+        raise ValueError(f"Expected ',' or {closing.decode()!r} in snekbox response, got {chr(separator)!r}.")
+
+    async def _read_value(self) -> Any:
+        """Read and return any JSON value."""
+        first = await self._peek()
+        if first == ord("{"):
+            return {key: await self._read_value() async for key in self._object_keys()}
+        if first == ord("["):
+            self._position += 1
+            items = []
+            if await self._peek() == ord("]"):
+                self._position += 1
+                return items
+            while True:
+                items.append(await self._read_value())
+                if not await self._next_item(b"]"):
+                    return items
+        if first == ord('"'):
+            return await self._read_string()
+        return await self._read_scalar()
+
+    async def _read_string(self) -> str:
+        """Read a string, which is kept in memory whole."""
+        self._position += 1
+        raw = bytearray(b'"')
+        while True:
+            end = _STRING_BODY_RE.match(self._buffer, self._position).end()
+            raw += self._buffer[self._position:end]
+            self._position = end
+            if end < len(self._buffer) and self._buffer[end] == ord('"'):
+                self._position += 1
+                raw += b'"'
+                self._held += len(raw)
+                self._update_peak()
+                return json.loads(raw)
+            if not await self._fill():
+                raise ValueError("Unterminated string in snekbox response.")
+
+    async def _read_scalar(self) -> Any:
+        """Read a number, a boolean or null."""
+        raw = b""
+        while True:
+            end = self._position
+            while end < len(self._buffer) and self._buffer[end] not in _SCALAR_END:
+                end += 1
+            raw += self._buffer[self._position:end]
+            self._position = end
+            if end < len(self._buffer) or not await self._fill():
+                return json.loads(raw)
+
+    async def _expect(self, char: bytes) -> None:
+        """Consume `char`, the next character which isn't whitespace."""
+        if (found := await self._peek()) != char[0]:
+            raise ValueError(f"Expected {char.decode()!r} in snekbox response, got {chr(found)!r}.")
+        self._position += 1
+
+    async def _peek(self) -> int:
+        """Skip whitespace, and return the next character without consuming it."""
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position] in _WHITESPACE:
+                self._position += 1
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not await self._fill():
+                raise ValueError("Unexpected end of snekbox response.")
+
+    async def _fill(self) -> bool:
+        """Replace the consumed part of the buffer with the next chunk, and return False if the stream ended."""
+        try:
+            chunk = await anext(self._chunks)
+        except StopAsyncIteration:
+            return False
+        self._buffer = self._buffer[self._position:] + chunk
+        self._position = 0
+        self._update_peak()
+        return True
+
+    def _update_peak(self) -> None:
+        """Record the memory currently used, if it's the most so far."""
+        self.peak_memory = max(self.peak_memory, self._held + len(self._buffer))
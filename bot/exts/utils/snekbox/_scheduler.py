@@ -0,0 +1,123 @@
+"""Scheduling of snekbox jobs, so a burst of evaluations doesn't overload snekbox."""
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import TypeVar
+
+from bot.log import get_logger
+
+log = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class JobCancelledError(Exception):
+    """Raised when a scheduled job is cancelled with `JobScheduler.cancel`."""
+
+
+@dataclass(eq=False)
+class _Entry:
+    """A job waiting for, or holding, one of the scheduler's slots."""
+
+    key: int
+    slot: asyncio.Future = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+    task: asyncio.Task | None = None
+    holds_slot: bool = False
+    cancelled: bool = False
+
+
+class JobScheduler:
+    """
+    Run jobs with at most `max_running` of them running at once, in the order they're submitted.
+
+    Jobs which can't start right away wait in a single queue; the cog already allows only one job per user.
+    Each job is identified by a key, which can be used to cancel it whether it's queued or running.
+    """
+
+    def __init__(self, max_running: int):
+        self.max_running = max_running
+        self._running = 0
+        self._queue: deque[_Entry] = deque()
+        self._entries: defaultdict[int, list[_Entry]] = defaultdict(list)
+
+    @property
+    def queued(self) -> int:
+        """Return the number of jobs waiting for a slot."""
+        return len(self._queue)
+
+    async def run(
+        self,
+        key: int,
+        job: Callable[[], Awaitable[T]],
+        on_queued: Callable[[int], Awaitable[object]] | None = None,
+    ) -> T:
+        """
+        Run `job` once a slot is free, and return its result.
+
+        If the job has to wait for a slot, `on_queued` is awaited with its position in the queue.
+        Raise `JobCancelledError` if the job is cancelled with its `key` before it completes.
+        """
+        entry = _Entry(key)
+        self._entries[key].append(entry)
+        try:
+            if self._running < self.max_running and not self._queue:
+                self._acquire(entry)
+            else:
+                self._queue.append(entry)
+                position = len(self._queue)
+                log.trace(f"Queued job {key} at position {position}.")
+                if on_queued is not None:
+                    await on_queued(position)
+                await entry.slot
+                if entry.cancelled:
+                    # The job was cancelled after it got its slot, but before it started.
+                    raise asyncio.CancelledError
+
+            entry.task = asyncio.ensure_future(job())
+            return await entry.task
+        except asyncio.CancelledError:
+            if entry.cancelled:
+                raise JobCancelledError(f"Job {key} was cancelled.") from None
+            raise
+        finally:
+            self._remove(entry)
+
+    def cancel(self, key: int) -> bool:
+        """Cancel the queued or running jobs with `key`, and return whether there were any."""
+        entries = self._entries.get(key, [])
+        for entry in entries:
+            log.trace(f"Cancelling job {key}.")
+            entry.cancelled = True
+            if entry.task is not None:
+                entry.task.cancel()
+            else:
+                entry.slot.cancel()
+        return bool(entries)
+
+    def _acquire(self, entry: _Entry) -> None:
+        """Give a slot to `entry`."""
+        self._running += 1
+        entry.holds_slot = True
+        if not entry.slot.done():
+            entry.slot.set_result(None)
+
+    def _remove(self, entry: _Entry) -> None:
+        """Forget `entry`, and pass its slot on to the next queued job if it held one."""
+        entries = self._entries[entry.key]
+        entries.remove(entry)
+        if not entries:
+            del self._entries[entry.key]
+
+        if entry in self._queue:
+            self._queue.remove(entry)
+
+        if not entry.holds_slot:
+            return
+        self._running -= 1
+        while self._queue and self._running < self.max_running:
+            next_entry = self._queue.popleft()
+            if not next_entry.slot.done():
+                self._acquire(next_entry)
@@ -0,0 +1,73 @@
+"""
+Trimmed Sphinx pages and inventories from a few documentation sites, so the doc parsing benchmarks can run offline.
+
+The sites cover the classic theme of the CPython docs, NumPy's pydata theme with numpydoc field lists,
+and the custom theme of discord.py.
+Each project has its inventory as `objects.txt`, which is the text of its `objects.inv` before compression,
+next to the pages from its inventory that were kept, at their paths relative to the site's base URL.
+"""
+
+import zlib
+from pathlib import Path
+from typing import NamedTuple
+
+CORPUS_DIR = Path(__file__).parent
+# The number of header lines an inventory starts with, which are not compressed.
+_INVENTORY_HEADER_LINES = 4
+
+BASE_URLS = {
+    "cpython": "https://docs.python.org/3/",
+    "numpy": "https://numpy.org/doc/stable/",
+    "discord": "https://discordpy.readthedocs.io/en/latest/",
+}
+
+
+class CorpusProject(NamedTuple):
+    """A documentation site of the corpus."""
+
+    name: str
+    base_url: str
+    inventory: bytes  # The inventory as it's served, with its body compressed
+    pages: dict[str, str]  # The HTML of the kept pages, by their paths relative to `base_url`
+
+
+class FixtureStream:
+    """A stand-in for `aiohttp.StreamReader`, serving recorded data by lines or in chunks."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.position = 0
+
+    async def readline(self) -> bytes:
+        """Return the next line, including its newline."""
+        end = self.data.find(b"\n", self.position) + 1 or len(self.data)
+        line = self.data[self.position:end]
+        self.position = end
+        return line
+
+    async def iter_chunked(self, size: int):
+        """Yield the rest of the data in chunks of `size` bytes."""
+        while self.position < len(self.data):
+            yield self.data[self.position:self.position + size]
+            self.position += size
+
+
+def _compress_inventory(text: bytes) -> bytes:
+    """Compress the body of the inventory `text`, leaving its header as is."""
+    lines = text.splitlines(keepends=True)
+    header, body = lines[:_INVENTORY_HEADER_LINES], lines[_INVENTORY_HEADER_LINES:]
+    return b"".join(header) + zlib.compress(b"".join(body))
+
+
+def load_projects() -> list[CorpusProject]:
+    """Load every project of the corpus."""
+    projects = []
+    for name, base_url in BASE_URLS.items():
+        project_dir = CORPUS_DIR / name
+        pages = {
+            path.relative_to(project_dir).as_posix(): path.read_text(encoding="utf-8")
+            for path in sorted(project_dir.rglob("*.html"))
+        }
+        inventory = _compress_inventory((project_dir / "objects.txt").read_bytes())
+        projects.append(CorpusProject(name, base_url, inventory, pages))
+    return projects
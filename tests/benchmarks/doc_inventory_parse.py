@@ -0,0 +1,115 @@
+"""
+Benchmark the time and peak memory of parsing a large intersphinx inventory.
+
+The previous line by line parser is kept here for comparison.
+
+Run with `python -m tests.benchmarks.doc_inventory_parse`.
+"""
+
+import asyncio
+import re
+import time
+import tracemalloc
+import zlib
+from collections import defaultdict
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+from bot.exts.info.doc._inventory_parser import ZlibStreamReader, _load_v2
+
+# Roughly the size of the CPython inventory.
+SYMBOL_COUNT = 60_000
+REPEATS = 5
+
+_LEGACY_V2_LINE_RE = re.compile(r"(?x)(.+?)\s+(\S*:\S*)\s+(-?\d+)\s+?(\S*)\s+(.*)")
+
+
+class FixtureStream:
+    """A stand-in for `aiohttp.StreamReader`, serving recorded data in chunks."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def iter_chunked(self, size: int):
+        """Yield the data in chunks of `size` bytes."""
+        for start in range(0, len(self.data), size):
+            yield self.data[start:start + size]
+
+
+async def _legacy_lines(stream: FixtureStream) -> AsyncIterator[str]:
+    decompressor = zlib.decompressobj()
+    buf = b""
+    async for compressed in stream.iter_chunked(ZlibStreamReader.READ_CHUNK_SIZE):
+        buf += decompressor.decompress(compressed)
+        pos = buf.find(b"\n")
+        while pos != -1:
+            yield buf[:pos].decode()
+            buf = buf[pos + 1:]
+            pos = buf.find(b"\n")
+
+
+async def _legacy_load_v2(stream: FixtureStream) -> dict:
+    invdata = defaultdict(list)
+    async for line in _legacy_lines(stream):
+        name, type_, _prio, location, _dispname = _LEGACY_V2_LINE_RE.match(line.rstrip()).groups()
+        if location.endswith("$"):
+            location = location[:-1] + name
+        invdata[type_].append((name, location))
+    return invdata
+
+
+async def _drain(iterator: AsyncIterator) -> None:
+    async for _ in iterator:
+        pass
+
+
+def make_inventory() -> bytes:
+    """Return the compressed body of an inventory shaped like a large Sphinx project's."""
+    lines = []
+    for index in range(SYMBOL_COUNT):
+        module = f"package.module{index // 200}"
+        if index % 20 == 0:
+            lines.append(f"{module} py:module 0 library/{module}.html#module-$ -")
+        elif index % 50 == 1:
+            lines.append(f"glossary term {index} std:term -1 glossary.html#term-glossary-term-{index} Glossary term")
+        else:
+            lines.append(f"{module}.Symbol{index}.method py:method 1 library/{module}.html#$ -")
+    return zlib.compress(("\n".join(lines) + "\n").encode())
+
+
+def best_time(loader: Callable[[FixtureStream], Awaitable], data: bytes) -> float:
+    """Return the best time out of `REPEATS` runs of parsing `data` with `loader`."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        asyncio.run(loader(FixtureStream(data)))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(reader: Callable[[FixtureStream], AsyncIterator], data: bytes) -> int:
+    """Return the peak memory of streaming through `data` with `reader`, excluding what the parser builds from it."""
+    tracemalloc.start()
+    asyncio.run(_drain(reader(FixtureStream(data))))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    """Compare the previous and current inventory parsers."""
+    data = make_inventory()
+    if asyncio.run(_legacy_load_v2(FixtureStream(data))) != asyncio.run(_load_v2(FixtureStream(data))):
+        raise RuntimeError("The parsers disagree on the fixture.")
+
+    print(f"{SYMBOL_COUNT} symbols, {len(data) / 1024:.0f} KiB compressed")
+    for name, loader, reader in (
+        ("line by line", _legacy_load_v2, _legacy_lines),
+        ("block", _load_v2, ZlibStreamReader),
+    ):
+        duration = best_time(loader, data)
+        peak = peak_memory(reader, data)
+        print(f"{name:>12}: {duration * 1000:7.1f} ms, stream peak {peak / 1024:7.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
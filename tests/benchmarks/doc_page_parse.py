@@ -0,0 +1,129 @@
+"""
+Benchmark extracting the Markdown of every symbol on a large Sphinx page.
+
+The previous approach of searching the page for each symbol is kept here for comparison.
+
+Run with `python -m tests.benchmarks.doc_page_parse`.
+"""
+
+import time
+from collections.abc import Callable
+
+from bs4 import BeautifulSoup
+
+from bot.exts.info.doc import _parsing
+from bot.exts.info.doc._cog import DocItem
+
+# Roughly the number of symbols on the largest pages of the CPython docs, such as `library/stdtypes.html`.
+CLASS_COUNT = 25
+METHODS_PER_CLASS = 12
+REPEATS = 3
+
+BASE_URL = "https://docs.example.com/"
+PAGE_PATH = "library/package.html"
+
+_METHOD_TEMPLATE = """
+<dl class="py method">
+<dt class="sig sig-object py" id="package.Class{class_index}.method{index}">
+<span class="sig-name descname"><span class="pre">method{index}</span></span><span class="sig-paren">(</span>
+<em class="sig-param"><span class="n"><span class="pre">value</span></span></em>,
+<em class="sig-param"><span class="n"><span class="pre">*</span></span>
+<span class="n"><span class="pre">args</span></span></em>
+<span class="sig-paren">)</span>
+<a class="headerlink" href="#package.Class{class_index}.method{index}">¶</a></dt>
+<dd><p>Do the {index}th thing with <em>value</em>, see <a class="reference internal" href="#package.Class{class_index}">
+<code class="xref py py-class docutils literal notranslate"><span class="pre">Class{class_index}</span></code></a>.</p>
+<p>Raise <a class="reference external" href="https://docs.python.org/3/library/exceptions.html#ValueError">
+<code class="xref py py-exc docutils literal notranslate"><span class="pre">ValueError</span></code></a>
+if <em>value</em> is out of range.</p>
+<div class="highlight-python3 notranslate"><div class="highlight"><pre><span></span>&gt;&gt;&gt; obj.method{index}(1)
+</pre></div></div>
+</dd></dl>
+"""
+
+_CLASS_TEMPLATE = """
+<dl class="py class">
+<dt class="sig sig-object py" id="package.Class{class_index}">
+<em class="property"><span class="pre">class</span> </em><span class="sig-prename descclassname">
+<span class="pre">package.</span></span>
+<span class="sig-name descname"><span class="pre">Class{class_index}</span></span>
+<span class="sig-paren">(</span><span class="sig-paren">)</span>
+<a class="headerlink" href="#package.Class{class_index}">¶</a></dt>
+<dd><p>The {class_index}th class of the package.</p>
+{methods}
+</dd></dl>
+"""
+
+_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><title>package — Example</title></head>
+<body><div class="document"><div class="documentwrapper"><div class="body" role="main">
+<section id="module-package">
+<h1><code class="xref py py-mod docutils literal notranslate"><span class="pre">package</span></code> — Example
+<a class="headerlink" href="#module-package">¶</a></h1>
+<p>This module provides the example classes.</p>
+{classes}
+</section>
+</div></div></div>
+<div class="sphinxsidebar" role="navigation"><ul><li><a href="#">Contents</a></li></ul></div>
+</body></html>
+"""
+
+
+def make_page() -> tuple[str, list[DocItem]]:
+    """Return the HTML of a page shaped like Sphinx autodoc output, and the symbols on it."""
+    symbols = [DocItem("package", "module", BASE_URL, PAGE_PATH, "module-package")]
+    classes = []
+    for class_index in range(CLASS_COUNT):
+        symbols.append(DocItem("package", "class", BASE_URL, PAGE_PATH, f"package.Class{class_index}"))
+        methods = []
+        for index in range(METHODS_PER_CLASS):
+            methods.append(_METHOD_TEMPLATE.format(class_index=class_index, index=index))
+            symbols.append(
+                DocItem("package", "method", BASE_URL, PAGE_PATH, f"package.Class{class_index}.method{index}")
+            )
+        classes.append(_CLASS_TEMPLATE.format(class_index=class_index, methods="".join(methods)))
+    return _PAGE_TEMPLATE.format(classes="".join(classes)), symbols
+
+
+def legacy_page_markdown(html: str, symbols: list[DocItem]) -> dict[DocItem, str | None]:
+    """Parse `html` and search the page for each symbol."""
+    soup = BeautifulSoup(html, "lxml")
+    results = {}
+    for symbol_data in symbols:
+        symbol_heading = soup.find(id=symbol_data.symbol_id)
+        if symbol_heading is None:
+            results[symbol_data] = None
+            continue
+        signature, description = _parsing._get_symbol_fragment(symbol_heading, symbol_data)
+        results[symbol_data] = _parsing._create_markdown(signature, description, symbol_data.url).strip()
+    return results
+
+
+def page_markdown(html: str, symbols: list[DocItem]) -> dict[DocItem, str | None]:
+    """Parse `html` in a single pass; the HTML is given on every run, so every run includes parsing the page."""
+    return _parsing.get_page_markdown(symbols[0].url, html, symbols)
+
+
+def best_time(function: Callable[[str, list[DocItem]], dict], html: str, symbols: list[DocItem]) -> float:
+    """Return the best time out of `REPEATS` runs of `function`."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        function(html, symbols)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Compare searching the page for each symbol to segmenting the page in a single pass."""
+    html, symbols = make_page()
+    if legacy_page_markdown(html, symbols) != page_markdown(html, symbols):
+        raise RuntimeError("The parsers disagree on the fixture.")
+
+    print(f"{len(symbols)} symbols, {len(html) / 1024:.0f} KiB page")
+    for name, function in (("per symbol", legacy_page_markdown), ("single pass", page_markdown)):
+        print(f"{name:>11}: {best_time(function, html, symbols) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
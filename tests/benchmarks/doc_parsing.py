@@ -0,0 +1,150 @@
+"""
+Benchmark each stage of fetching documentation on the offline corpus in `tests.benchmarks.doc_corpus`.
+
+The stages are parsing the inventory, parsing a page and finding its symbols, extracting each symbol's signatures
+and description, and converting them to Markdown. Each stage reports its best time and its peak memory.
+The conversion is measured with both the markdownify and the Sphinx specific converter,
+which are checked to produce the same Markdown.
+
+Run with `python -m tests.benchmarks.doc_parsing`.
+"""
+
+import asyncio
+import time
+import tracemalloc
+from collections import defaultdict
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup
+
+from bot.exts.info.doc import _parsing
+from bot.exts.info.doc._cog import DocItem
+from bot.exts.info.doc._html import get_symbol_headings
+from bot.exts.info.doc._inventory_parser import InventoryDict, _parse_inventory
+from bot.exts.info.doc._markdown import DocMarkdownConverter, SphinxMarkdownConverter
+from tests.benchmarks.doc_corpus import CorpusProject, FixtureStream, load_projects
+
+REPEATS = 20
+CONVERTERS = {"markdownify": DocMarkdownConverter, "sphinx": SphinxMarkdownConverter}
+
+
+def measure(run: Callable[[Any], object], setup: Callable[[], Any] = lambda: None) -> tuple[float, int]:
+    """
+    Return the best time out of `REPEATS` calls of `run`, and the peak memory of a call.
+
+    `run` is called with the result of `setup`, which is called before every run and isn't measured.
+    """
+    best = float("inf")
+    for _ in range(REPEATS):
+        argument = setup()
+        start = time.perf_counter()
+        run(argument)
+        best = min(best, time.perf_counter() - start)
+
+    argument = setup()
+    tracemalloc.start()
+    run(argument)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def page_symbols(project: CorpusProject, inventory: InventoryDict) -> dict[str, list[DocItem]]:
+    """Return the symbols on each page of the corpus, created from the inventory like the cog creates them."""
+    symbols = defaultdict(list)
+    for group, group_items in inventory.items():
+        group_name = group.split(":")[1]
+        for _, relative_doc_url in group_items:
+            relative_url_path, _, symbol_id = relative_doc_url.partition("#")
+            if relative_url_path in project.pages:
+                symbols[relative_url_path].append(
+                    DocItem(project.name, group_name, project.base_url, relative_url_path, symbol_id)
+                )
+    return symbols
+
+
+def extract_fragments(html: str, symbols: list[DocItem]) -> list[tuple[DocItem, list[str] | None, list]]:
+    """Return the signatures and description elements of every symbol on a freshly parsed page."""
+    symbol_headings = get_symbol_headings(BeautifulSoup(html, "lxml"))
+    return [(item, *_parsing._get_symbol_fragment(symbol_headings[item.symbol_id], item)) for item in symbols]
+
+
+def convert_fragments(fragments: list[tuple[DocItem, list[str] | None, list]], converter: type) -> list[str]:
+    """Return the Markdown of every extracted symbol, converted with `converter`."""
+    with patch.object(_parsing, "_MARKDOWN_CONVERTER", converter):
+        return [
+            _parsing._create_markdown(signatures, description, item.url) for item, signatures, description in fragments
+        ]
+
+
+def benchmark_page(html: str, symbols: list[DocItem]) -> list[tuple[str, float, int]]:
+    """Return the name, best time and peak memory of the stages which are run for every page."""
+    def parse_page(_: None) -> dict:
+        return get_symbol_headings(BeautifulSoup(html, "lxml"))
+
+    def extract_symbols(symbol_headings: dict) -> list:
+        return [_parsing._get_symbol_fragment(symbol_headings[item.symbol_id], item) for item in symbols]
+
+    markdowns = {
+        name: convert_fragments(extract_fragments(html, symbols), converter) for name, converter in CONVERTERS.items()
+    }
+    if markdowns["sphinx"] != markdowns["markdownify"]:
+        raise RuntimeError("The Markdown converters disagree on the corpus.")
+
+    return [
+        ("page parse", *measure(parse_page)),
+        ("symbol extraction", *measure(extract_symbols, lambda: parse_page(None))),
+        *(
+            (
+                f"{name} conversion",
+                *measure(partial(convert_fragments, converter=converter), partial(extract_fragments, html, symbols)),
+            )
+            for name, converter in CONVERTERS.items()
+        ),
+    ]
+
+
+def benchmark_project(project: CorpusProject, loop: asyncio.AbstractEventLoop) -> list[tuple[str, float, int]]:
+    """Return the name, best time and peak memory of every stage for `project`."""
+    inventory = loop.run_until_complete(_parse_inventory(FixtureStream(project.inventory)))
+    results = [(
+        "inventory parse",
+        *measure(lambda _: loop.run_until_complete(_parse_inventory(FixtureStream(project.inventory)))),
+    )]
+
+    stage_totals = defaultdict(lambda: [0.0, 0])
+    for path, symbols in page_symbols(project, inventory).items():
+        html = project.pages[path]
+        # Entries without an anchor on the page, like whole documents, can't be rendered and are left out.
+        symbol_headings = get_symbol_headings(BeautifulSoup(html, "lxml"))
+        symbols = [item for item in symbols if item.symbol_id in symbol_headings]
+        markdowns = _parsing.get_page_markdown(path, html, symbols)
+        if missing := [item.symbol_id for item in symbols if not markdowns.get(item)]:
+            raise RuntimeError(f"No Markdown was produced for {', '.join(missing)} on {project.name}/{path}.")
+
+        for stage, duration, peak in benchmark_page(html, symbols):
+            stage_totals[stage][0] += duration
+            stage_totals[stage][1] = max(stage_totals[stage][1], peak)
+
+    results.extend((stage, duration, peak) for stage, (duration, peak) in stage_totals.items())
+    return results
+
+
+def main() -> None:
+    """Measure every stage on every project of the corpus."""
+    loop = asyncio.new_event_loop()
+    try:
+        for project in load_projects():
+            page_size = sum(len(html) for html in project.pages.values())
+            print(f"{project.name}: {len(project.pages)} pages, {page_size / 1024:.0f} KiB of HTML")
+            for stage, duration, peak in benchmark_project(project, loop):
+                print(f"  {stage:>22}: {duration * 1000:8.3f} ms, peak {peak / 1024:8.1f} KiB")
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
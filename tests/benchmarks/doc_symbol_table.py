@@ -0,0 +1,159 @@
+"""
+Benchmark the memory held by the doc cog's symbol tables, for a package set shaped like the production one.
+
+The previous tables, made of `DocItem` tuples in dicts and lists, are rebuilt here for comparison.
+The time it takes to replace the symbols of the smallest package in the columnar table is reported too.
+
+Run with `python -m tests.benchmarks.doc_symbol_table`.
+"""
+
+import gc
+import time
+import tracemalloc
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+
+from bot.exts.info.doc._cog import DocItem
+from bot.exts.info.doc._symbol_table import PackageSymbols, SymbolTable, symbol_sort_key
+
+# Approximate inventory sizes of the packages in the production documentation links.
+PACKAGE_SIZES = {
+    "python": 42_000,
+    "pandas": 22_000,
+    "numpy": 14_000,
+    "django": 12_000,
+    "matplotlib": 11_000,
+    "sqlalchemy": 9_000,
+    "discord": 6_500,
+    "aiohttp": 3_500,
+    "pillow": 3_000,
+    "pytest": 2_500,
+    "flask": 1_800,
+    "attrs": 1_200,
+    "jinja2": 1_000,
+    "requests": 800,
+    "arrow": 700,
+    "bs4": 400,
+}
+SYMBOLS_PER_PAGE = 60
+LOOKUPS = 100_000
+
+def make_package(package: str, size: int) -> Iterator[tuple[str, DocItem]]:
+    """Yield the symbols of `package`, named and spread over pages like in Sphinx inventories."""
+    base_url = f"https://{package}.readthedocs.io/en/stable/"
+    for index in range(size):
+        module = f"{package}.module{index // SYMBOLS_PER_PAGE}"
+        page = f"reference/api/{module}.html"
+        if index % 10 == 0:
+            yield f"{module}-label-{index}", DocItem(package, "label", base_url, page, f"label-{index}")
+        else:
+            # The inventory parser gives the name and the id of a symbol as separate strings.
+            symbol, symbol_id = (f"{module}.Class{index // 20}.method_{index}" for _ in range(2))
+            yield symbol, DocItem(package, "method", base_url, page, symbol_id)
+
+
+def build_legacy() -> tuple:
+    """Build the previous tables: a dict of `DocItem`s, the package item lists, page lists and the search keys."""
+    package_items = {package: list(make_package(package, size)) for package, size in PACKAGE_SIZES.items()}
+    doc_symbols = {}
+    page_doc_items = defaultdict(list)
+    for items in package_items.values():
+        for symbol_name, doc_item in items:
+            doc_symbols.setdefault(symbol_name, doc_item)
+            page_doc_items[doc_item.url].append(doc_item)
+    pairs = sorted((name.lower(), name) for name in doc_symbols)
+    search_keys = [key for key, _ in pairs], [name for _, name in pairs]
+    return package_items, doc_symbols, page_doc_items, search_keys
+
+
+def build_columnar() -> tuple:
+    """
+    Build the columnar tables: the package symbols, the symbol table and the pages of each package.
+
+    Like in the cog, the package symbols are stored as the inventories are parsed, and the table is built
+    from the items materialised to resolve conflicts between their names, along with their locations.
+    """
+    package_symbols = {package: PackageSymbols(make_package(package, size)) for package, size in PACKAGE_SIZES.items()}
+    doc_symbols = {}
+    item_locations = {}
+    for symbols in package_symbols.values():
+        for position, (symbol_name, doc_item) in enumerate(symbols):
+            item_locations.setdefault(doc_item, (symbols, position))
+            doc_symbols.setdefault(symbol_name, doc_item)
+    symbol_table = SymbolTable().updated(
+        (), {symbol_name: item_locations[doc_item] for symbol_name, doc_item in doc_symbols.items()}
+    )
+    del doc_symbols, item_locations
+    page_packages = defaultdict(list)
+    for symbols in package_symbols.values():
+        for url in symbols.pages:
+            page_packages[url].append(symbols)
+    return package_symbols, symbol_table, page_packages
+
+
+def measure(builder: Callable[[], tuple]) -> tuple[tuple, int, int]:
+    """
+    Return what `builder` built, the memory it holds and its peak memory.
+
+    Loading the packages is measured too, as the previous tables kept the loaded items alive.
+    """
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    tables = builder()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tables, current - baseline, peak - baseline
+
+
+def lookup_time(doc_symbols: dict | SymbolTable, names: list[str]) -> float:
+    """Return the average time in microseconds it takes to look up a symbol."""
+    start = time.perf_counter()
+    for name in names:
+        doc_symbols.get(name)
+    return (time.perf_counter() - start) / len(names) * 1_000_000
+
+
+def update_time(symbol_table: SymbolTable, package_symbols: dict[str, PackageSymbols]) -> float:
+    """Return the time in milliseconds it takes to replace the symbols of the smallest package with new ones."""
+    package, size = min(PACKAGE_SIZES.items(), key=lambda item: item[1])
+    base_url = f"https://{package}.readthedocs.io/en/stable/"
+    new_symbols = PackageSymbols(
+        (f"{package}.new.{index}", DocItem(package, "function", base_url, "new.html", f"{package}.new.{index}"))
+        for index in range(size)
+    )
+    start = time.perf_counter()
+    symbol_table.updated(
+        package_symbols[package].names,
+        {symbol_name: (new_symbols, position) for position, symbol_name in enumerate(new_symbols.names)},
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    """Compare the memory held by the previous and the columnar symbol tables."""
+    legacy, legacy_held, legacy_peak = measure(build_legacy)
+    columnar, columnar_held, columnar_peak = measure(build_columnar)
+    legacy_symbols, symbol_table = legacy[1], columnar[1]
+    if dict(symbol_table.items()) != legacy_symbols or list(symbol_table.names) != legacy[3][1]:
+        raise RuntimeError("The tables disagree on the symbols.")
+    if sorted(legacy_symbols, key=symbol_sort_key) != legacy[3][1]:
+        raise RuntimeError("The tables disagree on the order of the names.")
+
+    names = list(legacy_symbols)[::max(1, len(legacy_symbols) // LOOKUPS)]
+    print(f"{len(legacy_symbols)} symbols in {len(PACKAGE_SIZES)} packages")
+    for name, held, peak, table in (
+        ("dicts", legacy_held, legacy_peak, legacy_symbols),
+        ("columnar", columnar_held, columnar_peak, symbol_table),
+    ):
+        print(
+            f"{name:>8}: {held / 1024 ** 2:6.1f} MiB held, {peak / 1024 ** 2:6.1f} MiB peak, "
+            f"{lookup_time(table, names):5.2f} µs per lookup"
+        )
+    smallest_package_size = min(PACKAGE_SIZES.values())
+    print(f"Replacing a package of {smallest_package_size} symbols: {update_time(symbol_table, columnar[0]):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark the time and memory it takes to load a large filter list.
+
+Run with `python -m tests.benchmarks.filtering_load`.
+"""
+
+import time
+import tracemalloc
+from unittest.mock import MagicMock
+
+import arrow
+
+from bot.exts.filtering._filter_lists.token import TokensList
+from bot.exts.filtering._filters.token import TokenFilter
+from bot.exts.filtering._settings import Defaults, SettingsInterner, create_settings
+
+FILTER_COUNT = 10_000
+
+LIST_SETTINGS = {
+    "infraction_and_notification": {
+        "infraction_type": "NONE",
+        "infraction_reason": "",
+        "infraction_duration": 0,
+        "infraction_channel": 0,
+        "dm_content": "",
+        "dm_embed": "",
+    },
+    "mentions": {"guild_pings": ["Moderators"], "dm_pings": []},
+    "remove_context": True,
+    "send_alert": True,
+    "bypass_roles": ["Helpers"],
+    "channel_scope": {
+        "disabled_channels": [],
+        "disabled_categories": ["CODE JAM"],
+        "enabled_channels": [],
+        "enabled_categories": [],
+    },
+    "enabled": True,
+    "filter_dm": True,
+}
+
+
+
+def _overrides(entry_name: str, **fields) -> dict:
+    """Return the data of an override to a compound entry, where the fields which aren't overridden are None."""
+    return {entry_name: {field: fields.get(field) for field in LIST_SETTINGS[entry_name]}}
+
+
+# The overrides are distributed roughly like in production: most filters have none, and most of the rest share a few.
+SHARED_OVERRIDES = (
+    _overrides("infraction_and_notification", infraction_type="TIMEOUT", infraction_duration=3600),
+    {"remove_context": False, "send_alert": False},
+    _overrides("channel_scope", enabled_channels=["python-general"]),
+)
+
+
+def _filter_settings(index: int) -> dict:
+    if index % 100 == 0:
+        return _overrides("infraction_and_notification", infraction_reason=f"Reason {index}")
+    if index % 10 == 0:
+        return SHARED_OVERRIDES[index // 10 % len(SHARED_OVERRIDES)]
+    return {}
+
+
+def make_list_data() -> dict:
+    """Return the data of a token list with `FILTER_COUNT` filters."""
+    now = arrow.utcnow().isoformat()
+    return {
+        "id": 1,
+        "name": "token",
+        "list_type": 0,
+        "created_at": now,
+        "updated_at": now,
+        "settings": LIST_SETTINGS,
+        "filters": [
+            {
+                "id": index,
+                "content": rf"token{index}\b",
+                "description": None,
+                "settings": _filter_settings(index),
+                "additional_settings": {},
+                "created_at": now,
+                "updated_at": now,
+            }
+            for index in range(FILTER_COUNT)
+        ],
+    }
+
+
+def _defaults(list_data: dict) -> Defaults:
+    return Defaults(*create_settings(list_data["settings"], keep_empty=True))
+
+
+def _settings_without_interning(list_data: dict) -> list[tuple]:
+    defaults = _defaults(list_data)
+    return [create_settings(filter_data["settings"], defaults=defaults) for filter_data in list_data["filters"]]
+
+
+def _settings_with_interning(list_data: dict) -> list[tuple]:
+    interner = SettingsInterner(_defaults(list_data))
+    return [interner.create_settings(filter_data["settings"]) for filter_data in list_data["filters"]]
+
+
+def _load_without_interning(list_data: dict) -> list[TokenFilter]:
+    """Load every filter with its own settings objects, as was done before interning."""
+    defaults = _defaults(list_data)
+    return [TokenFilter(filter_data, defaults) for filter_data in list_data["filters"]]
+
+
+def _load_with_interning(list_data: dict) -> TokensList:
+    filter_list = TokensList(MagicMock())
+    filter_list.add_list(list_data)
+    return filter_list
+
+
+def _measure(name: str, load: callable, list_data: dict) -> None:
+    start = time.perf_counter()
+    load(list_data)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    loaded = load(list_data)  # noqa: F841 - Keep the result alive for the snapshot.
+    resident, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<30} {elapsed * 1000:>9.1f} ms {resident / 2 ** 20:>9.2f} MiB")
+
+
+def main() -> None:
+    """Load the fixture list with and without interning, and print the time and memory it took."""
+    list_data = make_list_data()
+    print(f"Loading {FILTER_COUNT} token filters.")
+    print(f"{'':<30} {'load time':>12} {'resident':>13}")
+    _measure("settings, without interning", _settings_without_interning, list_data)
+    _measure("settings, with interning", _settings_with_interning, list_data)
+    _measure("filters, without interning", _load_without_interning, list_data)
+    _measure("filters, with interning", _load_with_interning, list_data)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark formatting large snekbox outputs, against the formatter which split the whole output into lines.
+
+Each output is formatted with the default limits, and the best time and the peak memory of each formatter are reported.
+The formatters are checked to return the same result.
+
+Run with `python -m tests.benchmarks.snekbox_output`.
+"""
+
+import asyncio
+import time
+import tracemalloc
+from collections.abc import Callable, Coroutine
+from unittest.mock import MagicMock
+
+from bot.exts.utils.snekbox._cog import ESCAPE_REGEX, MAX_OUTPUT_BLOCK_CHARS, MAX_OUTPUT_BLOCK_LINES, Snekbox
+
+REPEATS = 5
+OUTPUT_SIZE = 10 * 1024 * 1024
+PASTE_LINK = "https://paste.pythondiscord.com/benchmark"
+
+OUTPUTS = {
+    "short lines": "Hello, world!\n" * (OUTPUT_SIZE // 14),
+    "one long line": "x" * OUTPUT_SIZE,
+    "numbered lines with pings": "".join(f"{i} <@{i}>\n" for i in range(OUTPUT_SIZE // 16)),
+    "few lines": "abc\n" * 5 + "\n" * OUTPUT_SIZE,
+}
+
+
+async def upload_output(_output: str) -> str:
+    """Stand in for uploading to the paste service."""
+    return PASTE_LINK
+
+
+async def legacy_format_output(
+    output: str,
+    max_lines: int = MAX_OUTPUT_BLOCK_LINES,
+    max_chars: int = MAX_OUTPUT_BLOCK_CHARS,
+    line_nums: bool = True,
+    output_default: str = "[No output]",
+) -> tuple[str, str | None]:
+    """Format the output the way it was before only the shown lines were split off."""
+    output = output.rstrip("\n")
+    original_output = output
+    paste_link = None
+
+    if "<@" in output:
+        output = output.replace("<@", "<@\u200B")
+
+    if "<!@" in output:
+        output = output.replace("<!@", "<!@\u200B")
+
+    if ESCAPE_REGEX.findall(output):
+        paste_link = await upload_output(original_output)
+        return "Code block escape attempt detected; will not output result", paste_link
+
+    truncated = False
+    lines = output.splitlines()
+
+    if len(lines) > 1:
+        if line_nums:
+            lines = [f"{i:03d} | {line}" for i, line in enumerate(lines, 1)]
+        lines = lines[:max_lines+1]
+        output = "\n".join(lines)
+
+    if len(lines) > max_lines:
+        truncated = True
+        if len(output) >= max_chars:
+            output = f"{output[:max_chars]}\n... (truncated - too long, too many lines)"
+        else:
+            output = f"{output}\n... (truncated - too many lines)"
+    elif len(output) >= max_chars:
+        truncated = True
+        output = f"{output[:max_chars]}\n... (truncated - too long)"
+
+    if truncated:
+        paste_link = await upload_output(original_output)
+
+    if output_default and not output:
+        output = output_default
+
+    return output, paste_link
+
+
+def measure(
+    format_output: Callable[[str], Coroutine[None, None, tuple[str, str | None]]],
+    output: str,
+    loop: asyncio.AbstractEventLoop,
+) -> tuple[float, int, tuple[str, str | None]]:
+    """Return the best time out of `REPEATS` runs of `format_output`, the peak memory of a run, and its result."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = loop.run_until_complete(format_output(output))
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    loop.run_until_complete(format_output(output))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def main() -> None:
+    """Format every output with both formatters."""
+    cog = Snekbox(MagicMock())
+    cog.upload_output = upload_output
+    formatters = {"legacy": legacy_format_output, "lazy": cog.format_output}
+
+    loop = asyncio.new_event_loop()
+    try:
+        for name, output in OUTPUTS.items():
+            print(f"{name}: {len(output) / 1024 / 1024:.0f} MiB")
+            results = []
+            for formatter_name, format_output in formatters.items():
+                duration, peak, result = measure(format_output, output, loop)
+                results.append(result)
+                print(f"  {formatter_name:>6}: {duration * 1000:9.3f} ms, peak {peak / 1024:10.1f} KiB")
+            if results[0] != results[1]:
+                raise RuntimeError(f"The formatters disagree on {name}.")
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
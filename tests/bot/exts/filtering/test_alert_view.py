@@ -0,0 +1,45 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import discord
+
+from bot.exts.filtering._ui.ui import ALERT_CUSTOM_ID_RE, AlertView, handle_alert_interaction
+from tests.helpers import MockBot
+
+
+class AlertViewTests(unittest.IsolatedAsyncioTestCase):
+    """Test the stateless alert buttons."""
+
+    @staticmethod
+    def _interaction(custom_id: str) -> MagicMock:
+        interaction = MagicMock(type=discord.InteractionType.component, data={"custom_id": custom_id})
+        interaction.response = AsyncMock()
+        return interaction
+
+    async def test_buttons_encode_the_user_id(self):
+        """Every button's custom ID should hold the ID of the offending user."""
+        view = AlertView(1234)
+
+        matches = [ALERT_CUSTOM_ID_RE.fullmatch(item.custom_id) for item in view.children]
+
+        self.assertEqual([match.group("action") for match in matches], ["id", "info", "infractions"])
+        self.assertTrue(all(match.group("user_id") == "1234" for match in matches))
+        self.assertTrue(view.is_finished())
+
+    async def test_id_button_replies_with_user_id(self):
+        """Pressing the ID button should reply with the user ID from the custom ID."""
+        interaction = self._interaction(AlertView(1234).children[0].custom_id)
+
+        await handle_alert_interaction(interaction)
+
+        interaction.response.send_message.assert_awaited_once_with(1234, ephemeral=True)
+
+    @patch("bot.instance", MockBot())
+    async def test_other_interactions_are_ignored(self):
+        """Interactions which aren't alert button presses shouldn't be responded to."""
+        interaction = self._interaction("voice_verify_button")
+
+        await handle_alert_interaction(interaction)
+
+        interaction.response.send_message.assert_not_awaited()
+        interaction.response.defer.assert_not_awaited()
@@ -0,0 +1,65 @@
+import unittest
+
+from bot.exts.filtering._filter_context import Event, FilterContext
+from tests.helpers import MockMember, MockMessage, MockTextChannel
+
+
+class FilterContextTests(unittest.TestCase):
+    """Test the behaviour of the filtering context."""
+
+    def setUp(self) -> None:
+        member = MockMember(id=123)
+        channel = MockTextChannel(id=345)
+        message = MockMessage(author=member, channel=channel)
+        self.ctx = FilterContext(Event.MESSAGE, member, channel, "content", message)
+
+    def test_output_not_allocated_until_accessed(self):
+        """The output of a context shouldn't be created before any output field is used."""
+        self.assertIsNone(self.ctx._output)
+        self.assertEqual(self.ctx.matches, [])
+        self.assertIsNotNone(self.ctx._output)
+
+    def test_output_defaults(self):
+        """Each output field should start with its default value."""
+        self.assertEqual(self.ctx.dm_content, "")
+        self.assertFalse(self.ctx.send_alert)
+        self.assertEqual(self.ctx.related_messages, set())
+        self.assertEqual(self.ctx.uploaded_attachments, {})
+        self.assertTrue(self.ctx.upload_deletion_logs)
+
+    def test_replace_changes_only_given_inputs(self):
+        """A replaced context should have the new values, and keep the rest of the inputs."""
+        new_ctx = self.ctx.replace(content={"a", "b"})
+
+        self.assertEqual(new_ctx.content, {"a", "b"})
+        self.assertEqual(self.ctx.content, "content")
+        self.assertIs(new_ctx.author, self.ctx.author)
+        self.assertIs(new_ctx.channel, self.ctx.channel)
+        self.assertIs(new_ctx.message, self.ctx.message)
+        self.assertEqual(new_ctx.event, Event.MESSAGE)
+
+    def test_replace_shares_output(self):
+        """Outputs set on a replaced context should be visible on the original context and vice versa."""
+        new_ctx = self.ctx.replace(content="other")
+        new_ctx.matches.append("match")
+        new_ctx.related_messages |= {"message"}
+        new_ctx.notification_domain = "example.com"
+        self.ctx.send_alert = True
+
+        self.assertEqual(self.ctx.matches, ["match"])
+        self.assertEqual(self.ctx.related_messages, {"message"})
+        self.assertEqual(self.ctx.notification_domain, "example.com")
+        self.assertTrue(new_ctx.send_alert)
+        self.assertIs(new_ctx.replace(content="").output, self.ctx.output)
+
+    def test_new_context_doesnt_share_output(self):
+        """Separately created contexts should have separate outputs."""
+        other_ctx = FilterContext(Event.MESSAGE, self.ctx.author, self.ctx.channel, "content", self.ctx.message)
+        other_ctx.matches.append("match")
+
+        self.assertEqual(self.ctx.matches, [])
+
+    def test_replace_output_field_raises(self):
+        """Output fields are shared, and so can't be replaced."""
+        with self.assertRaises(TypeError):
+            self.ctx.replace(send_alert=True)
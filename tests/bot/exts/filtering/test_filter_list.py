@@ -0,0 +1,131 @@
+import unittest
+from unittest.mock import patch
+
+import arrow
+
+from bot.exts.filtering._filter_context import Event, FilterContext
+from bot.exts.filtering._filter_lists.filter_list import AtomicList, ListType
+from bot.exts.filtering._filters.token import TokenFilter
+from bot.exts.filtering._settings import Defaults, create_settings
+from bot.exts.filtering._verdict_cache import VerdictCache
+from tests.helpers import MockBot, MockMember, MockMessage, MockRole, MockTextChannel
+
+
+class AtomicListTests(unittest.TestCase):
+    """Test functionality of the AtomicList class."""
+
+    def setUp(self) -> None:
+        actions, validations = create_settings({"send_alert": True, "enabled": True}, keep_empty=True)
+        self.defaults = Defaults(actions, validations)
+        self.filters = {
+            1: self._make_filter(1, {"send_alert": False}),
+            2: self._make_filter(2, {}),
+        }
+        now = arrow.utcnow()
+        self.atomic_list = AtomicList(1, now, now, "token", ListType.DENY, self.defaults, self.filters)
+
+    def _make_filter(self, id_: int, settings: dict) -> TokenFilter:
+        now = arrow.utcnow().timestamp()
+        return TokenFilter(
+            {
+                "id": id_,
+                "content": f"token{id_}",
+                "description": None,
+                "settings": settings,
+                "additional_settings": {},
+                "created_at": now,
+                "updated_at": now
+            },
+            self.defaults
+        )
+
+    def test_merge_actions_is_cached_per_set_of_filters(self):
+        """Merging the same filters should return the same object, regardless of their order."""
+        first = self.atomic_list.merge_actions([self.filters[1], self.filters[2]])
+        second = self.atomic_list.merge_actions([self.filters[2], self.filters[1]])
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, self.atomic_list.merge_actions([self.filters[2]]))
+
+    def test_merge_actions_of_edited_filter_isnt_cached(self):
+        """An edited filter is a new object, and so shouldn't get the merged actions of the old one."""
+        before = self.atomic_list.merge_actions([self.filters[1]])
+        self.filters[1] = self._make_filter(1, {})
+        after = self.atomic_list.merge_actions([self.filters[1]])
+
+        self.assertFalse(before["send_alert"].send_alert)
+        self.assertTrue(after["send_alert"].send_alert)
+
+    def test_merge_actions_of_no_filters(self):
+        """No actions should be returned if no filters were triggered."""
+        self.assertIsNone(self.atomic_list.merge_actions([]))
+
+
+@patch("bot.instance", MockBot())
+class VerdictCacheTests(unittest.IsolatedAsyncioTestCase):
+    """Test the caching of verdicts for lists which only look at the content."""
+
+    def setUp(self) -> None:
+        actions, validations = create_settings(
+            {"send_alert": True, "enabled": True, "bypass_roles": []}, keep_empty=True
+        )
+        self.defaults = Defaults(actions, validations)
+        now = arrow.utcnow()
+        self.filters = {id_: self._make_filter(id_, pattern) for id_, pattern in ((1, "spam"), (2, "eggs"))}
+        self.atomic_list = AtomicList(
+            1, now, now, "token", ListType.DENY, self.defaults, self.filters, VerdictCache()
+        )
+
+    def _make_filter(self, id_: int, pattern: str, settings: dict | None = None) -> TokenFilter:
+        now = arrow.utcnow().timestamp()
+        return TokenFilter(
+            {
+                "id": id_,
+                "content": pattern,
+                "description": None,
+                "settings": settings or {},
+                "additional_settings": {},
+                "created_at": now,
+                "updated_at": now
+            },
+            self.defaults
+        )
+
+    @staticmethod
+    def _make_context(content: str) -> FilterContext:
+        member = MockMember()
+        channel = MockTextChannel()
+        return FilterContext(Event.MESSAGE, member, channel, content, MockMessage(author=member, channel=channel))
+
+    async def test_verdict_is_replayed_for_identical_content(self):
+        """Identical content should get the same triggers and matches without running the filters again."""
+        first_ctx = self._make_context("spam spam spam")
+        first = await self.atomic_list.filter_list_result(first_ctx)
+
+        second_ctx = self._make_context("spam spam spam")
+        with patch.object(TokenFilter, "triggered_on") as triggered_on:
+            second = await self.atomic_list.filter_list_result(second_ctx)
+
+        triggered_on.assert_not_called()
+        self.assertEqual(first, [self.filters[1]])
+        self.assertEqual(second, first)
+        self.assertEqual(second_ctx.matches, ["spam"])
+        self.assertEqual(self.atomic_list.verdicts.hits, 1)
+        self.assertEqual(self.atomic_list.verdicts.misses, 1)
+
+    async def test_different_content_isnt_replayed(self):
+        """Different content should be filtered from scratch."""
+        await self.atomic_list.filter_list_result(self._make_context("spam"))
+        result = await self.atomic_list.filter_list_result(self._make_context("eggs"))
+
+        self.assertEqual(result, [self.filters[2]])
+
+    async def test_skipped_filter_runs_once_relevant(self):
+        """A filter skipped due to its validations should run on a later context where it's relevant."""
+        self.filters[3] = self._make_filter(3, "ham", {"bypass_roles": [42]})
+        with_role = self._make_context("ham")
+        with_role.author.roles = [MockRole(id=42)]
+        self.assertEqual(await self.atomic_list.filter_list_result(with_role), [])
+
+        without_role = self._make_context("ham")
+        self.assertEqual(await self.atomic_list.filter_list_result(without_role), [self.filters[3]])
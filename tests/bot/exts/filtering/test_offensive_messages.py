@@ -0,0 +1,82 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import arrow
+import discord
+
+from bot.exts.filtering.filtering import Filtering
+from tests.helpers import MockBot, MockTextChannel
+
+
+class OffensiveMessagesTests(unittest.IsolatedAsyncioTestCase):
+    """Test the deletion and persistence of offensive messages."""
+
+    def setUp(self) -> None:
+        self.bot = MockBot()
+        self.cog = Filtering(self.bot)
+        self.channel = MockTextChannel(id=1)
+        self.channel.get_partial_message.return_value.delete = AsyncMock()
+        self.bot.get_channel.return_value = self.channel
+
+    async def asyncTearDown(self) -> None:
+        self.cog.delete_scheduler.cancel_all()
+
+    async def test_overdue_messages_are_deleted_in_bulk(self):
+        """Recent messages of the same channel should be removed with a single bulk deletion."""
+        recent_id = discord.utils.time_snowflake(arrow.utcnow().shift(days=-8).datetime)
+        msgs = [{"id": recent_id + i, "channel_id": 1} for i in range(3)]
+
+        await self.cog._delete_offensive_msgs(msgs)
+
+        self.channel.delete_messages.assert_awaited_once()
+        deleted_ids = [obj.id for obj in self.channel.delete_messages.await_args.args[0]]
+        self.assertEqual(deleted_ids, [msg["id"] for msg in msgs])
+        self.assertEqual(self.bot.api_client.delete.await_count, 3)
+
+    async def test_old_messages_are_deleted_individually(self):
+        """Messages too old to be bulk deleted should be deleted one by one."""
+        old_id = discord.utils.time_snowflake(arrow.utcnow().shift(days=-20).datetime)
+
+        await self.cog._delete_offensive_msgs([{"id": old_id, "channel_id": 1}, {"id": old_id + 1, "channel_id": 1}])
+
+        self.channel.delete_messages.assert_not_awaited()
+        self.assertEqual(self.channel.get_partial_message.call_count, 2)
+
+    def test_messages_due_together_share_a_purge(self):
+        """Messages due within the same purge interval should be scheduled as a single task."""
+        delete_at = arrow.utcnow().shift(days=7).floor("hour")
+        with patch.object(self.cog.delete_scheduler, "schedule_at") as schedule_at:
+            for minutes in (1, 2, 3):
+                delete_date = delete_at.shift(minutes=minutes).isoformat()
+                self.cog._schedule_msg_delete({"id": minutes, "delete_date": delete_date})
+
+        schedule_at.assert_called_once()
+        schedule_at.call_args.args[2].close()
+        self.assertEqual([len(msgs) for msgs in self.cog._scheduled_purges.values()], [3])
+
+    async def test_buffered_messages_are_posted_on_flush(self):
+        """Buffered offensive messages should be posted and scheduled for deletion when flushed."""
+        self.cog._offensive_msgs_buffer.extend(
+            {"id": i, "channel_id": 1, "delete_date": arrow.utcnow().shift(days=7).isoformat()} for i in range(2)
+        )
+        self.cog._schedule_msg_delete = MagicMock()
+
+        await self.cog._flush_offensive_msgs()
+
+        self.assertEqual(self.bot.api_client.post.await_count, 2)
+        self.assertEqual(self.cog._schedule_msg_delete.call_count, 2)
+        self.assertFalse(self.cog._offensive_msgs_buffer)
+
+    async def test_unload_posts_buffered_messages_without_scheduling(self):
+        """Messages buffered on unload should be posted, but left for the next load to schedule."""
+        self.cog._offensive_msgs_buffer.append(
+            {"id": 1, "channel_id": 1, "delete_date": arrow.utcnow().shift(days=7).isoformat()}
+        )
+        load_task = self.cog._offensive_msgs_load_task = MagicMock()
+
+        await self.cog.cog_unload()
+
+        load_task.cancel.assert_called_once()
+        self.bot.api_client.post.assert_awaited_once()
+        self.assertEqual(self.cog._scheduled_purges, {})
+        self.assertEqual(self.cog.delete_scheduler._scheduled_tasks, {})
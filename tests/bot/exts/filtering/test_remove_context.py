@@ -0,0 +1,81 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from discord.errors import ClientException, HTTPException
+
+from bot.exts.filtering._settings_types.actions.remove_context import ChannelDeletions
+from tests.helpers import MockMessage, MockTextChannel
+
+
+class ChannelDeletionsTests(unittest.IsolatedAsyncioTestCase):
+    """Test the merging of concurrent message deletions."""
+
+    def setUp(self) -> None:
+        self.deletions = ChannelDeletions()
+        self.channel = MockTextChannel()
+
+    async def test_concurrent_deletions_are_merged(self):
+        """Deletions requested while another one is running should be sent together."""
+        messages = [{MockMessage(id=i)} for i in range(4)]
+
+        results = await asyncio.gather(*(self.deletions.delete(self.channel, batch) for batch in messages))
+
+        self.assertEqual(results, [True] * 4)
+        # All requests are queued before the first deletion starts.
+        self.channel.delete_messages.assert_awaited_once()
+        self.assertCountEqual(self.channel.delete_messages.await_args.args[0], set().union(*messages))
+
+    async def test_large_deletions_are_chunked(self):
+        """No single bulk delete should contain more than 100 messages."""
+        messages = {MockMessage(id=i) for i in range(150)}
+
+        result = await self.deletions.delete(self.channel, messages)
+
+        self.assertTrue(result)
+        self.assertEqual([len(call.args[0]) for call in self.channel.delete_messages.await_args_list], [100, 50])
+
+    async def test_failed_merged_deletion_falls_back_to_each_request(self):
+        """If a merged deletion fails, only the requests which fail on their own should be reported as failed."""
+        bad_message = MockMessage(id=1)
+        good_message = MockMessage(id=2)
+
+        async def delete_messages(messages: list) -> None:
+            if bad_message in messages:
+                raise HTTPException(MagicMock(status=404), "Unknown Message")
+        self.channel.delete_messages = AsyncMock(side_effect=delete_messages)
+
+        results = await asyncio.gather(
+            self.deletions.delete(self.channel, {bad_message}), self.deletions.delete(self.channel, {good_message})
+        )
+
+        self.assertEqual(results, [False, True])
+
+    async def test_fallback_only_resends_failed_chunks(self):
+        """The fallback should only resend the messages which weren't deleted, in chunks of at most 100."""
+        bad_message = MockMessage(id=1000)
+        good_messages = {MockMessage(id=i) for i in range(250)}
+        deleted = []
+
+        async def delete_messages(messages: list) -> None:
+            if len(messages) > 100:
+                raise ClientException("Can only bulk delete messages up to 100 messages")
+            if bad_message in messages:
+                raise HTTPException(MagicMock(status=404), "Unknown Message")
+            deleted.extend(messages)
+        self.channel.delete_messages = AsyncMock(side_effect=delete_messages)
+
+        results = await asyncio.gather(
+            self.deletions.delete(self.channel, good_messages), self.deletions.delete(self.channel, {bad_message})
+        )
+
+        self.assertEqual(results, [True, False])
+        self.assertCountEqual(deleted, good_messages)
+
+    async def test_client_errors_fail_the_request(self):
+        """A `ClientException` from the bulk delete should fail the request instead of leaving it waiting."""
+        self.channel.delete_messages = AsyncMock(side_effect=ClientException("Can only delete messages up to 14 days"))
+
+        result = await asyncio.wait_for(self.deletions.delete(self.channel, {MockMessage(id=1)}), timeout=1)
+
+        self.assertFalse(result)
@@ -1,7 +1,7 @@
 import unittest
 
 import bot.exts.filtering._settings
-from bot.exts.filtering._settings import create_settings
+from bot.exts.filtering._settings import SettingsInterner, create_settings
 
 
 class FilterTests(unittest.TestCase):
@@ -18,3 +18,23 @@ class FilterTests(unittest.TestCase):
         create_settings({"abcd": {}})
 
         self.assertIn("abcd", bot.exts.filtering._settings._already_warned)
+
+    def test_interner_shares_settings_for_identical_data(self):
+        """Settings created through an interner from equal data should be the same objects."""
+        interner = SettingsInterner()
+        first = interner.create_settings({"send_alert": False, "enabled": True})
+        second = interner.create_settings({"enabled": True, "send_alert": False})
+
+        self.assertIs(first[0], second[0])
+        self.assertIs(first[1], second[1])
+        self.assertIsNotNone(first[0])
+
+    def test_interner_creates_separate_settings_for_different_data(self):
+        """Settings created through an interner from different data should be different."""
+        interner = SettingsInterner()
+        first, _ = interner.create_settings({"send_alert": False})
+        second, _ = interner.create_settings({"send_alert": True})
+
+        self.assertIsNot(first, second)
+        self.assertFalse(first["send_alert"].send_alert)
+        self.assertTrue(second["send_alert"].send_alert)
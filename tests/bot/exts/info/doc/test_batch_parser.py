@@ -0,0 +1,178 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bot.exts.info.doc import _batch_parser
+from bot.exts.info.doc._batch_parser import BatchParser, PageStore, ParseQueue
+from bot.exts.info.doc._cog import DocItem
+from bot.exts.info.doc._symbol_table import PackageSymbols
+from tests.helpers import MockBot
+
+PAGE = """
+<dl>
+<dt id="module.first">first()</dt><dd><p>The first function.</p></dd>
+<dt id="module.second">second()</dt><dd><p>The second function.</p></dd>
+</dl>
+"""
+
+
+def _doc_item(symbol_id: str, page: str = "page.html") -> DocItem:
+    return DocItem("package", "function", "https://example.com/", page, symbol_id)
+
+
+class ParseQueueTests(unittest.TestCase):
+    """Tests for the priority queue of items waiting to be parsed."""
+
+    def setUp(self) -> None:
+        self.queue = ParseQueue()
+        self.items = [_doc_item(str(index)) for index in range(5)]
+        for item in self.items:
+            self.queue.push(item)
+
+    def test_items_are_popped_in_order(self):
+        """Items should be popped in the order they were pushed in."""
+        self.assertEqual([self.queue.pop() for _ in range(len(self.queue))], self.items)
+
+    def test_moved_items_are_popped_first(self):
+        """Items moved to the front should be popped first, starting with the most recently moved item."""
+        self.queue.move_to_front(self.items[2])
+        self.queue.move_to_front(self.items[4])
+
+        self.assertEqual(self.queue.peek(), self.items[4])
+        self.assertEqual(
+            [self.queue.pop() for _ in range(len(self.queue))],
+            [self.items[4], self.items[2], self.items[0], self.items[1], self.items[3]]
+        )
+        self.assertFalse(self.queue)
+
+    def test_low_priority_items_are_popped_last(self):
+        """Low priority items should only be popped after all other items, unless they're moved to the front."""
+        low_priority = [_doc_item("low"), _doc_item("moved")]
+        for item in low_priority:
+            self.queue.push(item, low_priority=True)
+        self.queue.push(extra := _doc_item("extra"))
+        self.queue.move_to_front(low_priority[1])
+
+        self.assertEqual(
+            [self.queue.pop() for _ in range(len(self.queue))],
+            [low_priority[1], *self.items, extra, low_priority[0]]
+        )
+
+    def test_queued_items_are_not_pushed_again(self):
+        """Pushing an item that's already queued shouldn't add it to the queue again."""
+        self.assertFalse(self.queue.push(self.items[0]))
+
+        self.assertEqual(len(self.queue), len(self.items))
+        self.assertEqual(self.queue.pop(), self.items[0])
+
+
+class PageStoreTests(unittest.TestCase):
+    """Tests for holding the HTML of pages with queued items."""
+
+    def setUp(self) -> None:
+        patcher = patch("bot.instance", MockBot())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.page = "x" * 1000
+        self.store = PageStore(max_size=2500)
+        for url in ("a", "b"):
+            self.store.put(url, self.page, queued_count=1)
+
+    def test_least_recently_used_pages_are_evicted(self):
+        """Pages past the size limit should be evicted, starting with the least recently used one."""
+        self.store.get("a")
+        self.store.put("c", self.page, queued_count=1)
+
+        self.assertEqual(len(self.store), 2)
+        self.assertIsNone(self.store.get("b"))
+        self.assertEqual(self.store.get("a"), self.page)
+        self.assertLessEqual(self.store.size, self.store.max_size)
+
+    def test_pages_are_dropped_when_no_items_are_queued(self):
+        """A page should be dropped once all of its items were released, and not be held again afterwards."""
+        self.store.release("a", 1)
+        self.store.put("a", self.page)
+
+        self.assertIsNone(self.store.get("a"))
+        self.assertEqual(len(self.store), 1)
+
+    def test_pages_without_queued_items_are_not_counted(self):
+        """Putting a page without any queued items shouldn't hold it or count it as queued."""
+        self.store.put("c", self.page)
+
+        self.assertFalse(self.store.is_queued("c"))
+        self.assertNotIn("c", self.store._queued_counts)
+        self.assertIsNone(self.store.get("c"))
+
+
+@patch("bot.instance", MockBot())
+class BatchParserTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for fetching and parsing the symbols of a page."""
+
+    async def test_all_symbols_on_the_page_are_parsed(self):
+        """Requesting a symbol should parse all symbols on its page, and cache them together."""
+        first, second = _doc_item("module.first"), _doc_item("module.second")
+        response = MagicMock(text=AsyncMock(return_value=PAGE))
+        _batch_parser.bot.instance.http_session.get.return_value.__aenter__.return_value = response
+        _batch_parser.bot.instance.loop = asyncio.get_running_loop()
+        parser = BatchParser()
+        parser.set_items([PackageSymbols([("first", first), ("second", second)])])
+
+        with (
+            # Parse in the default executor, there's no need to start processes for the test.
+            patch.object(_batch_parser.ParseProcess, "_get_executor", return_value=None),
+            patch.object(_batch_parser, "doc_cache") as doc_cache,
+        ):
+            doc_cache.set_many = AsyncMock()
+            markdown = await parser.get_markdown(second)
+            if parser._parse_task is not None:
+                await parser._parse_task
+
+        self.assertIn("The second function.", markdown)
+        doc_cache.set_many.assert_awaited_once()
+        self.assertEqual(doc_cache.set_many.call_args.args[0].keys(), {first, second})
+
+    async def test_pages_are_sent_once_to_each_process(self):
+        """The HTML of a page should only be sent to a parsing process for the first batch it parses from the page."""
+        items = [_doc_item(f"module.symbol{index}") for index in range(_batch_parser.PARSE_BATCH_SIZE * 4)]
+        response = MagicMock(text=AsyncMock(return_value=PAGE))
+        _batch_parser.bot.instance.http_session.get.return_value.__aenter__.return_value = response
+        _batch_parser.bot.instance.loop = asyncio.get_running_loop()
+        parser = BatchParser()
+        parser.set_items([PackageSymbols([(item.symbol_id, item) for item in items])])
+
+        with (
+            patch.object(_batch_parser.ParseProcess, "_get_executor", return_value=None),
+            patch.object(_batch_parser, "get_page_markdown", wraps=_batch_parser.get_page_markdown) as parse,
+            patch.object(_batch_parser, "doc_cache") as doc_cache,
+        ):
+            doc_cache.set_many = AsyncMock()
+            await parser.get_markdown(items[0])
+            if parser._parse_task is not None:
+                await parser._parse_task
+
+        self.assertEqual(parse.call_count, 4)
+        sent_pages = [call.args[1] for call in parse.call_args_list if call.args[1] is not None]
+        self.assertLessEqual(len(sent_pages), _batch_parser.PARSE_PROCESSES)
+
+    async def test_items_removed_while_fetching_their_page_get_no_result(self):
+        """An item removed from its page while the page was fetched should resolve to None."""
+        first, second = _doc_item("module.first"), _doc_item("module.second")
+        parser = BatchParser()
+        parser.set_items([PackageSymbols([("first", first), ("second", second)])])
+
+        async def fetch_page(_url: str) -> str:
+            parser.set_items([PackageSymbols([("first", first)])])
+            return PAGE
+
+        with (
+            patch.object(parser, "_fetch_page", side_effect=fetch_page),
+            patch.object(parser, "_parse_queue", AsyncMock()),
+        ):
+            markdown = await asyncio.wait_for(parser.get_markdown(second), timeout=1)
+
+        self.assertIsNone(markdown)
+        self.assertNotIn(second, parser._item_futures)
+        # The items still on the page are parsed as usual.
+        self.assertIn(first, parser._queue)
+        self.assertIsNotNone(parser._parse_task)
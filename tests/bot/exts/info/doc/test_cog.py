@@ -0,0 +1,91 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bot.exts.info.doc import NAMESPACE
+from bot.exts.info.doc._cog import COMMAND_LOCK_SINGLETON, DocCog
+from bot.utils.lock import lock
+from tests.helpers import MockBot
+
+
+def _inventory(*symbols: str, group: str = "py:function") -> dict:
+    return {group: [(symbol, f"{symbol}.html#{symbol}") for symbol in symbols]}
+
+
+class SymbolTableTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for building and swapping the symbol tables of the doc cog."""
+
+    async def asyncSetUp(self) -> None:
+        patcher = patch("bot.instance", MockBot())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cog = DocCog(MockBot())
+
+    def _load(self, cog: DocCog, inventories: dict[str, dict]) -> None:
+        cog.set_packages({
+            name: cog.load_package(name, f"https://{name}.example.com/", inventory)
+            for name, inventory in inventories.items()
+        })
+
+    async def test_unchanged_packages_are_reused(self):
+        """Loading an unchanged inventory should return the already loaded package."""
+        self._load(self.cog, {"python": _inventory("print")})
+        package = self.cog.packages["python"]
+
+        self.assertIs(self.cog.load_package("python", "https://python.example.com/", _inventory("print")), package)
+
+    async def test_incremental_update_matches_full_build(self):
+        """Updating a single package should result in the same tables as building all packages from scratch."""
+        inventories = {
+            "python": _inventory("print", "open"),
+            "aiohttp": _inventory("request", "open"),
+            "discord": _inventory("Client", "request"),
+        }
+        self._load(self.cog, inventories)
+        old_symbols = self.cog.doc_symbols
+
+        inventories["aiohttp"] = _inventory("request", "ClientSession")
+        self._load(self.cog, inventories)
+        full_build = DocCog(MockBot())
+        self._load(full_build, inventories)
+
+        self.assertEqual(self.cog.doc_symbols, full_build.doc_symbols)
+        self.assertEqual(self.cog.renamed_symbols, full_build.renamed_symbols)
+        self.assertNotIn("aiohttp.open", self.cog.doc_symbols)
+        # The previous table is replaced rather than modified, so lookups in progress aren't affected.
+        self.assertIn("aiohttp.open", old_symbols)
+
+    async def test_slash_command_handles_symbols_removed_after_the_check(self):
+        """A symbol removed while its embed is created should get the not found embed instead of an empty message."""
+        self._load(self.cog, {"python": _inventory("print")})
+        self.cog.create_symbol_embed = AsyncMock(return_value=None)
+        interaction = MagicMock(response=MagicMock(defer=AsyncMock()), followup=MagicMock(send=AsyncMock()))
+        interaction.original_response = AsyncMock()
+
+        with patch("bot.exts.info.doc._cog.wait_for_deletion", AsyncMock()):
+            await self.cog.docs_slash_command.callback(self.cog, interaction, "print")
+
+        embed = interaction.followup.send.call_args.kwargs["embed"]
+        self.assertIsNotNone(embed)
+        self.assertTrue(embed.description.startswith("No documentation found"))
+
+    async def test_refresh_on_load_waits_for_inventory_commands(self):
+        """The refresh started on load should only run once a running inventory command releases its lock."""
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        @lock(NAMESPACE, COMMAND_LOCK_SINGLETON, raise_error=True)
+        async def command() -> None:
+            started.set()
+            await release.wait()
+
+        self.cog.refresh_inventories = AsyncMock()
+        command_task = asyncio.create_task(command())
+        await started.wait()
+        refresh_task = asyncio.create_task(self.cog._refresh_on_load())
+        await asyncio.sleep(0)
+
+        self.cog.refresh_inventories.assert_not_awaited()
+        release.set()
+        await asyncio.gather(command_task, refresh_task)
+        self.cog.refresh_inventories.assert_awaited_once()
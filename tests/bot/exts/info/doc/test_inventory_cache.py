@@ -0,0 +1,62 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from bot.exts.info.doc import _inventory_parser
+from bot.exts.info.doc._inventory_cache import CachedInventory, InventoryCache
+
+
+class InventoryCacheTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for the disk cache of inventories and its revalidation."""
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache = InventoryCache(Path(temp_dir.name))
+        self.url = "https://docs.example.com/objects.inv"
+        self.cached = CachedInventory(
+            {"py:class": [("Foo", "foo.html#Foo")]}, '"etag"', "Mon, 01 Jan 2024 00:00:00 GMT"
+        )
+
+    def test_inventory_round_trips_through_disk(self):
+        """A written inventory should be read back with its validators."""
+        self.cache._write(self.url, self.cached)
+
+        self.assertEqual(self.cache._read(self.url), self.cached)
+        self.assertIsNone(self.cache._read("https://docs.example.com/other.inv"))
+
+    def test_write_failures_are_warned_about_once(self):
+        """An unwritable directory should only be warned about on the first failed write."""
+        blocking_file = self.cache.directory / "file"
+        blocking_file.touch()
+        cache = InventoryCache(blocking_file / "inventories")
+
+        with self.assertLogs("bot.exts.info.doc._inventory_cache", level="DEBUG") as logs:
+            cache._write(self.url, self.cached)
+            cache._write("https://docs.example.com/other.inv", self.cached)
+
+        self.assertEqual([record.levelname for record in logs.records], ["WARNING", "DEBUG"])
+
+    @staticmethod
+    def _session_returning(status: int) -> MagicMock:
+        response = MagicMock(status=status)
+        session = MagicMock()
+        session.get.return_value.__aenter__.return_value = response
+        return session
+
+    async def test_unchanged_inventory_is_not_parsed(self):
+        """A 304 response should return the cached inventory without parsing anything."""
+        session = self._session_returning(304)
+
+        with (
+            patch("bot.instance", MagicMock(http_session=session)),
+            patch.object(_inventory_parser, "_parse_inventory") as parse_inventory,
+        ):
+            result = await _inventory_parser._fetch_inventory(self.url, self.cached)
+
+        self.assertIs(result, self.cached)
+        parse_inventory.assert_not_called()
+        headers = session.get.call_args.kwargs["headers"]
+        self.assertEqual(headers["If-None-Match"], self.cached.etag)
+        self.assertEqual(headers["If-Modified-Since"], self.cached.last_modified)
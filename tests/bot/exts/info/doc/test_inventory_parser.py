@@ -0,0 +1,97 @@
+import asyncio
+import unittest
+import zlib
+from collections import Counter, defaultdict
+from functools import partial
+from unittest.mock import AsyncMock, patch
+
+import aiohttp
+
+from bot.exts.info.doc import _inventory_parser
+from bot.exts.info.doc._inventory_cache import CachedInventory
+from bot.exts.info.doc._inventory_parser import ZlibStreamReader, _load_v2, fetch_inventory
+
+INVENTORY_LINES = (
+    "asyncio py:module 0 library/asyncio.html#module-$ -",
+    "asyncio.run py:function 1 library/asyncio-runner.html#$ -",
+    "event loop std:term -1 glossary.html#term-event-loop Event loop",
+    "ünïcode py:data 1 library/unicode.html#$ Ünïcode",
+)
+
+
+class FakeStream:
+    """Serves the given data in chunks, like `aiohttp.StreamReader.iter_chunked`."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def iter_chunked(self, size: int):
+        for start in range(0, len(self.data), size):
+            yield self.data[start:start + size]
+
+
+class InventoryParserTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for parsing version 2 inventories."""
+
+    async def test_symbols_are_parsed_regardless_of_chunk_boundaries(self):
+        """Lines split across chunks should be parsed the same as whole ones."""
+        data = zlib.compress(("\n".join(INVENTORY_LINES) + "\n").encode())
+        expected = {
+            "py:module": [("asyncio", "library/asyncio.html#module-asyncio")],
+            "py:function": [("asyncio.run", "library/asyncio-runner.html#asyncio.run")],
+            "std:term": [("event loop", "glossary.html#term-event-loop")],
+            "py:data": [("ünïcode", "library/unicode.html#ünïcode")],
+        }
+
+        for read_size, decompressed_size in ((1, 1), (7, 16), (16 * 1024, 64 * 1024)):
+            with (
+                self.subTest(read_size=read_size, decompressed_size=decompressed_size),
+                patch.object(ZlibStreamReader, "READ_CHUNK_SIZE", read_size),
+                patch.object(ZlibStreamReader, "MAX_DECOMPRESSED_CHUNK_SIZE", decompressed_size),
+            ):
+                self.assertEqual(await _load_v2(FakeStream(data)), expected)
+
+
+class FetchInventoryTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for fetching inventories from their hosts."""
+
+    def setUp(self):
+        semaphores = defaultdict(partial(asyncio.Semaphore, _inventory_parser.MAX_HOST_CONCURRENCY))
+        patcher = patch.object(_inventory_parser, "_host_semaphores", semaphores)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_requests_to_a_host_are_limited(self):
+        """No more than `MAX_HOST_CONCURRENCY` inventories should be fetched from a single host at once."""
+        running = Counter()
+        most_running = Counter()
+
+        async def fetch(url: str, _cached: CachedInventory | None) -> CachedInventory:
+            host = url.split("/")[2]
+            running[host] += 1
+            most_running[host] = max(most_running[host], running[host])
+            await asyncio.sleep(0)
+            running[host] -= 1
+            return CachedInventory({})
+
+        urls = [f"https://{host}/{package}/objects.inv" for host in ("a.org", "b.org") for package in range(6)]
+        with patch.object(_inventory_parser, "_fetch_inventory", fetch):
+            await asyncio.gather(*(fetch_inventory(url) for url in urls))
+
+        self.assertEqual(most_running, {"a.org": 2, "b.org": 2})
+
+    async def test_retries_are_backed_off_with_jitter(self):
+        """Each retry should wait between half and all of an exponentially growing delay."""
+        fetch = AsyncMock(side_effect=aiohttp.ClientError)
+        with (
+            patch.object(_inventory_parser, "_fetch_inventory", fetch),
+            patch.object(_inventory_parser.asyncio, "sleep", AsyncMock()) as sleep,
+        ):
+            self.assertIsNone(await fetch_inventory("https://a.org/objects.inv"))
+
+        self.assertEqual(fetch.await_count, _inventory_parser.FAILED_REQUEST_ATTEMPTS)
+        delays = [call.args[0] for call in sleep.await_args_list]
+        self.assertEqual(len(delays), _inventory_parser.FAILED_REQUEST_ATTEMPTS - 1)
+        for retry, delay in enumerate(delays, start=1):
+            full_delay = _inventory_parser.RETRY_BASE_DELAY * 2 ** (retry - 1)
+            self.assertTrue(full_delay / 2 <= delay <= full_delay, delay)
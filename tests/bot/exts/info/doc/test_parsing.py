@@ -1,7 +1,8 @@
 from unittest import TestCase
 
 from bot.exts.info.doc import _parsing as parsing
-from bot.exts.info.doc._markdown import DocMarkdownConverter
+from bot.exts.info.doc._cog import DocItem
+from bot.exts.info.doc._markdown import DocMarkdownConverter, SphinxMarkdownConverter
 
 
 class SignatureSplitter(TestCase):
@@ -82,8 +83,85 @@ class MarkdownConverterTest(TestCase):
         )
         self._run_tests(test_cases)
 
-    def _run_tests(self, test_cases: tuple[tuple[str, str], ...]):
-        for input_string, expected_output in test_cases:
+    def test_sphinx_converter_matches_markdownify(self):
+        test_cases = (
+            "<p>Some <em>emphasis</em>, <strong>bold</strong>, <code>a_b*c</code> and <kbd>Ctrl</kbd>.</p>",
+            '<p>A <a href="page.html#anchor">relative link</a> and <a href="https://example.com/">'
+            'https://example.com/</a></p>',
+            "<ul><li><p>First</p></li>\n<li>Second<ul><li>Nested</li></ul></li></ul><p>After</p>",
+            "<ol>\n<li>One</li>\n<li>Two</li>\n</ol>",
+            '<div class="highlight"><pre><span>&gt;&gt;&gt; </span>x  =  1\n<span>x_y</span>\n</pre></div>',
+            "<h2>Heading <em>inline</em></h2><h7>Deep</h7><blockquote>Quoted\ntext</blockquote><br/>",
+            "<table><thead><tr><th>Name</th><th>Value</th></tr></thead>"
+            "<tbody><tr><td>a_b</td><td>1</td></tr></tbody></table>",
+            '<dl><dt id="x">x<span class="sig-paren">(</span>)</dt><dd><p>Text with *stars* '
+            "and <sub>sub</sub> <del> gone </del></p><!-- comment --></dd></dl>",
+            '<p><img alt="alt" src="image.png" title="a &quot;title&quot;"/></p><img alt="alt" src="image.png"/>',
+        )
+        for input_string in test_cases:
             with self.subTest(input_string=input_string):
-                d = DocMarkdownConverter(page_url="https://example.com")
-                self.assertEqual(d.convert(input_string), expected_output)
+                self.assertEqual(
+                    SphinxMarkdownConverter(page_url="https://example.com/docs/").convert(input_string),
+                    DocMarkdownConverter(page_url="https://example.com/docs/").convert(input_string),
+                )
+
+    def _run_tests(self, test_cases: tuple[tuple[str, str], ...]):
+        for converter in (DocMarkdownConverter, SphinxMarkdownConverter):
+            for input_string, expected_output in test_cases:
+                with self.subTest(converter=converter.__name__, input_string=input_string):
+                    d = converter(page_url="https://example.com")
+                    self.assertEqual(d.convert(input_string), expected_output)
+
+
+class PageMarkdownTest(TestCase):
+    def test_symbols_are_parsed_from_the_page(self):
+        page = """
+        <dl>
+        <dt id="first">first()</dt><dd><p>The first function.</p></dd>
+        <dt id="second">second()</dt><dd><p>The second function.</p></dd>
+        <dt id="first">first()</dt><dd><p>A duplicate id.</p></dd>
+        </dl>
+        """
+        first, second, missing = (
+            DocItem("package", "function", "https://example.com/", "page.html", symbol_id)
+            for symbol_id in ("first", "second", "missing")
+        )
+
+        self.assertEqual(
+            parsing.get_page_markdown(first.url, page, [first, second, missing]),
+            {
+                first: "```py\nfirst()```\nThe first function.",
+                second: "```py\nsecond()```\nThe second function.",
+                missing: None,
+            }
+        )
+
+    def test_labels_stop_at_the_next_section(self):
+        page = """
+        <section id="outer"><h1>Outer<a class="headerlink" href="#outer">¶</a></h1>
+        <p>The outer section.</p>
+        <section id="inner"><h2>Inner<a class="headerlink" href="#inner">¶</a></h2>
+        <p>The inner section.</p>
+        </section>
+        </section>
+        """
+        outer, inner = (
+            DocItem("package", "label", "https://example.com/", "page.html", symbol_id)
+            for symbol_id in ("outer", "inner")
+        )
+
+        self.assertEqual(
+            parsing.get_page_markdown(outer.url, page, [outer, inner]),
+            {outer: "The outer section.", inner: "The inner section."}
+        )
+
+    def test_parsed_pages_are_kept_by_url(self):
+        page = '<dl><dt id="first">first()</dt><dd><p>The first function.</p></dd></dl>'
+        first = DocItem("package", "function", "https://example.com/", "kept.html", "first")
+        parsing.get_page_markdown(first.url, page, [])
+
+        self.assertEqual(
+            parsing.get_page_markdown(first.url, None, [first]),
+            {first: "```py\nfirst()```\nThe first function."}
+        )
+        self.assertIsNone(parsing.get_page_markdown("https://example.com/other.html", None, [first]))
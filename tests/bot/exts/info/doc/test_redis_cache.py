@@ -0,0 +1,100 @@
+from unittest.mock import patch
+
+from bot.exts.info.doc._cog import DocItem
+from bot.exts.info.doc._redis_cache import DocRedisCache, SymbolPopularityCounter, WEEK_SECONDS
+from tests.base import RedisTestCase
+from tests.helpers import MockBot
+
+
+def _doc_item(symbol_id: str, page: str = "library/page.html") -> DocItem:
+    return DocItem("package", "function", "https://example.com/", page, symbol_id)
+
+
+class DocRedisCacheTests(RedisTestCase):
+    """Tests for storing the Markdown of symbols in redis."""
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        patcher = patch("bot.instance", MockBot())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = DocRedisCache(namespace="doc")
+
+    async def test_symbols_are_written_with_an_expiry_per_page(self):
+        """All symbols should be stored under the key of their page, which expires in a week."""
+        first, second, other_page = _doc_item("first"), _doc_item("second"), _doc_item("other", "library/other.html")
+
+        await self.cache.set_many({first: "1", second: "2", other_page: "3"})
+
+        # The test session doesn't decode responses.
+        self.assertEqual(await self.cache.get(first), b"1")
+        self.assertEqual(await self.cache.get(second), b"2")
+        self.assertEqual(await self.cache.get(other_page), b"3")
+        for key in ("doc:package:library/page", "doc:package:library/other"):
+            self.assertGreater(await self.session.client.ttl(key), WEEK_SECONDS - 5)
+
+    async def test_existing_expiry_is_kept(self):
+        """Writing to a page that's already stored shouldn't extend its expiry."""
+        await self.session.client.hset("doc:package:library/page", "first", "1")
+        await self.session.client.expire("doc:package:library/page", 100)
+
+        await self.cache.set_many({_doc_item("second"): "2"})
+        await self.cache.set(_doc_item("third"), "3")
+
+        self.assertLessEqual(await self.session.client.ttl("doc:package:library/page"), 100)
+        self.assertEqual(await self.cache.get(_doc_item("third")), b"3")
+
+    async def test_repeated_lookups_are_served_from_memory(self):
+        """Symbols that were looked up before should be returned without going through redis."""
+        item = _doc_item("first")
+        await self.cache.set(item, "1")
+
+        await self.cache.get(item)
+        await self.session.client.delete("doc:package:library/page")
+
+        self.assertEqual(await self.cache.get(item), b"1")
+        self.assertEqual(self.cache.local_hit_rate, 0.5)
+
+    async def test_memory_is_invalidated_with_the_package(self):
+        """Symbols held in memory should be forgotten when their package is invalidated or deleted."""
+        first, second = _doc_item("first"), _doc_item("second")
+        await self.cache.set_many({first: "1", second: "2"})
+        await self.cache.get(first)
+        await self.cache.get(second)
+
+        await self.session.client.hset("doc:package:library/page", mapping={"first": "new", "second": "new"})
+        self.cache.invalidate_local(["package"])
+        self.assertEqual(await self.cache.get(first), b"new")
+
+        await self.cache.delete("package")
+        self.assertIsNone(await self.cache.get(first))
+        self.assertIsNone(await self.cache.get(second))
+
+
+class SymbolPopularityCounterTests(RedisTestCase):
+    """Tests for counting symbol requests."""
+
+    async def test_most_popular_symbols_are_kept(self):
+        """The most requested symbols should be returned first, and be the ones kept when trimming."""
+        counter = SymbolPopularityCounter(namespace="doc_popularity")
+        for symbol_name, count in (("first", 1), ("second", 3), ("third", 2)):
+            for _ in range(count):
+                await counter.increment_for(symbol_name)
+
+        await counter.trim(2)
+
+        # The test session doesn't decode responses.
+        self.assertEqual(await counter.most_popular(5), [(b"second", 1.5), (b"third", 1.0)])
+
+    async def test_counts_decay_on_trim(self):
+        """Symbols which stopped being requested should be overtaken by newly requested ones after trimming."""
+        counter = SymbolPopularityCounter(namespace="doc_popularity")
+        for _ in range(4):
+            await counter.increment_for("old")
+        await counter.trim(2)
+        await counter.trim(2)
+
+        for _ in range(2):
+            await counter.increment_for("new")
+
+        self.assertEqual(await counter.most_popular(1), [(b"new", 2.0)])
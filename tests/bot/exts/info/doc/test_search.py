@@ -0,0 +1,33 @@
+import unittest
+
+from bot.exts.info.doc._search import SymbolIndex
+from bot.exts.info.doc._symbol_table import symbol_sort_key
+
+
+class SymbolIndexTests(unittest.TestCase):
+    """Tests for the search index over symbol names."""
+
+    def setUp(self) -> None:
+        names = ["str", "str.join", "str.startswith", "asyncio.gather", "list.append", "String"]
+        self.index = SymbolIndex(sorted(names, key=symbol_sort_key))
+
+    def test_completions_are_case_insensitive_and_shortest_first(self):
+        """Prefix matches should ignore case, and the closest completions should come first."""
+        self.assertEqual(self.index.complete("STR", 3), ["str", "String", "str.join"])
+
+    def test_misspelled_symbols_get_suggestions(self):
+        """A misspelled name should be suggested the symbol it's closest to."""
+        self.assertEqual(self.index.suggest("asyncio.gahter", 1), ["asyncio.gather"])
+        self.assertEqual(self.index.suggest("completely unrelated", 1), [])
+
+    def test_suggestions_are_case_insensitive(self):
+        """Suggestions should ignore case, while returning the names as they were given."""
+        self.assertEqual(self.index.suggest("STRING", 1), ["String"])
+        self.assertEqual(self.index.suggest("Str.Joni", 1), ["str.join"])
+
+    def test_search_falls_back_to_fuzzy_matches(self):
+        """Searching should add fuzzy matches after the completions, without duplicates."""
+        results = self.index.search("lsit.append", 5)
+
+        self.assertEqual(results[0], "list.append")
+        self.assertEqual(len(results), len(set(results)))
@@ -0,0 +1,100 @@
+import unittest
+
+from bot.exts.info.doc._cog import DocItem
+from bot.exts.info.doc._symbol_table import PackageSymbols, StringColumn, SymbolTable, symbol_sort_key
+
+
+def _doc_item(symbol_id: str, page: str = "library/page.html", group: str = "function") -> DocItem:
+    return DocItem("package", group, "https://example.com/", page, symbol_id)
+
+
+class StringColumnTests(unittest.TestCase):
+    """Tests for strings stored back to back."""
+
+    def test_strings_are_returned_unchanged(self):
+        """All strings, including empty and non-ASCII ones, should be returned as they were given."""
+        strings = ["str", "", "ünïcode", "list.append"]
+        column = StringColumn(strings)
+
+        self.assertEqual(list(column), strings)
+        self.assertEqual([column[index] for index in range(len(column))], strings)
+        self.assertEqual(column[-1], "list.append")
+        with self.assertRaises(IndexError):
+            column[len(strings)]
+
+
+class SymbolTableTests(unittest.TestCase):
+    """Tests for the mapping of symbol names to their items."""
+
+    def setUp(self) -> None:
+        self.doc_symbols = {
+            "str": _doc_item("str", "library/stdtypes.html", "class"),
+            "String": _doc_item("string", "library/string.html", "module"),
+            "str.join": _doc_item("str.join", "library/stdtypes.html", "method"),
+            "ünïcode": _doc_item("ünïcode", "glossary.html", "term"),
+        }
+        self.table = SymbolTable.from_items(self.doc_symbols, [PackageSymbols(self.doc_symbols.items())])
+
+    def test_items_are_looked_up_by_name(self):
+        """Every symbol should map to an item equal to the one it was created with."""
+        self.assertEqual(dict(self.table.items()), self.doc_symbols)
+        for symbol_name, doc_item in self.doc_symbols.items():
+            self.assertEqual(self.table[symbol_name], doc_item)
+
+    def test_missing_names_are_not_found(self):
+        """Names that aren't in the table, including ones differing only in case, shouldn't be found."""
+        self.assertIsNone(self.table.get("STR"))
+        self.assertNotIn("string", self.table)
+        self.assertNotIn("zzz", self.table)
+
+    def test_names_are_sorted_case_insensitively(self):
+        """The names should be sorted case-insensitively, for the search index."""
+        self.assertEqual(list(self.table.names), ["str", "str.join", "String", "ünïcode"])
+
+    def test_updated_table_matches_a_new_table(self):
+        """Updating a table should give the same table as creating one from the resulting symbols."""
+        new_symbols = [
+            ("str", _doc_item("str-new")),
+            ("bytes", _doc_item("bytes")),
+            ("Zip", _doc_item("zip")),
+            ("a", _doc_item("a")),
+        ]
+        package = PackageSymbols(new_symbols)
+        for added in (new_symbols[:1], new_symbols):
+            with self.subTest(added=[symbol_name for symbol_name, _ in added]):
+                table = self.table.updated(
+                    {"String", "missing"},
+                    {symbol_name: (package, position) for position, (symbol_name, _) in enumerate(added)},
+                )
+                expected = {
+                    symbol_name: doc_item
+                    for symbol_name, doc_item in self.doc_symbols.items() if symbol_name not in ("str", "String")
+                } | dict(added)
+
+                self.assertEqual(dict(table.items()), expected)
+                self.assertEqual(list(table.names), sorted(expected, key=symbol_sort_key))
+                self.assertNotIn("String", table)
+                self.assertNotIn("missing", table)
+                # The table that was updated is left as it was.
+                self.assertEqual(dict(self.table.items()), self.doc_symbols)
+
+
+class PackageSymbolsTests(unittest.TestCase):
+    """Tests for the symbols of a single package."""
+
+    def test_items_are_kept_in_order_and_found_by_page(self):
+        """The symbols should keep their order, and their items should be found through their pages."""
+        symbols = [
+            ("open", _doc_item("open")),
+            ("open", _doc_item("term-open", "glossary.html", "term")),
+            ("close", _doc_item("close")),
+        ]
+        package = PackageSymbols(symbols)
+
+        self.assertEqual(list(package), symbols)
+        self.assertEqual(
+            set(package.pages), {"https://example.com/library/page.html", "https://example.com/glossary.html"}
+        )
+        self.assertEqual(
+            list(package.page_items("https://example.com/library/page.html")), [_doc_item("open"), _doc_item("close")]
+        )
@@ -0,0 +1,153 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from bot.exts.utils.snekbox import EvalJob, EvalResult
+from bot.exts.utils.snekbox._cache import ResultCache, is_deterministic
+from bot.exts.utils.snekbox._io import FileAttachment
+
+
+class ResultCacheTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for sharing the results of identical snekbox jobs."""
+
+    def setUp(self):
+        self.release = asyncio.Event()
+        self.post = AsyncMock(side_effect=self.respond)
+
+    async def respond(self, job: EvalJob) -> EvalResult:
+        """Return the code of `job` as its output, once `self.release` is set."""
+        await self.release.wait()
+        return EvalResult(job.files[0].content.decode(), 0)
+
+    async def test_identical_jobs_in_flight_share_a_request(self):
+        """Identical jobs posted at the same time should be posted once, while differing jobs are posted apart."""
+        cache = ResultCache(keep_results=False)
+        jobs = [
+            EvalJob.from_code("print(1)"),
+            EvalJob.from_code("print(1)"),
+            EvalJob.from_code("print(1)").as_version("3.13"),
+            EvalJob.from_code("print(2)"),
+        ]
+        tasks = [asyncio.create_task(cache.run(job, self.post)) for job in jobs]
+        await asyncio.sleep(0)
+        self.release.set()
+
+        results = await asyncio.gather(*tasks)
+        self.assertEqual([result.stdout for result in results], ["print(1)", "print(1)", "print(1)", "print(2)"])
+        self.assertIs(results[0], results[1])
+        self.assertEqual(self.post.await_count, 3)
+
+    async def test_request_is_cancelled_with_its_last_job(self):
+        """The shared request should only be cancelled once every job awaiting it was cancelled."""
+        cache = ResultCache(keep_results=False)
+        job = EvalJob.from_code("print(1)")
+        first, second = (asyncio.create_task(cache.run(job, self.post)) for _ in range(2))
+        await asyncio.sleep(0)
+        request = cache._in_flight[next(iter(cache._in_flight))]
+
+        first.cancel()
+        await asyncio.sleep(0)
+        self.assertFalse(request.cancelled())
+
+        second.cancel()
+        await asyncio.gather(first, second, return_exceptions=True)
+        await asyncio.sleep(0)
+        self.assertTrue(request.cancelled())
+        self.assertEqual(cache._in_flight, {})
+
+    async def test_identical_job_after_cancellation_gets_a_new_request(self):
+        """A job arriving right after its identical job cancelled the request shouldn't share the cancelled request."""
+        cache = ResultCache(keep_results=False)
+        job = EvalJob.from_code("print(1)")
+
+        async def cancelled_then_resent() -> EvalResult:
+            try:
+                return await cache.run(job, self.post)
+            except asyncio.CancelledError:
+                # The cancelled request hasn't finished yet at this point.
+                return await cache.run(job, self.post)
+
+        task = asyncio.create_task(cancelled_then_resent())
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.sleep(0)
+        self.release.set()
+
+        self.assertEqual((await task).stdout, "print(1)")
+        self.assertEqual(self.post.await_count, 2)
+        self.assertEqual(cache._in_flight, {})
+
+    async def test_deterministic_results_are_kept(self):
+        """Results of deterministic jobs should be reused until they expire, if enabled."""
+        self.release.set()
+        job = EvalJob.from_code("print(1)")
+
+        cache = ResultCache(keep_results=False)
+        await cache.run(job, self.post)
+        await cache.run(job, self.post)
+        self.assertEqual(self.post.await_count, 2)
+
+        self.post.reset_mock()
+        cache = ResultCache(keep_results=True, ttl=10)
+        with patch("bot.exts.utils.snekbox._cache.time.monotonic", return_value=0):
+            await cache.run(job, self.post)
+            await cache.run(job, self.post)
+        self.assertEqual(self.post.await_count, 1)
+
+        with patch("bot.exts.utils.snekbox._cache.time.monotonic", return_value=11):
+            await cache.run(job, self.post)
+        self.assertEqual(self.post.await_count, 2)
+
+    async def test_uncacheable_results_are_not_kept(self):
+        """Non-deterministic code, cut short runs and addresses in the output shouldn't be kept."""
+        cases = (
+            (EvalJob.from_code("import random\nprint(random.random())"), EvalResult("0.5", 0)),
+            (EvalJob.from_code("print(1)"), EvalResult("", 137)),
+            (EvalJob.from_code("print(object)"), EvalResult("<object object at 0x7f0123456789>", 0)),
+            (EvalJob.from_code("print(1)"), EvalResult("1", 0, failed_files=["big.bin"])),
+        )
+        for job, result in cases:
+            with self.subTest(job=job, result=result):
+                cache = ResultCache(keep_results=True)
+                await cache.run(job, AsyncMock(return_value=result))
+                self.assertEqual(cache.size, 0)
+
+    async def test_oldest_results_are_evicted(self):
+        """The oldest results should be evicted to keep the total output size under the limit."""
+        self.release.set()
+        cache = ResultCache(keep_results=True, max_size=20)
+        for code in ("print(1)", "print(2)", "print(3)"):
+            await cache.run(EvalJob.from_code(code), self.post)
+
+        self.assertEqual(cache.size, 16)
+        await cache.run(EvalJob.from_code("print(1)"), self.post)
+        self.assertEqual(self.post.await_count, 4)
+
+    def test_is_deterministic(self):
+        """Only code which can't reach modules and only uses deterministic builtins should be deterministic."""
+        cases = (
+            (EvalJob.from_code("print(sum(range(10)))"), True),
+            (EvalJob.from_code("def f(x):\n    return sorted(x)\nprint(f('ba'), {'a': 1}.get('a'))"), True),
+            (EvalJob.from_code("print({'a': 1}, f'{2}')"), True),
+            (EvalJob.from_code("from time import time\nprint(time())"), False),
+            (EvalJob.from_code("import pandas as pd\nprint(pd.Timestamp.now())"), False),
+            (EvalJob.from_code("print(__builtins__.__dict__['__imp' + 'ort__']('random'))"), False),
+            (EvalJob.from_code("print(getattr(print, '_' * 2 + 'self' + '_' * 2))"), False),
+            (EvalJob.from_code("print(next(x for x in [1]).gi_frame.f_builtins)"), False),
+            (EvalJob.from_code("print(id(1))"), False),
+            (EvalJob.from_code("id = print\nid(1)"), False),
+            (EvalJob.from_code("print(eval('1'))"), False),
+            (EvalJob.from_code("print({'a', 'b'})"), False),
+            (EvalJob.from_code("print({c for c in 'ab'})"), False),
+            (EvalJob.from_code("print({'a': 1}.keys() | {'b': 2}.keys())"), False),
+            (EvalJob.from_code("k = {'a': 1}.keys()\nprint(k | ['b', 'c', 'd'])"), False),
+            (EvalJob.from_code("for key, value in {'a': 1}.items():\n    print(key - {value})"), False),
+            (EvalJob.from_code("print(open('x').read())"), False),
+            (EvalJob.from_code("print(1"), False),
+            (EvalJob(["-m", "random"], [FileAttachment("main.py", b"print(1)")]), False),
+            (EvalJob(["-m", "timeit", "1 + 1"], name="timeit"), False),
+            (EvalJob(["main.py"], [FileAttachment("main.py", b"\xff")]), False),
+        )
+        for job, expected in cases:
+            with self.subTest(job=job):
+                self.assertIs(is_deterministic(job), expected)
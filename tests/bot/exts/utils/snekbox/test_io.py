@@ -32,3 +32,13 @@ class SnekboxIOTests(TestCase):
                 # Test FileAttachment.to_file()
                 obj = _io.FileAttachment(name, b"")
                 self.assertEqual(obj.to_file().filename, expected)
+
+    def test_file_reads_content_without_copying(self):
+        """The discord.File of an attachment should read its content back in full."""
+        content = bytearray(bytes(range(256)) * 4)
+        file = _io.FileAttachment("a.bin", content).to_file()
+
+        self.assertEqual(file.fp.read(10), content[:10])
+        self.assertEqual(file.fp.read(), content[10:])
+        file.reset()
+        self.assertEqual(file.fp.read(), content)
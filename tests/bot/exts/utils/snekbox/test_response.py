@@ -0,0 +1,94 @@
+import json
+import time
+import unittest
+from base64 import b64encode
+from unittest.mock import patch
+
+from bot.exts.utils.snekbox import EvalResult
+from bot.exts.utils.snekbox._io import FileAttachment
+from bot.exts.utils.snekbox._response import ResponseParser
+
+
+class FakeStream:
+    """Serves the given data in chunks of a fixed size, like `aiohttp.StreamReader.iter_chunked`."""
+
+    def __init__(self, data: bytes, chunk_size: int):
+        self.data = data
+        self.chunk_size = chunk_size
+
+    async def iter_chunked(self, _size: int):
+        for start in range(0, len(self.data), self.chunk_size):
+            yield self.data[start:start + self.chunk_size]
+
+
+def file_dict(path: str, content: bytes, **extra) -> dict:
+    """Return a file as it's in the snekbox response."""
+    return {"path": path, **extra, "content": b64encode(content).decode()}
+
+
+class ResponseParserTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for parsing snekbox responses as they're read."""
+
+    async def parse(self, response: dict | bytes, chunk_size: int = 7, size_limit: int = 100) -> EvalResult:
+        """Parse `response`, served in chunks of `chunk_size` bytes."""
+        if isinstance(response, dict):
+            response = json.dumps(response, indent=1).encode()
+        return await ResponseParser(FakeStream(response, chunk_size), size_limit).parse()
+
+    async def test_response_is_parsed_regardless_of_chunk_boundaries(self):
+        """The response should be parsed the same as with `EvalResult.from_dict` for any chunk size."""
+        response = {
+            "stdout": 'He said "hi" \\o/ \u00e9\n',
+            "returncode": 0,
+            "files": [file_dict("a.txt", b"abc" * 10), file_dict("b.bin", bytes(range(50)), size=50)],
+        }
+        for chunk_size in (1, 2, 3, 5, 64, 1024):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(await self.parse(response, chunk_size), EvalResult.from_dict(response))
+
+    async def test_quote_heavy_output_is_parsed_in_linear_time(self):
+        """Output full of escaped quotes and backslashes shouldn't be rescanned for every quote."""
+        response = {"stdout": '"\\' * 200_000 + "\\", "returncode": 0, "files": []}
+        for chunk_size in (1024, 64 * 1024):
+            with self.subTest(chunk_size=chunk_size):
+                start = time.perf_counter()
+                result = await self.parse(response, chunk_size)
+                self.assertLess(time.perf_counter() - start, 2)
+                self.assertEqual(result, EvalResult.from_dict(response))
+
+    async def test_files_over_the_limits_fail(self):
+        """Files over the size limit, the count limit, or with invalid content should fail without being kept."""
+        response = {
+            "stdout": "",
+            "returncode": 0,
+            "files": [
+                file_dict("big.bin", bytes(101)),
+                file_dict("declared.bin", b"small", size=101),
+                file_dict("exact.bin", bytes(100)),
+                {"path": "invalid.bin", "content": "abc"},
+            ],
+        }
+        result = await self.parse(response)
+        self.assertEqual(result.files, [FileAttachment("exact.bin", bytes(100))])
+        self.assertEqual(result.failed_files, ["big.bin", "declared.bin", "invalid.bin"])
+
+        response = {"stdout": "", "returncode": 0, "files": [file_dict(str(i), b"") for i in range(4)]}
+        with patch("bot.exts.utils.snekbox._response.FILE_COUNT_LIMIT", 2):
+            result = await self.parse(response)
+        self.assertEqual([file.filename for file in result.files], ["0", "1"])
+        self.assertEqual(result.failed_files, ["2", "3"])
+
+    async def test_large_files_are_skipped_without_being_decoded(self):
+        """The peak memory should stay bounded by the limit when a file is far over it."""
+        response = json.dumps({"stdout": "", "returncode": 0, "files": [file_dict("big.bin", bytes(100_000))]})
+        parser = ResponseParser(FakeStream(response.encode(), 1024), size_limit=100)
+
+        result = await parser.parse()
+        self.assertEqual(result.failed_files, ["big.bin"])
+        self.assertLess(parser.peak_memory, 2 * 1024 + 100)
+
+    async def test_invalid_response_raises(self):
+        """Malformed JSON should raise a `ValueError`."""
+        for response in (b'{"stdout": "', b'{"stdout" "a"}', b'{"stdout": "a" "returncode": 0}', b""):
+            with self.subTest(response=response), self.assertRaises(ValueError):
+                await self.parse(response)
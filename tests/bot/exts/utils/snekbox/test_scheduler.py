@@ -0,0 +1,90 @@
+import asyncio
+import unittest
+
+from bot.exts.utils.snekbox._scheduler import JobCancelledError, JobScheduler
+
+
+class JobSchedulerTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for the scheduling of snekbox jobs."""
+
+    def setUp(self):
+        self.scheduler = JobScheduler(max_running=1)
+        self.started = []
+        self.release = asyncio.Event()
+
+    def job(self, name: str):
+        """Return a job which records when it starts, and completes once `self.release` is set."""
+        async def run() -> str:
+            self.started.append(name)
+            await self.release.wait()
+            return name
+        return run
+
+    async def submit(self, key: int) -> asyncio.Task:
+        """Submit a job to the scheduler in a task, and let it reach the scheduler."""
+        task = asyncio.create_task(self.scheduler.run(key, self.job(str(key))))
+        await asyncio.sleep(0)
+        return task
+
+    async def test_running_jobs_are_capped(self):
+        """Jobs over the concurrency limit should wait until a running job completes."""
+        first = await self.submit(1)
+        second = await self.submit(2)
+        await asyncio.sleep(0)
+
+        self.assertEqual(self.started, ["1"])
+        self.assertEqual(self.scheduler.queued, 1)
+
+        self.release.set()
+        self.assertEqual(await asyncio.gather(first, second), ["1", "2"])
+        self.assertEqual(self.scheduler.queued, 0)
+
+    async def test_jobs_are_started_in_order(self):
+        """Queued jobs should start in the order they were submitted in."""
+        tasks = [await self.submit(key) for key in (1, 2, 3, 4)]
+        self.assertEqual(self.scheduler.queued, 3)
+
+        self.release.set()
+        await asyncio.gather(*tasks)
+        self.assertEqual(self.started, ["1", "2", "3", "4"])
+
+    async def test_queued_job_is_cancelled(self):
+        """Cancelling a queued job should drop it from the queue without running it."""
+        first = await self.submit(1)
+        second = await self.submit(2)
+
+        self.assertTrue(self.scheduler.cancel(2))
+        with self.assertRaises(JobCancelledError):
+            await second
+
+        self.release.set()
+        self.assertEqual(await first, "1")
+        self.assertEqual(self.started, ["1"])
+
+    async def test_running_job_is_cancelled(self):
+        """Cancelling a running job should free its slot for the next queued job."""
+        first = await self.submit(1)
+        second = await self.submit(2)
+        await asyncio.sleep(0)
+
+        self.scheduler.cancel(1)
+        with self.assertRaises(JobCancelledError):
+            await first
+
+        self.release.set()
+        self.assertEqual(await second, "2")
+        self.assertFalse(self.scheduler.cancel(2))
+
+    async def test_queued_position_is_reported(self):
+        """A job which has to wait should report its position in the queue."""
+        first = await self.submit(1)
+        positions = []
+
+        async def on_queued(position: int) -> None:
+            positions.append(position)
+
+        second = asyncio.create_task(self.scheduler.run(2, self.job("2"), on_queued))
+        self.release.set()
+        await asyncio.gather(first, second)
+
+        self.assertEqual(positions, [1])
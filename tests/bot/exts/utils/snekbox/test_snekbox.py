@@ -1,7 +1,7 @@
 import asyncio
 import unittest
 from base64 import b64encode
-from unittest.mock import AsyncMock, MagicMock, Mock, call, create_autospec, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, Mock, call, create_autospec, patch
 
 from discord import AllowedMentions
 from discord.ext import commands
@@ -12,6 +12,7 @@ from bot.errors import LockedResourceError
 from bot.exts.utils import snekbox
 from bot.exts.utils.snekbox import EvalJob, EvalResult, Snekbox
 from bot.exts.utils.snekbox._io import FileAttachment
+from bot.exts.utils.snekbox._scheduler import JobCancelledError
 from tests.helpers import MockBot, MockContext, MockMember, MockMessage, MockReaction, MockUser
 
 
@@ -29,8 +30,11 @@ class SnekboxTests(unittest.IsolatedAsyncioTestCase):
 
     async def test_post_job(self):
         """Post the eval code to the URLs.snekbox_eval_api endpoint."""
+        async def iter_chunked(_size: int):
+            yield b'{"stdout": "Hi", "returncode": 137, "files": []}'
+
         resp = MagicMock()
-        resp.json = AsyncMock(return_value={"stdout": "Hi", "returncode": 137, "files": []})
+        resp.content.iter_chunked = iter_chunked
 
         context_manager = MagicMock()
         context_manager.__aenter__.return_value = resp
@@ -53,7 +57,7 @@ class SnekboxTests(unittest.IsolatedAsyncioTestCase):
             json=expected,
             raise_for_status=True
         )
-        resp.json.assert_awaited_once()
+        self.bot.stats.gauge.assert_called_once_with("snekbox.python_3_10.peak_memory", ANY)
 
     @patch(
         "bot.exts.utils.snekbox._cog.paste_service._lexers_supported_by_pastebin",
@@ -243,6 +247,27 @@ class SnekboxTests(unittest.IsolatedAsyncioTestCase):
             with self.subTest(msg=testname, case=case, expected=expected):
                 self.assertEqual(await self.cog.format_output(case), expected)
 
+    async def test_format_output_only_checks_shown_lines(self):
+        """Lines which aren't shown shouldn't be split or checked for escapes, and the output is uploaded as is."""
+        self.cog.upload_output = AsyncMock(return_value="https://testificate.com/")
+        output = "beard\n" * 20 + "```" + "\n" * 10
+
+        formatted, link = await self.cog.format_output(output)
+
+        self.assertTrue(formatted.endswith("011 | beard\n... (truncated - too many lines)"))
+        self.assertEqual(link, "https://testificate.com/")
+        self.cog.upload_output.assert_awaited_once_with(output)
+
+    def test_iter_line_spans(self):
+        """Lines should be split like `str.splitlines`, and trailing newlines ignored like `str.rstrip`."""
+        cases = ("", "a", "a\n", "\n\na\r\nb\rc\x0bd\u2028\n", "a\r", "a\r\n", "\n" * 5000, "a" + "\n" * 8193)
+        for case in cases:
+            with self.subTest(case=case):
+                end = snekbox._cog.output_end(case)
+                self.assertEqual(end, len(case.rstrip("\n")))
+                spans = snekbox._cog.iter_line_spans(case, end)
+                self.assertEqual([case[start:stop] for start, stop in spans], case[:end].splitlines())
+
     async def test_eval_command_evaluate_once(self):
         """Test the eval command procedure."""
         ctx = MockContext()
@@ -289,6 +314,45 @@ class SnekboxTests(unittest.IsolatedAsyncioTestCase):
                 self.cog.send_job(ctx, EvalJob.from_code("MyAwesomeCode")),
             )
 
+    async def test_eval_command_cancelled_by_deleting_the_message(self):
+        """Deleting the invoking message should cancel its job without sending a response."""
+        ctx = MockContext()
+        ctx.message = MockMessage(id=42)
+        ctx.command = MagicMock()
+
+        async def run_forever(_job: EvalJob) -> EvalResult:
+            await asyncio.sleep(10)
+
+        self.cog.post_job = AsyncMock(side_effect=run_forever)
+        self.cog.continue_job = AsyncMock()
+
+        task = asyncio.create_task(
+            self.cog.eval_command(self.cog, ctx=ctx, python_version="3.12", code=["MyAwesomeCode"])
+        )
+        await asyncio.sleep(0.01)
+        await self.cog.on_raw_message_delete(MagicMock(message_id=42))
+        await asyncio.wait_for(task, 1)
+
+        self.cog.post_job.assert_called_once()
+        ctx.send.assert_not_called()
+        self.cog.continue_job.assert_not_called()
+
+    async def test_queued_message_is_deleted_when_the_queued_job_is_cancelled(self):
+        """The message with the queue position of a job should be deleted if the job is cancelled while queued."""
+        ctx = MockContext()
+        ctx.message = MockMessage(id=42)
+        self.cog.job_scheduler.max_running = 0
+        self.cog.post_job = AsyncMock()
+
+        task = asyncio.create_task(self.cog.schedule_job(ctx, EvalJob.from_code("MyAwesomeCode")))
+        await asyncio.sleep(0.01)
+        self.cog.job_scheduler.cancel(42)
+
+        with self.assertRaises(JobCancelledError):
+            await asyncio.wait_for(task, 1)
+        ctx.send.return_value.delete.assert_awaited_once()
+        self.cog.post_job.assert_not_called()
+
     async def test_send_job(self):
         """Test the send_job function."""
         ctx = MockContext()